@@ -0,0 +1,138 @@
+import numpy
+import pandas
+
+from pathlib import Path
+
+from Common.Analytics.PerformanceAnalytics import PerformanceAnalytics
+from Common.DataStructures.PortfolioPerformance import PortfolioPerformance
+
+
+class BacktestJournal(object):
+    '''
+    The per-date state of a backtest: a fingerprint of each date's factor and returns data, the portfolio
+    weights held after each date's rebalance, the PortfolioPerformance values and the compounded long-short
+    equity. When the data is revised, the journal finds the earliest date whose fingerprint has changed, so
+    the backtest only needs to be recomputed from that date onwards, starting from the journalled weights of
+    the date before.
+
+    A journal belongs to one set of backtest arguments, identified by its arguments key, and the state of
+    other arguments is never reused from it.
+    '''
+
+    def __init__(self, argumentsKey=""):
+        self.ArgumentsKey = argumentsKey
+        self.Dates = pandas.DatetimeIndex([])
+        self.Securities = None
+        self.RowFingerprints = numpy.zeros(0, dtype=numpy.uint64)
+        self.PortfolioWeights = numpy.zeros((0, 0))
+        self.PerformanceValues = numpy.zeros((0, len(PerformanceAnalytics.PerformanceColumns)))
+        self.LongShortEquity = numpy.zeros(0)
+
+    def __len__(self) -> int:
+        return len(self.Dates)
+
+    @staticmethod
+    def CreateArgumentsKey(tradingStrategyName, portfolioConstructionName, factorName, percentile: float,
+                           executionCostRate: float) -> str:
+        '''
+        Returns the key of a set of backtest arguments, which is stored with the journal.
+        '''
+        return (f"{tradingStrategyName.name}/{portfolioConstructionName.name}/{factorName}/"
+                f"{float(percentile)!r}/{float(executionCostRate)!r}")
+
+    @staticmethod
+    def CalculateRowFingerprints(factorDataDF: pandas.DataFrame, returnsDF: pandas.DataFrame) -> numpy.ndarray:
+        '''
+        Returns a 64 bit hash of the factor values, the returns and the date of every row.
+        '''
+        return pandas.util.hash_pandas_object(
+            pandas.concat([factorDataDF, returnsDF], axis=1, keys=["Factor", "Returns"]), index=True).values
+
+    def FindFirstChangedRow(self, dates: pandas.Index, securities: pandas.Index,
+                            rowFingerprints: numpy.ndarray, argumentsKey: str = None) -> int:
+        '''
+        Returns the index of the first row of the new data that differs from the journal, either in its date
+        or its fingerprint. If the securities or the arguments key, when given, have changed nothing can be
+        reused and 0 is returned. If the new data only extends the journalled dates, the number of journalled
+        dates is returned.
+        '''
+
+        if self.Securities is None or numpy.array_equal(self.Securities, securities) == False:
+            return 0
+        if argumentsKey is not None and argumentsKey != self.ArgumentsKey:
+            return 0
+
+        numberOfComparedRows = min(len(self.Dates), len(dates))
+        isChanged = ((self.Dates[:numberOfComparedRows] != dates[:numberOfComparedRows]) |
+                     (self.RowFingerprints[:numberOfComparedRows] != rowFingerprints[:numberOfComparedRows]))
+        changedRows = numpy.flatnonzero(isChanged)
+        return changedRows[0] if len(changedRows) > 0 else numberOfComparedRows
+
+    def Truncate(self, numberOfRows: int):
+        '''
+        Discards the journalled state from the given row onwards.
+        '''
+        self.Dates = self.Dates[:numberOfRows]
+        self.RowFingerprints = self.RowFingerprints[:numberOfRows]
+        self.PortfolioWeights = self.PortfolioWeights[:numberOfRows]
+        self.PerformanceValues = self.PerformanceValues[:numberOfRows]
+        self.LongShortEquity = self.LongShortEquity[:numberOfRows]
+
+    def Append(self, dates: pandas.Index, securities: pandas.Index, rowFingerprints: numpy.ndarray,
+               portfolioWeights: numpy.ndarray, performanceValues: numpy.ndarray):
+        '''
+        Appends the state of newly computed dates to the end of the journal. The compounded long-short equity
+        continues from the last journalled value, and dates with a missing return leave it unchanged.
+        '''
+
+        if len(self.Dates) == 0:
+            self.Securities = pandas.Index(securities)
+            self.PortfolioWeights = numpy.zeros((0, len(securities)))
+
+        previousEquity = self.LongShortEquity[-1] if len(self.LongShortEquity) > 0 else 1.0
+        longShortReturns = performanceValues[:, PerformanceAnalytics.PerformanceColumns.index(
+            "LongShortPortfolioReturn")]
+        longShortEquity = previousEquity * numpy.cumprod(1.0 + numpy.nan_to_num(longShortReturns, nan=0.0))
+
+        self.Dates = self.Dates.append(pandas.DatetimeIndex(dates))
+        self.RowFingerprints = numpy.concatenate([self.RowFingerprints, rowFingerprints])
+        self.PortfolioWeights = numpy.concatenate([self.PortfolioWeights, portfolioWeights])
+        self.PerformanceValues = numpy.concatenate([self.PerformanceValues, performanceValues])
+        self.LongShortEquity = numpy.concatenate([self.LongShortEquity, longShortEquity])
+
+    def ToPortfolioPerformance(self) -> {}:
+        '''
+        Returns the journalled performance as a dictionary of PortfolioPerformance by date, in the form
+        returned by BacktestingEngine.BacktestTradingStrategy.
+        '''
+        return {date: PortfolioPerformance(
+            longPortfolioReturn=values[0], shortPortfolioReturn=values[1], longShortPortfolioReturn=values[2],
+            longShortTurnoverRatio=values[3]) for (date, values) in zip(self.Dates, self.PerformanceValues)}
+
+    def Save(self, filePathStr: str):
+        '''
+        Saves the journal to a NumPy .npz file, so that it can be reused by a later process.
+        '''
+        securities = numpy.asarray([] if self.Securities is None else self.Securities)
+        numpy.savez(Path(filePathStr), ArgumentsKey=numpy.asarray(self.ArgumentsKey), Dates=self.Dates.asi8,
+                    Securities=securities, RowFingerprints=self.RowFingerprints, PortfolioWeights=self.PortfolioWeights,
+                    PerformanceValues=self.PerformanceValues, LongShortEquity=self.LongShortEquity)
+
+    @staticmethod
+    def Load(filePathStr: str):
+        '''
+        Loads a journal saved by Save. A journal saved without an arguments key has an empty key, so it is
+        not reused by any backtest.
+        '''
+        journal = BacktestJournal()
+        with numpy.load(Path(filePathStr), allow_pickle=False) as journalFile:
+            if "ArgumentsKey" in journalFile.files:
+                journal.ArgumentsKey = str(journalFile["ArgumentsKey"])
+            journal.Dates = pandas.DatetimeIndex(journalFile["Dates"].view("datetime64[ns]"))
+            if len(journal.Dates) > 0:
+                journal.Securities = pandas.Index(journalFile["Securities"])
+            journal.RowFingerprints = journalFile["RowFingerprints"]
+            journal.PortfolioWeights = journalFile["PortfolioWeights"]
+            journal.PerformanceValues = journalFile["PerformanceValues"]
+            journal.LongShortEquity = journalFile["LongShortEquity"]
+        return journal
@@ -1,15 +1,21 @@
+import numpy
 import pandas
 
 from pathlib import Path
 
 from Common.Enumerations.CacheType import CacheType
+from BacktestingEngine.BacktestJournal import BacktestJournal
 from BacktestingEngine.DataProvider import DataProvider
+from BacktestingEngine.ExecutionCostSensitivity import ExecutionCostSensitivity
+from BacktestingEngine.RebalanceSchedule import RebalanceSchedule
+from BacktestingEngine.SignalCache import SignalCache
 from PortfolioConstruction.PortfolioConstructionName import PortfolioConstructionName
 from TradingStrategies.TradingStrategyName import TradingStrategyName
-from TradingStrategies.LongBestShortWorst import LongBestShortWorst
 from PortfolioConstruction.DollarNeutralEqualWeightPortfolio import DollarNeutralEqualWeightPortfolio
 from Common.Enumerations.FactorName import FactorName
 from Common.Enumerations.ReturnType import ReturnType
+from Common.Analytics.PerformanceAnalytics import PerformanceAnalytics
+from FactorPipeline.IDerivedFactor import IDerivedFactor
 
 
 class BacktestingEngine(object):
@@ -17,47 +23,378 @@ class BacktestingEngine(object):
     This class runs the backtesting for a given set of inputs 
     '''
 
-    def __init__(self, inputCachePathStr: str, inputDataFilenameStr: str, cacheType=CacheType.Csv):
+    def __init__(self, inputCachePathStr: str, inputDataFilenameStr: str, cacheType=CacheType.Csv,
+                 signalCache: SignalCache = None):
         self.InputCachPath = Path(inputCachePathStr)
         self.InputDataFileName = inputDataFilenameStr
         self.CacheType = cacheType
         self.Data = pandas.DataFrame()
+        self.SignalCache = SignalCache() if signalCache is None else signalCache
+        self.Journals = {}
+        self.__DataFileStat = None
 
     def BacktestTradingStrategy(self, tradingStrategyName: TradingStrategyName,
                                 portfolioConstructionName: PortfolioConstructionName, factorName: FactorName,
-                                percentile: float, executionCostRate=0.0) -> {}:
+                                percentile: float, executionCostRate=0.0,
+                                rebalanceSchedule: RebalanceSchedule = None) -> {}:
         '''
         This function runs the historical backtest for the specified trading strategy, portfolio construction 
-        method, and factor name.
+        method, and factor name. The factor may also be a derived factor, e.g. a CompositeFactor.
+
+        By default the portfolio is rebalanced on every date of the data. If a rebalance schedule is given, the
+        signals and weights are only calculated on the rebalance dates, the returns are compounded between
+        them, and the results are keyed by the rebalance dates.
+        '''
+
+        return dict(self.IterateTradingStrategy(
+            tradingStrategyName, portfolioConstructionName, factorName, percentile, executionCostRate,
+            rebalanceSchedule))
+
+    def IterateTradingStrategy(self, tradingStrategyName: TradingStrategyName,
+                               portfolioConstructionName: PortfolioConstructionName, factorName: FactorName,
+                               percentile: float, executionCostRate=0.0,
+                               rebalanceSchedule: RebalanceSchedule = None):
+        '''
+        Runs the historical backtest as BacktestTradingStrategy, but yields a (date, PortfolioPerformance) pair
+        as soon as each date has been processed, e.g. for IPortfolio.BacktestPortfolio to consume.
         '''
 
-        self.Data = DataProvider.FilteredCachedLoad(
-            self.InputCachPath, self.InputDataFileName)
+        self.LoadData()
 
         if ((tradingStrategyName == TradingStrategyName.LongBestShortWorst) and
                 (portfolioConstructionName == PortfolioConstructionName.DollarNeutralEqualWeightPortfolio)):
 
-            factorData = self.Data[factorName]
-            returnsData = self.Data[ReturnType.Mixed]
-            portfolioPerformance = {}
-            previousPortfolioWeights = self.Data[ReturnType.Forward].iloc[[0]].apply(
-                lambda y: 0.0)  # effectively just a an array of Os
+            factorData, signalsMatrix, returnsData = self.__GetSignalsAndReturns(
+                tradingStrategyName, factorName, percentile, rebalanceSchedule)
+
+            # The portfolio is rebalanced on plain arrays, one row per date.
+            returnsMatrix = returnsData.values
+            previousPortfolioWeights = numpy.zeros(len(returnsData.columns))  # no holdings before the first date
+            for i in range(len(factorData.index)):
+                date = factorData.index[i]
+                portfolio = DollarNeutralEqualWeightPortfolio(
+                    previousPortfolioWeights, signalsMatrix[i])
+                yield date, portfolio.CalculatePortfolioReturns(returnsMatrix[i], executionCostRate)
+                previousPortfolioWeights = portfolio.PortfolioWeights
+
+        elif ((tradingStrategyName == TradingStrategyName.LongBestShortWorst) and
+                (portfolioConstructionName == PortfolioConstructionName.SparseDollarNeutralEqualWeightPortfolio)):
+
+            factorData, signalsMatrix, returnsData = self.__GetSignalsAndReturns(
+                tradingStrategyName, factorName, percentile, rebalanceSchedule)
+
+            # The sparse portfolio construction is only imported when it is used.
+            from Common.DataStructures.SparsePositions import SparsePositions
+            from PortfolioConstruction.SparseDollarNeutralEqualWeightPortfolio import \
+                SparseDollarNeutralEqualWeightPortfolio
+
+            # Only the held securities are stored and carried from one date to the next.
+            sparseSignals = SparsePositions.FromSignalsMatrix(signalsMatrix)
+            returnsMatrix = returnsData.values
+            previousPortfolioPositions = SparsePositions.Empty()  # no holdings before the first date
             for i in range(len(factorData.index)):
                 date = factorData.index[i]
-                factorDataForDate = factorData.iloc[[i]]
-                returnsDataForDate = returnsData.iloc[[i]]
-                signals = LongBestShortWorst.GenerateTradingSignals(
-                    factorDataForDate, percentile)
+                portfolio = SparseDollarNeutralEqualWeightPortfolio(
+                    previousPortfolioPositions, sparseSignals[i])
+                yield date, portfolio.CalculatePortfolioReturns(returnsMatrix[i], executionCostRate)
+                previousPortfolioPositions = portfolio.PortfolioPositions
+
+        else:
+            raise NotImplementedError(
+                "The requested combination of trading strategy and portfolio construction has not been" +
+                "implemented.")
+
+    def BacktestTradingStrategyIncremental(self, tradingStrategyName: TradingStrategyName,
+                                           portfolioConstructionName: PortfolioConstructionName,
+                                           factorName: FactorName, percentile: float, executionCostRate=0.0,
+                                           journal: BacktestJournal = None) -> {}:
+        '''
+        Runs the historical backtest as BacktestTradingStrategy, keeping a journal of the per-date state. When
+        the backtest is run again after the data has been revised or extended, only the dates from the
+        earliest changed date onwards are recomputed, starting from the journalled weights.
+
+        The engine keeps a journal for each set of backtest arguments, or a journal may be passed in, e.g. one
+        loaded with BacktestJournal.Load. A journal of other arguments is recomputed from the first date and
+        then belongs to these arguments.
+        '''
+
+        self.LoadData()
+
+        if ((tradingStrategyName == TradingStrategyName.LongBestShortWorst) and
+                (portfolioConstructionName == PortfolioConstructionName.DollarNeutralEqualWeightPortfolio)):
+
+            factorData = self.__GetFactorData(factorName)
+            returnsData = self.__GetReturnsData()
+            if numpy.array_equal(factorData.columns, returnsData.columns) == False:
+                raise ValueError("The securities in the factor data do not match those in the returns data.")
+
+            argumentsKey = BacktestJournal.CreateArgumentsKey(
+                tradingStrategyName, portfolioConstructionName, factorName, percentile, executionCostRate)
+            if journal is None:
+                journal = self.Journals.setdefault(argumentsKey, BacktestJournal(argumentsKey))
+
+            rowFingerprints = BacktestJournal.CalculateRowFingerprints(factorData, returnsData)
+            firstChangedRow = journal.FindFirstChangedRow(
+                factorData.index, factorData.columns, rowFingerprints, argumentsKey)
+            journal.Truncate(firstChangedRow)
+            journal.ArgumentsKey = argumentsKey
+
+            # The signals of a date only depend on that date's factor values, so only the changed dates are
+            # passed to the trading strategy.
+            signalsMatrix = SignalCache.GenerateTradingSignals(
+                tradingStrategyName, factorData.iloc[firstChangedRow:], percentile).values.astype(numpy.int8)
+            returnsMatrix = returnsData.values[firstChangedRow:]
+
+            numberOfChangedDates = len(signalsMatrix)
+            portfolioWeights = numpy.zeros((numberOfChangedDates, len(factorData.columns)))
+            performanceValues = numpy.zeros((numberOfChangedDates, len(PerformanceAnalytics.PerformanceColumns)))
+            previousPortfolioWeights = journal.PortfolioWeights[firstChangedRow - 1] if firstChangedRow > 0 \
+                else numpy.zeros(len(factorData.columns))  # no holdings before the first date
+            for i in range(numberOfChangedDates):
+                portfolio = DollarNeutralEqualWeightPortfolio(previousPortfolioWeights, signalsMatrix[i])
+                portfolioPerformance = portfolio.CalculatePortfolioReturns(returnsMatrix[i], executionCostRate)
+                performanceValues[i] = [getattr(portfolioPerformance, x)
+                                        for x in PerformanceAnalytics.PerformanceColumns]
+                portfolioWeights[i] = portfolio.PortfolioWeights
+                previousPortfolioWeights = portfolio.PortfolioWeights
+
+            journal.Append(factorData.index[firstChangedRow:], factorData.columns, rowFingerprints[firstChangedRow:],
+                           portfolioWeights, performanceValues)
+            return journal.ToPortfolioPerformance()
+
+        else:
+            raise NotImplementedError(
+                "The requested combination of trading strategy and portfolio construction has not been" +
+                "implemented for incremental backtests.")
+
+    def BacktestTradingStrategyVariants(self, tradingStrategyName: TradingStrategyName,
+                                        portfolioConstructionName: PortfolioConstructionName,
+                                        variants: [tuple], rebalanceSchedule: RebalanceSchedule = None) -> {}:
+        '''
+        Runs the historical backtest for many variants of a trading strategy over the same dates. Each 
+        variant is a (factorName, percentile, executionCostRate) tuple. The weights of all the variants are
+        carried forward together as a variants x securities matrix, so each date is processed once.
+
+        Returns a dictionary keyed by the PortfolioPerformance attribute names, where each value is a dates x
+        variants data frame with one column per variant, in the order given. The dates are the rebalance dates
+        if a rebalance schedule is given.
+        '''
+
+        self.LoadData()
+
+        if ((tradingStrategyName == TradingStrategyName.LongBestShortWorst) and
+                (portfolioConstructionName == PortfolioConstructionName.DollarNeutralEqualWeightPortfolio)):
+
+            # The batched portfolio construction is only imported when it is used.
+            from PortfolioConstruction.BatchedDollarNeutralEqualWeightPortfolio import \
+                BatchedDollarNeutralEqualWeightPortfolio
+
+            returnsData = self.__GetReturnsData(rebalanceSchedule)
+            returnsMatrix = returnsData.values
+
+            # Variants that only differ by execution cost rate share the same signals.
+            signalKeys = list(dict.fromkeys((factorName, percentile) for (factorName, percentile, _) in variants))
+            signalsMatrices = []
+            for (factorName, percentile) in signalKeys:
+                factorData = self.__GetFactorData(factorName, rebalanceSchedule)
+                if numpy.array_equal(factorData.columns, returnsData.columns) == False:
+                    raise ValueError("The securities in the factor data do not match those in the returns data.")
+                signalsMatrices.append(self.SignalCache.GetTradingSignalsMatrix(
+                    tradingStrategyName, factorName, percentile, factorData))
+            variantSignals = numpy.array(
+                [signalKeys.index((factorName, percentile)) for (factorName, percentile, _) in variants])
+            executionCostRates = numpy.array([executionCostRate for (_, _, executionCostRate) in variants])
+
+            numberOfDates = len(returnsData.index)
+            longPortfolioReturns = numpy.zeros((numberOfDates, len(variants)))
+            shortPortfolioReturns = numpy.zeros((numberOfDates, len(variants)))
+            portfolioReturns = numpy.zeros((numberOfDates, len(variants)))
+            turnoverRatios = numpy.zeros((numberOfDates, len(variants)))
+
+            # no holdings before the first date
+            previousPortfolioWeights = numpy.zeros((len(variants), len(returnsData.columns)))
+            for i in range(numberOfDates):
+                signals = numpy.stack([signalsMatrix[i] for signalsMatrix in signalsMatrices])[variantSignals]
+                portfolio = BatchedDollarNeutralEqualWeightPortfolio(previousPortfolioWeights, signals)
+                longPortfolioReturns[i], shortPortfolioReturns[i], portfolioReturns[i] = \
+                    portfolio.CalculatePortfolioReturnArrays(returnsMatrix[i], executionCostRates)
+                turnoverRatios[i] = portfolio.TurnoverRatios
+                previousPortfolioWeights = portfolio.PortfolioWeights
+
+            return {
+                "LongPortfolioReturn": pandas.DataFrame(longPortfolioReturns, index=returnsData.index),
+                "ShortPortfolioReturn": pandas.DataFrame(shortPortfolioReturns, index=returnsData.index),
+                "LongShortPortfolioReturn": pandas.DataFrame(portfolioReturns, index=returnsData.index),
+                "LongShortTuroverRatio": pandas.DataFrame(turnoverRatios, index=returnsData.index)}
+
+        else:
+            raise NotImplementedError(
+                "The requested combination of trading strategy and portfolio construction has not been" +
+                "implemented for batched variants.")
+
+    def BacktestExecutionCostSensitivity(self, tradingStrategyName: TradingStrategyName,
+                                         portfolioConstructionName: PortfolioConstructionName,
+                                         factorName: FactorName, percentile: float,
+                                         rebalanceSchedule: RebalanceSchedule = None) -> ExecutionCostSensitivity:
+        '''
+        Runs the historical backtest once, recording the execution cost independent components for each date.
+        The returned object produces the returns and summary statistics for any execution cost rates.
+        '''
+
+        self.LoadData()
+
+        if ((tradingStrategyName == TradingStrategyName.LongBestShortWorst) and
+                (portfolioConstructionName == PortfolioConstructionName.DollarNeutralEqualWeightPortfolio)):
+
+            factorData, signalsMatrix, returnsData = self.__GetSignalsAndReturns(
+                tradingStrategyName, factorName, percentile, rebalanceSchedule)
+
+            returnsMatrix = returnsData.values
+            numberOfDates = len(factorData.index)
+            portfolioValues = numpy.zeros((numberOfDates, 4))
+            absoluteChangeInPortfolioWeights = numpy.zeros(numberOfDates)
+            turnoverRatios = numpy.zeros(numberOfDates)
+            previousPortfolioWeights = numpy.zeros(len(returnsData.columns))  # no holdings before the first date
+            for i in range(numberOfDates):
                 portfolio = DollarNeutralEqualWeightPortfolio(
-                    previousPortfolioWeights, signals)
-                portfolioPerformance[date] = portfolio.CalculatePortfolioReturns(
-                    returnsDataForDate, executionCostRate)
-                previousPortfolioWeights = portfolio.PortfolioWeightsDF.copy(
-                    deep=True)
+                    previousPortfolioWeights, signalsMatrix[i])
+                portfolioValues[i] = portfolio.CalculatePortfolioValues(returnsMatrix[i])
+                absoluteChangeInPortfolioWeights[i] = portfolio.AbsoluteChangeInPortfolioWeights
+                turnoverRatios[i] = portfolio.TurnoverRatio
+                previousPortfolioWeights = portfolio.PortfolioWeights
 
-            return portfolioPerformance
+            return ExecutionCostSensitivity(
+                factorData.index, portfolioValues[:, 0], portfolioValues[:, 1], portfolioValues[:, 2],
+                portfolioValues[:, 3], absoluteChangeInPortfolioWeights, turnoverRatios)
 
         else:
             raise NotImplementedError(
                 "The requested combination of trading strategy and portfolio construction has not been" +
                 "implemented.")
+
+    def BacktestTradingStrategyOutOfCore(self, tradingStrategyName: TradingStrategyName,
+                                         portfolioConstructionName: PortfolioConstructionName,
+                                         factorName: FactorName, percentile: float, outputFilePathStr: str,
+                                         executionCostRate=0.0, maximumMemoryBytes=256 * 1024 ** 2) -> int:
+        '''
+        Runs the historical backtest on a panel store (CacheType.Panel) without loading the whole history. The
+        dates are processed in blocks sized to keep the working data within the memory budget, and only the
+        previous portfolio weights and the running long-short equity are carried from one block to the next.
+
+        The results are appended to a csv file as each block is completed, with one row per date holding the
+        PortfolioPerformance attributes and the compounded long-short equity. Returns the number of dates.
+        '''
+
+        if self.CacheType != CacheType.Panel:
+            raise NotImplementedError("Out of core backtests are only supported for a Panel cache.")
+
+        if ((tradingStrategyName == TradingStrategyName.LongBestShortWorst) and
+                (portfolioConstructionName == PortfolioConstructionName.DollarNeutralEqualWeightPortfolio)):
+
+            from BacktestingEngine.PanelStore import PanelStore
+
+            panelStore = PanelStore(self.InputCachPath / self.InputDataFileName)
+            numberOfDates = panelStore.NumberOfDates
+            blockSize = BacktestingEngine.__CalculateBlockSize(
+                len(panelStore.Securities), len(panelStore.Fields), maximumMemoryBytes)
+            outputFilePath = Path(outputFilePathStr)
+            outputColumns = list(PerformanceAnalytics.PerformanceColumns) + ["LongShortEquity"]
+
+            previousPortfolioWeights = numpy.zeros(len(panelStore.Securities))  # no holdings before the first date
+            longShortEquity = 1.0
+            for start in range(0, max(numberOfDates, 1), blockSize):
+                stop = min(start + blockSize, numberOfDates)
+                dataDict = panelStore.ReadDataDict(start, stop)
+                if ReturnType.Mixed in dataDict:
+                    returnsMatrix = dataDict[ReturnType.Mixed].values
+                else:  # the mixing of a block needs the backward returns of the first date of the next block
+                    returnsMatrix = DataProvider.MixReturnValues(
+                        dataDict[ReturnType.Forward].values,
+                        panelStore.ReadValues(ReturnType.Backward, start, stop + 1))
+                factorData = IDerivedFactor.GetFactorData(factorName, dataDict)
+                signalsMatrix = SignalCache.GenerateTradingSignals(
+                    tradingStrategyName, factorData, percentile).values.astype(numpy.int8)
+
+                results = numpy.zeros((stop - start, len(outputColumns)))
+                for i in range(stop - start):
+                    portfolio = DollarNeutralEqualWeightPortfolio(previousPortfolioWeights, signalsMatrix[i])
+                    portfolioPerformance = portfolio.CalculatePortfolioReturns(returnsMatrix[i], executionCostRate)
+                    if not numpy.isnan(portfolioPerformance.LongShortPortfolioReturn):
+                        longShortEquity *= 1.0 + portfolioPerformance.LongShortPortfolioReturn
+                    results[i, :-1] = [getattr(portfolioPerformance, x)
+                                       for x in PerformanceAnalytics.PerformanceColumns]
+                    results[i, -1] = longShortEquity
+                    previousPortfolioWeights = portfolio.PortfolioWeights
+
+                pandas.DataFrame(results, index=factorData.index, columns=outputColumns).to_csv(
+                    outputFilePath, mode="w" if start == 0 else "a", header=(start == 0))
+
+            return numberOfDates
+
+        else:
+            raise NotImplementedError(
+                "The requested combination of trading strategy and portfolio construction has not been" +
+                "implemented for out of core backtests.")
+
+    def LoadData(self):
+        '''
+        Loads the returns and factor data through the data provider. The data is only reloaded if the cached
+        input file has changed since it was last loaded, so repeated backtests on the same engine share it.
+        '''
+
+        dataFilePath = self.InputCachPath / self.InputDataFileName
+        if self.CacheType == CacheType.Panel:  # the metadata is rewritten whenever rows are appended
+            from BacktestingEngine.PanelStore import PanelStore
+            dataFilePath = dataFilePath / PanelStore.MetadataFileName
+        dataFileStat = dataFilePath.stat()
+        dataFileStat = (dataFileStat.st_mtime_ns, dataFileStat.st_size)
+        if len(self.Data) == 0 or dataFileStat != self.__DataFileStat:
+            self.Data = DataProvider.FilteredCachedLoad(
+                self.InputCachPath, self.InputDataFileName, self.CacheType)
+            self.__DataFileStat = dataFileStat
+
+    def Snapshot(self):
+        '''
+        Returns a new engine over the data loaded by this engine, sharing its signal cache. A backtest on the
+        snapshot does not change this engine, so several snapshots can be backtested at once while this engine
+        reloads the data.
+        '''
+        snapshot = BacktestingEngine(str(self.InputCachPath), self.InputDataFileName, self.CacheType, self.SignalCache)
+        snapshot.Data = self.Data
+        snapshot.__DataFileStat = self.__DataFileStat
+        return snapshot
+
+    @staticmethod
+    def __CalculateBlockSize(numberOfSecurities: int, numberOfFields: int, maximumMemoryBytes: int) -> int:
+        # The number of dates per block of an out of core backtest. Each date holds a float64 row for every
+        # field of the store, plus about four rows of working data for the factor, ranks, signals and returns.
+        bytesPerDate = 8 * numberOfSecurities * (numberOfFields + 4)
+        return max(1, int(maximumMemoryBytes // bytesPerDate))
+
+    def __GetFactorData(self, factorName, rebalanceSchedule: RebalanceSchedule = None) -> pandas.DataFrame:
+        # Returns the factor panel for a FactorName, or calculates it for a derived factor, on the rebalance
+        # dates only if a rebalance schedule is given.
+        factorData = IDerivedFactor.GetFactorData(factorName, self.Data)
+        if rebalanceSchedule is not None:
+            factorData = rebalanceSchedule.SelectRebalanceDates(factorData)
+        return factorData
+
+    def __GetReturnsData(self, rebalanceSchedule: RebalanceSchedule = None) -> pandas.DataFrame:
+        # Returns the mixed returns, compounded over the holding periods if a rebalance schedule is given.
+        returnsData = self.Data[ReturnType.Mixed]
+        if rebalanceSchedule is not None:
+            returnsData = rebalanceSchedule.CompoundReturns(returnsData)
+        return returnsData
+
+    def __GetSignalsAndReturns(self, tradingStrategyName: TradingStrategyName, factorName: FactorName,
+                               percentile: float, rebalanceSchedule: RebalanceSchedule = None) -> tuple:
+        # Returns the factor data, the cached int8 trading signals and the mixed returns for the backtest.
+        factorData = self.__GetFactorData(factorName, rebalanceSchedule)
+        returnsData = self.__GetReturnsData(rebalanceSchedule)
+        signalsMatrix = self.SignalCache.GetTradingSignalsMatrix(
+            tradingStrategyName, factorName, percentile, factorData)
+
+        if numpy.array_equal(factorData.columns, returnsData.columns) == False:
+            raise ValueError("The securities in the factor data do not match those in the returns data.")
+
+        return factorData, signalsMatrix, returnsData
@@ -1,5 +1,5 @@
+import numpy
 import pandas
-import math
 
 from pathlib import Path
 
@@ -31,30 +31,45 @@ class DataProvider(object):
         # security i. As there are instances where the forward return is missing, a new returns series is
         # constructed based on the mixture of the two.
 
-        forwardReturnsDF = pivotedDataDict[ReturnType.Forward]
-        backwardReturnsDF = pivotedDataDict[ReturnType.Backward]
-        mixedReturnsDF = forwardReturnsDF.copy(deep=True)
-
-        for i in range(len(mixedReturnsDF.index) - 1):
-            currentIndexValue = mixedReturnsDF.index[i]
-            nextIndexValue = mixedReturnsDF.index[i + 1]
-            # If row is all zeros, then select the backward returns
-            row = mixedReturnsDF.loc[currentIndexValue]
-            if row.min() == 0.0 and row.max() == 0.0:
-                for j in mixedReturnsDF.columns:
-                    mixedReturnsDF.at[currentIndexValue,
-                                      j] = backwardReturnsDF.at[nextIndexValue, j]
-            # Override the null values with the back returns
-            else:
-                for j in mixedReturnsDF.columns:
-                    if math.isnan(mixedReturnsDF.at[currentIndexValue, j]):
-                        mixedReturnsDF.at[currentIndexValue,
-                                          j] = backwardReturnsDF.at[nextIndexValue, j]
-
-        pivotedDataDict[ReturnType.Mixed] = mixedReturnsDF
+        if ReturnType.Mixed not in pivotedDataDict:
+            forwardReturnsDF = pivotedDataDict[ReturnType.Forward]
+            backwardReturnsDF = pivotedDataDict[ReturnType.Backward]
+            mixedReturnsDF = pandas.DataFrame(
+                DataProvider.MixReturnValues(forwardReturnsDF.values, backwardReturnsDF.values),
+                index=forwardReturnsDF.index, columns=forwardReturnsDF.columns)
+            pivotedDataDict[ReturnType.Mixed] = mixedReturnsDF
 
         return pivotedDataDict
 
+    @staticmethod
+    def MixReturnValues(forwardReturns: numpy.ndarray, backwardReturns: numpy.ndarray) -> numpy.ndarray:
+        '''
+        Constructs the mixed returns from dates x securities arrays of forward and backward returns. A row of
+        forward returns that is all zeros is replaced by the backward returns of the next row, and otherwise
+        the missing forward returns are replaced by the next row's backward returns.
+
+        The backward returns may have one more row than the forward returns, so that a block of rows can be
+        mixed on its own given the first backward row of the following block. The last forward row without a
+        following backward row is left as it is.
+        '''
+
+        mixedReturns = numpy.array(forwardReturns, dtype=numpy.float64)
+        numberOfMixedRows = min(len(mixedReturns), len(backwardReturns) - 1)
+        if numberOfMixedRows <= 0:
+            return mixedReturns
+
+        currentReturns = mixedReturns[:numberOfMixedRows]
+        nextBackwardReturns = numpy.asarray(backwardReturns, dtype=numpy.float64)[1:numberOfMixedRows + 1]
+
+        # fmin and fmax skip missing values like the pandas row minimum and maximum, so a row of zeros and
+        # missing values counts as a row of zeros, and a row of missing values does not.
+        isZeroRow = ((numpy.fmin.reduce(currentReturns, axis=1, initial=numpy.inf) == 0.0) &
+                     (numpy.fmax.reduce(currentReturns, axis=1, initial=-numpy.inf) == 0.0))
+        isReplaced = isZeroRow[:, numpy.newaxis] | numpy.isnan(currentReturns)
+        currentReturns[isReplaced] = nextBackwardReturns[isReplaced]
+
+        return mixedReturns
+
     @staticmethod
     def CachedLoad(inputCachePath: Path, filename: str, cacheType=CacheType.Csv) -> pandas.DataFrame():
         '''
@@ -84,9 +99,14 @@ class DataProvider(object):
 
             return pivotedDataDict
 
+        elif(cacheType == CacheType.Panel):
+            # Read in every field of the on-disk panel store
+            from BacktestingEngine.PanelStore import PanelStore
+            return PanelStore(inputCachePath / filename).ReadDataDict()
+
         else:
             raise NotImplementedError(
-                "Cached load is currently only supported for Csv.")
+                "Cached load is currently only supported for Csv and Panel.")
 
     @staticmethod
     def __RenameCsvColumns(csvDataDF: pandas.DataFrame):
@@ -111,5 +131,9 @@ class DataProvider(object):
             return FactorName.Factor1
         elif lowerColumnNameStr == "factor_2" or lowerColumnNameStr == "factor2":
             return FactorName.Factor2
+        elif lowerColumnNameStr == "factor_3" or lowerColumnNameStr == "factor3":
+            return FactorName.Factor3
+        elif lowerColumnNameStr == "factor_4" or lowerColumnNameStr == "factor4":
+            return FactorName.Factor4
         else:
             raise NotImplementedError("Unrecognised column name.")
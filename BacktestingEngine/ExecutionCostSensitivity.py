@@ -0,0 +1,99 @@
+import numpy
+import pandas
+
+
+class ExecutionCostSensitivity(object):
+    '''
+    Holds the execution cost independent components of a backtest, recorded once per date, and produces the
+    portfolio returns for any set of execution cost rates without re-running the signals or the rebalance.
+
+    The execution costs enter the returns of DollarNeutralEqualWeightPortfolio linearly, through the
+    absolute change in portfolio weights times the execution cost rate. Hence for every date the returns are
+    of the form a - b * executionCostRate, where a and b only depend on the portfolio values and turnover.
+    '''
+
+    def __init__(self, dates: pandas.Index, longPortfolioValues_T1: numpy.ndarray,
+                 longPortfolioValues_T2: numpy.ndarray, shortPortfolioValues_T1: numpy.ndarray,
+                 shortPortfolioValues_T2: numpy.ndarray, absoluteChangeInPortfolioWeights: numpy.ndarray,
+                 turnoverRatios: numpy.ndarray):
+        self.Dates = dates
+        self.LongPortfolioValues_T1 = numpy.asarray(longPortfolioValues_T1, dtype=numpy.float64)
+        self.LongPortfolioValues_T2 = numpy.asarray(longPortfolioValues_T2, dtype=numpy.float64)
+        self.ShortPortfolioValues_T1 = numpy.asarray(shortPortfolioValues_T1, dtype=numpy.float64)
+        self.ShortPortfolioValues_T2 = numpy.asarray(shortPortfolioValues_T2, dtype=numpy.float64)
+        self.AbsoluteChangeInPortfolioWeights = numpy.asarray(absoluteChangeInPortfolioWeights, dtype=numpy.float64)
+        self.TurnoverRatios = numpy.asarray(turnoverRatios, dtype=numpy.float64)
+
+    def CalculatePortfolioReturns(self, executionCostRates: [float]) -> {}:
+        '''
+        Returns the long, short and long-short portfolio returns for each of the execution cost rates, as a
+        dictionary of dates x execution cost rates data frames keyed by the PortfolioPerformance attribute
+        names.
+        '''
+
+        executionCostRates = ExecutionCostSensitivity.__ValidateExecutionCostRates(executionCostRates)
+
+        # The long and short books each carry half of the execution costs (see
+        # DollarNeutralEqualWeightPortfolio.CalculatePortfolioReturns).
+        executionCosts = 0.5 * numpy.outer(self.AbsoluteChangeInPortfolioWeights, executionCostRates)
+
+        longPortfolioValues_T1 = self.LongPortfolioValues_T1[:, numpy.newaxis]
+        longPortfolioProfits = (self.LongPortfolioValues_T2 - self.LongPortfolioValues_T1)[:, numpy.newaxis] - \
+            executionCosts
+        shortPortfolioProfits = (self.ShortPortfolioValues_T2 - self.ShortPortfolioValues_T1)[:, numpy.newaxis] - \
+            executionCosts
+
+        longPortfolioReturns = longPortfolioProfits / longPortfolioValues_T1
+        shortPortfolioReturns = shortPortfolioProfits / (-1.0 * self.ShortPortfolioValues_T1[:, numpy.newaxis])
+        portfolioReturns = (self.LongPortfolioValues_T2[:, numpy.newaxis] - executionCosts +
+                            shortPortfolioProfits) / longPortfolioValues_T1 - 1.0
+
+        columns = pandas.Index(executionCostRates, name="ExecutionCostRate")
+        return {
+            "LongPortfolioReturn": pandas.DataFrame(longPortfolioReturns, index=self.Dates, columns=columns),
+            "ShortPortfolioReturn": pandas.DataFrame(shortPortfolioReturns, index=self.Dates, columns=columns),
+            "LongShortPortfolioReturn": pandas.DataFrame(portfolioReturns, index=self.Dates, columns=columns)}
+
+    def CalculateSummaryStatistics(self, executionCostRates: [float]) -> pandas.DataFrame:
+        '''
+        Returns summary statistics of the long-short portfolio returns for each of the execution cost rates:
+        the mean and standard deviation of the per period return, their ratio, the compounded return over
+        the backtest, and the mean turnover ratio (which does not depend on the cost rate).
+        '''
+
+        portfolioReturns = self.CalculatePortfolioReturns(executionCostRates)["LongShortPortfolioReturn"]
+        meanReturns = portfolioReturns.mean(axis=0)
+        standardDeviations = portfolioReturns.std(axis=0)
+        return pandas.DataFrame({
+            "MeanReturn": meanReturns,
+            "StandardDeviation": standardDeviations,
+            "MeanToStandardDeviation": meanReturns / standardDeviations,
+            "CumulativeReturn": (1.0 + portfolioReturns).prod(axis=0) - 1.0,
+            "MeanTurnoverRatio": numpy.nanmean(self.TurnoverRatios)})
+
+    def CalculateBreakEvenExecutionCostRate(self) -> float:
+        '''
+        Returns the execution cost rate at which the mean per period long-short return is zero. The long-short
+        return is a - b * executionCostRate on every date, so the break even rate is mean(a) / mean(b). If the
+        strategy does not make money before execution costs, the break even rate is zero.
+        '''
+
+        grossPortfolioReturns = (self.LongPortfolioValues_T2 + self.ShortPortfolioValues_T2 -
+                                 self.ShortPortfolioValues_T1) / self.LongPortfolioValues_T1 - 1.0
+        executionCostSensitivities = self.AbsoluteChangeInPortfolioWeights / self.LongPortfolioValues_T1
+
+        meanGrossPortfolioReturn = numpy.nanmean(grossPortfolioReturns)
+        meanExecutionCostSensitivity = numpy.nanmean(executionCostSensitivities)
+        if meanGrossPortfolioReturn <= 0.0:
+            return 0.0
+        if meanExecutionCostSensitivity == 0.0:
+            return numpy.inf
+        return meanGrossPortfolioReturn / meanExecutionCostSensitivity
+
+    @staticmethod
+    def __ValidateExecutionCostRates(executionCostRates: [float]) -> numpy.ndarray:
+        executionCostRates = numpy.atleast_1d(numpy.asarray(executionCostRates, dtype=numpy.float64))
+        if numpy.any(executionCostRates < 0.0):
+            raise ValueError(f"The execution cost rate must be greater than or equal to zero. The value provided "
+                             f"was {executionCostRates.min()}.")
+        return executionCostRates
@@ -0,0 +1,142 @@
+import json
+import numpy
+import pandas
+
+from pathlib import Path
+
+from Common.Enumerations.FactorName import FactorName
+from Common.Enumerations.ReturnType import ReturnType
+
+
+class PanelStore(object):
+    '''
+    An on-disk store for the dates x securities panels loaded by the DataProvider, so that panels larger than
+    memory can be read a block of dates at a time.
+
+    The store is a directory holding one raw float64 file per field (a ReturnType or FactorName), written row
+    by row, an int64 file of the dates, and a small JSON file describing the securities and fields. Rows are
+    appended to the end of the files, and any block of rows is read through a memory map without loading the
+    rest of the file.
+    '''
+
+    MetadataFileName = "panel.json"
+    DatesFileName = "DateTime.bin"
+
+    def __init__(self, directoryPathStr: str):
+        self.DirectoryPath = Path(directoryPathStr)
+        with open(self.DirectoryPath / PanelStore.MetadataFileName, "r") as metadataFile:
+            metadata = json.load(metadataFile)
+        self.Securities = pandas.Index(metadata["Securities"], name="SecurityId")
+        self.Fields = [PanelStore.__ParseFieldName(x) for x in metadata["Fields"]]
+        self.NumberOfDates = metadata["NumberOfDates"]
+
+    @staticmethod
+    def Create(directoryPathStr: str, securities: list, fields: list):
+        '''
+        Creates an empty store for the given securities and fields, replacing any existing store in the
+        directory.
+        '''
+
+        directoryPath = Path(directoryPathStr)
+        directoryPath.mkdir(parents=True, exist_ok=True)
+        for fileName in [PanelStore.DatesFileName] + [f"{x.name}.bin" for x in fields]:
+            open(directoryPath / fileName, "wb").close()
+        PanelStore.__WriteMetadata(directoryPath, list(securities), fields, 0)
+        return PanelStore(directoryPathStr)
+
+    @staticmethod
+    def FromDataDict(directoryPathStr: str, dataDict: dict, fields: list = None):
+        '''
+        Creates a store from a dictionary of panels, e.g. the output of DataProvider.FilteredCachedLoad. By
+        default every ReturnType and FactorName panel in the dictionary is stored.
+        '''
+
+        if fields is None:
+            fields = [x for x in dataDict.keys() if isinstance(x, (ReturnType, FactorName))]
+        firstDF = dataDict[fields[0]]
+        panelStore = PanelStore.Create(directoryPathStr, firstDF.columns, fields)
+        panelStore.Append(firstDF.index, {x: dataDict[x] for x in fields})
+        return panelStore
+
+    def Append(self, dates, panelsDict: dict):
+        '''
+        Appends rows to the end of the store. The panels are dates x securities arrays or data frames, one for
+        every field of the store, with the securities in the order of the store.
+        '''
+
+        dates = pandas.DatetimeIndex(dates)
+        fieldValues = []
+        for field in self.Fields:
+            values = panelsDict[field]
+            if isinstance(values, pandas.DataFrame):
+                if numpy.array_equal(values.columns, self.Securities) == False:
+                    raise ValueError(f"The securities of the {field.name} panel do not match those in the store.")
+                values = values.values
+            values = numpy.ascontiguousarray(values, dtype=numpy.float64)
+            if values.shape != (len(dates), len(self.Securities)):
+                raise ValueError(f"The {field.name} panel does not have one row per date and column per security.")
+            fieldValues.append(values)
+
+        for (field, values) in zip(self.Fields, fieldValues):
+            with open(self.__GetFieldPath(field), "ab") as fieldFile:
+                values.tofile(fieldFile)
+        with open(self.DirectoryPath / PanelStore.DatesFileName, "ab") as datesFile:
+            dates.asi8.astype(numpy.int64).tofile(datesFile)
+
+        self.NumberOfDates += len(dates)
+        PanelStore.__WriteMetadata(self.DirectoryPath, list(self.Securities), self.Fields, self.NumberOfDates)
+
+    def ReadDates(self, start=0, stop=None) -> pandas.DatetimeIndex:
+        '''
+        Reads the dates of the rows start to stop (exclusive).
+        '''
+        start, stop = self.__ClipRows(start, stop)
+        dates = numpy.zeros(0, dtype=numpy.int64)
+        if stop > start:
+            dates = numpy.memmap(self.DirectoryPath / PanelStore.DatesFileName, dtype=numpy.int64, mode="r",
+                                 offset=start * 8, shape=(stop - start,))
+        return pandas.DatetimeIndex(numpy.array(dates).view("datetime64[ns]"), name="DateTime")
+
+    def ReadValues(self, field, start=0, stop=None) -> numpy.ndarray:
+        '''
+        Reads the rows start to stop (exclusive) of a field as a dates x securities array. Only these rows are
+        read from disk.
+        '''
+        start, stop = self.__ClipRows(start, stop)
+        if stop == start:
+            return numpy.zeros((0, len(self.Securities)))
+        values = numpy.memmap(self.__GetFieldPath(field), dtype=numpy.float64, mode="r",
+                              offset=start * len(self.Securities) * 8, shape=(stop - start, len(self.Securities)))
+        return numpy.array(values)
+
+    def ReadDataDict(self, start=0, stop=None, fields: list = None) -> dict:
+        '''
+        Reads the rows start to stop (exclusive) as a dictionary of data frames keyed by field, in the form
+        returned by the DataProvider.
+        '''
+        dates = self.ReadDates(start, stop)
+        return {x: pandas.DataFrame(self.ReadValues(x, start, stop), index=dates, columns=self.Securities)
+                for x in (self.Fields if fields is None else fields)}
+
+    def __ClipRows(self, start: int, stop: int) -> tuple:
+        stop = self.NumberOfDates if stop is None else min(stop, self.NumberOfDates)
+        return min(start, stop), stop
+
+    def __GetFieldPath(self, field) -> Path:
+        return self.DirectoryPath / f"{field.name}.bin"
+
+    @staticmethod
+    def __WriteMetadata(directoryPath: Path, securities: list, fields: list, numberOfDates: int):
+        metadata = {"Securities": [x.item() if isinstance(x, numpy.generic) else x for x in securities],
+                    "Fields": [x.name for x in fields], "NumberOfDates": numberOfDates}
+        with open(directoryPath / PanelStore.MetadataFileName, "w") as metadataFile:
+            json.dump(metadata, metadataFile)
+
+    @staticmethod
+    def __ParseFieldName(fieldNameStr: str):
+        if fieldNameStr in ReturnType.__members__:
+            return ReturnType[fieldNameStr]
+        elif fieldNameStr in FactorName.__members__:
+            return FactorName[fieldNameStr]
+        else:
+            raise NotImplementedError(f"Unrecognised field name {fieldNameStr}.")
@@ -0,0 +1,85 @@
+import numpy
+import pandas
+
+from BacktestingEngine.PanelStore import PanelStore
+from Common.Enumerations.ReturnType import ReturnType
+
+
+class PriceIngestion(object):
+    '''
+    Converts cleaned price panels, e.g. the output of the Yahoo data scraper after equalise_columns, into the
+    forward and backward return panels loaded by the DataProvider, and writes them straight into a panel store
+    (CacheType.Panel) without going through the long csv format.
+
+    The backward return on date n is the price change from date n - 1 to date n, and the forward return on
+    date n is the price change from date n to date n + 1, so the forward return on date n is equal to the
+    backward return on date n + 1, as in the csv data sets.
+    '''
+
+    @staticmethod
+    def ToPricePanel(pricesDF: pandas.DataFrame) -> pandas.DataFrame:
+        '''
+        Converts a wide price data frame, with a 'Date' or 'DateTime' column and one '{ticker}_{type}' price
+        column per security, to a dates x securities panel indexed by date with the tickers as securities. A
+        data frame that is already indexed by date is only converted to float64.
+        '''
+
+        pricePanelDF = pricesDF
+        for dateColumn in ["DateTime", "Date"]:
+            if dateColumn in pricesDF.columns:
+                pricePanelDF = pricesDF.set_index(dateColumn)
+                pricePanelDF.index = pandas.DatetimeIndex(pricePanelDF.index)
+                pricePanelDF.columns = [str(x).rsplit("_", 1)[0] for x in pricePanelDF.columns]
+                break
+
+        if pricePanelDF.columns.has_duplicates:
+            raise ValueError("The price data frame must hold exactly one price column per security.")
+        pricePanelDF = pricePanelDF.astype(numpy.float64)
+        pricePanelDF.index.name = "DateTime"
+        pricePanelDF.columns.name = "SecurityId"
+        return pricePanelDF
+
+    @staticmethod
+    def CalculateReturns(pricePanelDF: pandas.DataFrame) -> dict:
+        '''
+        Calculates the forward and backward returns of a dates x securities price panel. The backward returns
+        of the first date and the forward returns of the last date are missing, as are the returns before a
+        security's first price.
+
+        A missing price is carried forward from the last valid price, so the return over a gap is measured
+        between consecutive valid prices, and is zero on the dates without a price. A missing return would
+        otherwise be booked as a total loss by a portfolio that holds the security.
+        '''
+
+        prices = pricePanelDF.ffill().values
+        backwardReturns = numpy.full(prices.shape, numpy.nan)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            numpy.divide(prices[1:], prices[:-1], out=backwardReturns[1:])
+        backwardReturns[1:] -= 1.0
+
+        forwardReturns = numpy.full(prices.shape, numpy.nan)
+        forwardReturns[:-1] = backwardReturns[1:]
+
+        return {ReturnType.Forward: pandas.DataFrame(forwardReturns, index=pricePanelDF.index,
+                                                     columns=pricePanelDF.columns),
+                ReturnType.Backward: pandas.DataFrame(backwardReturns, index=pricePanelDF.index,
+                                                      columns=pricePanelDF.columns)}
+
+    @staticmethod
+    def WritePanelStore(directoryPathStr: str, pricesDF: pandas.DataFrame, factorsDict: dict = None) -> PanelStore:
+        '''
+        Calculates the returns of a price data frame, and writes them to a new panel store in the directory,
+        replacing any existing store. The factor panels, keyed by FactorName, are stored alongside the returns
+        and must have the dates and securities of the price panel.
+
+        The last date is not stored, as its forward returns are only known once the next price is available,
+        and the portfolio construction would treat them as a total loss.
+        '''
+
+        pricePanelDF = PriceIngestion.ToPricePanel(pricesDF)
+        dataDict = PriceIngestion.CalculateReturns(pricePanelDF)
+        for (factorName, factorDF) in ({} if factorsDict is None else factorsDict).items():
+            if not (factorDF.index.equals(pricePanelDF.index) and factorDF.columns.equals(pricePanelDF.columns)):
+                raise ValueError(f"The {factorName.name} panel does not have the dates and securities of the prices.")
+            dataDict[factorName] = factorDF
+        return PanelStore.FromDataDict(directoryPathStr, {x: y.iloc[:-1] for (x, y) in dataDict.items()})
@@ -0,0 +1,78 @@
+import numpy
+import pandas
+
+from Common.Enumerations.RebalanceFrequency import RebalanceFrequency
+
+
+class RebalanceSchedule(object):
+    '''
+    The calendar on which a strategy is rebalanced, independent of the frequency of the data. The portfolio is
+    rebalanced on every Nth bar, on the first bar of every week or month, or on the first bar on or after each
+    of an explicit list of dates.
+
+    Between two rebalance dates the portfolio is held, so the security returns of the bars in between are
+    compounded into a single holding period return. The return on a rebalance date is the return earned by the
+    portfolio formed on that date, up to the next rebalance date.
+    '''
+
+    def __init__(self, rebalanceFrequency=RebalanceFrequency.EveryNBars, numberOfBars=1, rebalanceDates=None):
+        if rebalanceFrequency == RebalanceFrequency.EveryNBars and numberOfBars < 1:
+            raise ValueError(f"The number of bars must be at least 1. The value provided was {numberOfBars}.")
+        if rebalanceFrequency == RebalanceFrequency.Dates and rebalanceDates is None:
+            raise ValueError("A list of rebalance dates is required for a Dates rebalance schedule.")
+        self.RebalanceFrequency = rebalanceFrequency
+        self.NumberOfBars = numberOfBars
+        self.RebalanceDates = None if rebalanceDates is None else pandas.DatetimeIndex(rebalanceDates).sort_values()
+
+    def GetRebalanceMask(self, dates: pandas.Index) -> numpy.ndarray:
+        '''
+        Returns a boolean array marking the dates on which the portfolio is rebalanced.
+        '''
+
+        dates = pandas.DatetimeIndex(dates)
+        rebalanceMask = numpy.zeros(len(dates), dtype=bool)
+        if len(dates) == 0:
+            return rebalanceMask
+
+        if self.RebalanceFrequency == RebalanceFrequency.EveryNBars:
+            rebalanceMask[::self.NumberOfBars] = True
+        elif (self.RebalanceFrequency == RebalanceFrequency.Weekly or
+              self.RebalanceFrequency == RebalanceFrequency.Monthly):
+            periods = dates.to_period("W" if self.RebalanceFrequency == RebalanceFrequency.Weekly else "M")
+            periodValues = periods.asi8
+            rebalanceMask[0] = True
+            rebalanceMask[1:] = periodValues[1:] != periodValues[:-1]
+        elif self.RebalanceFrequency == RebalanceFrequency.Dates:
+            # the first bar on or after each rebalance date
+            rebalanceIndices = dates.searchsorted(self.RebalanceDates, side="left")
+            rebalanceMask[rebalanceIndices[rebalanceIndices < len(dates)]] = True
+        else:
+            raise NotImplementedError("The requested rebalance frequency has not been implemented.")
+
+        return rebalanceMask
+
+    def SelectRebalanceDates(self, dataDF: pandas.DataFrame) -> pandas.DataFrame:
+        '''
+        Returns the rows of a panel, e.g. the factor data, that fall on the rebalance dates.
+        '''
+        return dataDF.loc[self.GetRebalanceMask(dataDF.index)]
+
+    def CompoundReturns(self, returnsDF: pandas.DataFrame) -> pandas.DataFrame:
+        '''
+        Compounds the returns of each security over every holding period, and returns them indexed by the
+        rebalance dates. A missing return is skipped, and a holding period return is only missing if all the
+        returns in the period are missing. The returns before the first rebalance date are discarded.
+        '''
+
+        rebalanceIndices = numpy.flatnonzero(self.GetRebalanceMask(returnsDF.index))
+        if len(rebalanceIndices) == 0:
+            return returnsDF.iloc[:0].astype(numpy.float64)
+
+        returnValues = returnsDF.values[rebalanceIndices[0]:].astype(numpy.float64)
+        periodStarts = rebalanceIndices - rebalanceIndices[0]
+        isValid = ~numpy.isnan(returnValues)
+        growth = numpy.multiply.reduceat(numpy.where(isValid, 1.0 + returnValues, 1.0), periodStarts, axis=0)
+        validCounts = numpy.add.reduceat(isValid.astype(numpy.int64), periodStarts, axis=0)
+        compoundedReturns = numpy.where(validCounts > 0, growth - 1.0, numpy.nan)
+
+        return pandas.DataFrame(compoundedReturns, index=returnsDF.index[rebalanceIndices], columns=returnsDF.columns)
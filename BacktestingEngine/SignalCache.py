@@ -0,0 +1,142 @@
+import hashlib
+import numpy
+import pandas
+import threading
+
+from pathlib import Path
+
+from TradingStrategies.TradingStrategyName import TradingStrategyName
+from TradingStrategies.LongBestShortWorst import LongBestShortWorst
+
+
+class SignalCache(object):
+    '''
+    Caches the trading signals produced by a trading strategy for a full panel of factor data. Signals do
+    not depend on the execution cost rate or on the portfolio construction method, so backtests that only
+    vary these inputs can share a single set of signals.
+
+    Signals only take the values -1, 0 and 1, so they are stored as int8 matrices. Entries are keyed by the
+    trading strategy, the factor, the percentile and a fingerprint of the factor data. If the factor data
+    changes, the fingerprint changes and the stale entry is discarded. When a cache directory is provided,
+    entries are also spilled to disk as .npy files and reloaded on a cache miss.
+
+    The cache may be shared between threads. The entries, the counters and the files are only accessed under
+    a lock, while the signals of a miss are generated outside it.
+    '''
+
+    def __init__(self, cacheDirectoryStr: str = None):
+        self.CacheDirectory = None if cacheDirectoryStr is None else Path(cacheDirectoryStr)
+        if self.CacheDirectory is not None:
+            self.CacheDirectory.mkdir(parents=True, exist_ok=True)
+        self.__Signals = {}  # (tradingStrategyName, factorKey, percentile) -> (fingerprint, int8 matrix)
+        self.Hits = 0
+        self.Misses = 0
+        self.__Lock = threading.Lock()
+
+    def GetTradingSignals(self, tradingStrategyName: TradingStrategyName, factorName, percentile: float,
+                          factorDataDF: pandas.DataFrame) -> pandas.DataFrame:
+        '''
+        Returns the trading signals for every row of the provided factor data, generating and caching them if
+        they are not already available. The signals are returned as floats, indexed like the factor data.
+        '''
+
+        signalsMatrix = self.GetTradingSignalsMatrix(tradingStrategyName, factorName, percentile, factorDataDF)
+        return pandas.DataFrame(
+            signalsMatrix.astype(numpy.float64), index=factorDataDF.index, columns=factorDataDF.columns)
+
+    def GetTradingSignalsMatrix(self, tradingStrategyName: TradingStrategyName, factorName, percentile: float,
+                                factorDataDF: pandas.DataFrame) -> numpy.ndarray:
+        '''
+        As GetTradingSignals, but returns the cached dates x securities int8 matrix itself. The matrix is 
+        shared with the cache and must not be modified.
+        '''
+
+        fingerprint = SignalCache.Fingerprint(factorDataDF)
+        key = (tradingStrategyName, str(factorName), float(percentile))
+
+        # In memory lookup
+        # ================
+
+        with self.__Lock:
+            signalsMatrix = None
+            cachedFingerprint, cachedMatrix = self.__Signals.get(key, (None, None))
+            if cachedFingerprint == fingerprint:
+                signalsMatrix = cachedMatrix
+            elif cachedFingerprint is not None:  # the factor data has changed since the signals were cached
+                self.__Signals.pop(key, None)
+
+            # On disk lookup
+            # ==============
+
+            if signalsMatrix is None and self.CacheDirectory is not None:
+                filePath = self.__GetFilePath(key, fingerprint)
+                if filePath.is_file():
+                    signalsMatrix = numpy.load(filePath, allow_pickle=False)
+                    if signalsMatrix.shape != factorDataDF.shape:
+                        signalsMatrix = None
+                    else:
+                        self.__Signals[key] = (fingerprint, signalsMatrix)
+
+            if signalsMatrix is not None:
+                self.Hits += 1
+                return signalsMatrix
+            self.Misses += 1
+
+        # Generate the signals on a cache miss
+        # ====================================
+
+        signalsDF = SignalCache.GenerateTradingSignals(tradingStrategyName, factorDataDF, percentile)
+        signalsMatrix = signalsDF.values.astype(numpy.int8)
+        with self.__Lock:
+            self.__Signals[key] = (fingerprint, signalsMatrix)
+            if self.CacheDirectory is not None:
+                self.__RemoveStaleFiles(key)
+                numpy.save(self.__GetFilePath(key, fingerprint), signalsMatrix, allow_pickle=False)
+
+        return signalsMatrix
+
+    def Clear(self):
+        '''
+        Removes all entries from the in memory cache and from the cache directory.
+        '''
+        with self.__Lock:
+            self.__Signals.clear()
+            if self.CacheDirectory is not None:
+                for filePath in self.CacheDirectory.glob("signals_*.npy"):
+                    filePath.unlink()
+
+    @staticmethod
+    def Fingerprint(dataDF: pandas.DataFrame) -> str:
+        '''
+        Returns a hash of the values, index and columns of a data frame. Any change to the data produces a
+        different fingerprint.
+        '''
+        hasher = hashlib.sha1()
+        hasher.update(pandas.util.hash_pandas_object(dataDF, index=True).values.tobytes())
+        hasher.update(repr(list(dataDF.columns)).encode("utf-8"))
+        return hasher.hexdigest()
+
+    @staticmethod
+    def GenerateTradingSignals(tradingStrategyName: TradingStrategyName, factorDataDF: pandas.DataFrame,
+                               percentile: float) -> pandas.DataFrame:
+        '''
+        Generates the trading signals of the strategy without caching them.
+        '''
+        if tradingStrategyName == TradingStrategyName.LongBestShortWorst:
+            return LongBestShortWorst.GenerateTradingSignals(factorDataDF, percentile)
+        else:
+            raise NotImplementedError("The requested trading strategy has not been implemented.")
+
+    def __GetFilePath(self, key: tuple, fingerprint: str) -> Path:
+        return self.CacheDirectory / (SignalCache.__GetFilePrefix(key) + fingerprint + ".npy")
+
+    def __RemoveStaleFiles(self, key: tuple):
+        # Files for the same strategy, factor and percentile but a different fingerprint are out of date.
+        for filePath in self.CacheDirectory.glob(SignalCache.__GetFilePrefix(key) + "*.npy"):
+            filePath.unlink()
+
+    @staticmethod
+    def __GetFilePrefix(key: tuple) -> str:
+        tradingStrategyName, factorKey, percentile = key
+        factorStr = "".join(x if x.isalnum() else "-" for x in factorKey)
+        return f"signals_{tradingStrategyName.name}_{factorStr}_{percentile!r}_"
@@ -0,0 +1,200 @@
+import argparse
+import json
+import math
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from Common.Enumerations.CacheType import CacheType
+from Common.Enumerations.FactorName import FactorName
+from PortfolioConstruction.PortfolioConstructionName import PortfolioConstructionName
+from TradingStrategies.TradingStrategyName import TradingStrategyName
+
+
+class BacktestService(object):
+    '''
+    A long lived local service that keeps the datasets loaded and serves backtest requests over HTTP, so that
+    interactive tools do not pay for the interpreter start up, imports and data load on every backtest.
+
+    A request is a JSON object POSTed to /backtest, e.g.
+
+        {"InputCachePath": ".", "InputDataFilename": "dataset.csv", "TradingStrategy": "LongBestShortWorst",
+         "PortfolioConstruction": "DollarNeutralEqualWeightPortfolio", "Factor": "Factor2", "Percentile": 0.2,
+         "ExecutionCostRate": 0.1}
+
+    and the response holds the results in columns: a list of ISO dates and a list of values for each
+    PortfolioPerformance attribute, with missing values as null. Concurrent requests are queued and run on a
+    fixed size pool of worker threads. One engine is kept per dataset, so its data and trading signals are
+    shared between requests. Each request runs on a snapshot of the engine, so the requests on the same
+    dataset run concurrently while a change to its file is reloaded for the later requests.
+
+    Invalid requests are answered with status 400, and any other error with status 500, both with the error
+    in the response.
+    '''
+
+    def __init__(self, host="127.0.0.1", port=8765, numberOfWorkers=4):
+        self.Engines = {}
+        self.__EnginesLock = threading.Lock()
+        self.__Executor = ThreadPoolExecutor(max_workers=numberOfWorkers)
+        self.__Server = ThreadingHTTPServer((host, port), BacktestService.__CreateRequestHandler(self))
+        self.__ServerThread = None
+
+    @property
+    def Address(self) -> tuple:
+        '''
+        The (host, port) the service is listening on. Port 0 binds to a free port.
+        '''
+        return self.__Server.server_address
+
+    def GetEngine(self, inputCachePathStr: str, inputDataFilenameStr: str, cacheType=CacheType.Csv):
+        '''
+        Returns the engine for a dataset, creating it and loading the data on the first request.
+        '''
+        engine, engineLock = self.__GetEngineAndLock(inputCachePathStr, inputDataFilenameStr, cacheType)
+        with engineLock:  # the data is loaded, or reloaded after a change to the file, once for all requests
+            engine.LoadData()
+        return engine
+
+    def RunBacktest(self, request: dict) -> dict:
+        '''
+        Runs the backtest described by a request and returns the columnar results.
+        '''
+
+        backtestArguments = BacktestService.ParseBacktestArguments(request)
+        engine, engineLock = self.__GetEngineAndLock(*BacktestService.ParseDataset(request))
+        with engineLock:  # the data is reloaded once for all requests after a change to the file
+            engine.LoadData()
+            engineSnapshot = engine.Snapshot()
+        portfolioPerformance = engineSnapshot.BacktestTradingStrategy(**backtestArguments)
+
+        from Common.Analytics.PerformanceAnalytics import PerformanceAnalytics
+        performanceDF = PerformanceAnalytics.ToDataFrame(portfolioPerformance)
+        results = {"Dates": [x.isoformat() for x in performanceDF.index]}
+        for column in performanceDF.columns:
+            results[column] = [None if math.isnan(x) else x for x in performanceDF[column].tolist()]
+        return results
+
+    @staticmethod
+    def ParseDataset(request: dict) -> tuple:
+        '''
+        Returns the (input cache path, input data filename, cache type) of a request.
+        '''
+        return (request.get("InputCachePath", "."), request["InputDataFilename"],
+                CacheType[request.get("CacheType", CacheType.Csv.name)])
+
+    @staticmethod
+    def ParseBacktestArguments(request: dict) -> dict:
+        '''
+        Returns the keyword arguments of BacktestingEngine.BacktestTradingStrategy for a request. The trading
+        strategy, portfolio construction and factor are given by their enumeration names.
+        '''
+        return {
+            "tradingStrategyName": TradingStrategyName[request.get(
+                "TradingStrategy", TradingStrategyName.LongBestShortWorst.name)],
+            "portfolioConstructionName": PortfolioConstructionName[request.get(
+                "PortfolioConstruction", PortfolioConstructionName.DollarNeutralEqualWeightPortfolio.name)],
+            "factorName": FactorName[request["Factor"]],
+            "percentile": float(request["Percentile"]),
+            "executionCostRate": float(request.get("ExecutionCostRate", 0.0))}
+
+    def __GetEngineAndLock(self, inputCachePathStr: str, inputDataFilenameStr: str, cacheType: CacheType) -> tuple:
+        key = (inputCachePathStr, inputDataFilenameStr, cacheType)
+        with self.__EnginesLock:
+            if key not in self.Engines:
+                # The engine, and pandas with it, is only imported on the first request, so the service starts
+                # listening without waiting for it.
+                from BacktestingEngine.BacktestingEngine import BacktestingEngine
+                self.Engines[key] = (BacktestingEngine(inputCachePathStr, inputDataFilenameStr, cacheType),
+                                     threading.Lock())
+            return self.Engines[key]
+
+    def Submit(self, request: dict):
+        '''
+        Queues a request on the worker pool and returns its future.
+        '''
+        return self.__Executor.submit(self.RunBacktest, request)
+
+    def Start(self):
+        '''
+        Serves requests on a background thread.
+        '''
+        self.__ServerThread = threading.Thread(target=self.__Server.serve_forever, daemon=True)
+        self.__ServerThread.start()
+
+    def ServeForever(self):
+        '''
+        Serves requests on the calling thread until interrupted.
+        '''
+        try:
+            self.__Server.serve_forever()
+        finally:
+            self.Stop()
+
+    def Stop(self):
+        '''
+        Stops the server and waits for the queued requests to finish.
+        '''
+        if self.__ServerThread is not None:
+            self.__Server.shutdown()
+            self.__ServerThread.join()
+            self.__ServerThread = None
+        self.__Server.server_close()
+        self.__Executor.shutdown(wait=True)
+
+    @staticmethod
+    def __CreateRequestHandler(service):
+
+        class BacktestRequestHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path == "/health":
+                    self.__SendJson(200, {"Status": "Ok", "Datasets": len(service.Engines)})
+                else:
+                    self.__SendJson(404, {"Error": f"Unknown path {self.path}."})
+
+            def do_POST(self):
+                if self.path != "/backtest":
+                    self.__SendJson(404, {"Error": f"Unknown path {self.path}."})
+                    return
+                try:
+                    request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                    results = service.Submit(request).result()
+                except (KeyError, ValueError, TypeError, AttributeError, NotImplementedError,
+                        FileNotFoundError) as error:
+                    self.__SendJson(400, {"Error": f"{type(error).__name__}: {error}"})
+                    return
+                except Exception as error:
+                    self.__SendJson(500, {"Error": f"{type(error).__name__}: {error}"})
+                    return
+                self.__SendJson(200, results)
+
+            def log_message(self, format, *args):
+                pass  # the service is queried many times a second by interactive tools
+
+            def __SendJson(self, statusCode: int, content: dict):
+                body = json.dumps(content).encode("utf-8")
+                self.send_response(statusCode)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return BacktestRequestHandler
+
+
+if __name__ == "__main__":
+    argumentParser = argparse.ArgumentParser(description="Serves backtest requests over local HTTP.")
+    argumentParser.add_argument("--host", default="127.0.0.1")
+    argumentParser.add_argument("--port", type=int, default=8765)
+    argumentParser.add_argument("--workers", type=int, default=4)
+    argumentParser.add_argument("--preload", nargs=2, action="append", default=[],
+                                metavar=("INPUT_CACHE_PATH", "INPUT_DATA_FILENAME"),
+                                help="a dataset to load before serving requests")
+    arguments = argumentParser.parse_args()
+
+    backtestService = BacktestService(arguments.host, arguments.port, arguments.workers)
+    for (inputCachePathStr, inputDataFilenameStr) in arguments.preload:
+        backtestService.GetEngine(inputCachePathStr, inputDataFilenameStr)
+    print(f"Serving backtests on http://{backtestService.Address[0]}:{backtestService.Address[1]}")
+    backtestService.ServeForever()
@@ -0,0 +1,149 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from BacktestingRunner.BacktestService import BacktestService
+
+
+class BatchRunner(object):
+    '''
+    Runs a batch of backtests described by a YAML or JSON job file, e.g.
+
+        Workers: 4
+        OutputPath: results
+        Defaults: {InputCachePath: ".", InputDataFilename: dataset.csv, ExecutionCostRate: 0.1}
+        Jobs:
+          - {Name: factor2_p20, Factor: Factor2, Percentile: 0.2}
+          - {Name: factor1_p10, Factor: Factor1, Percentile: 0.1, ExecutionCostRate: 0.0}
+
+    Each job takes the keys of a BacktestService request, with the defaults filled in. The jobs run
+    concurrently on a pool of worker processes, and each worker keeps one engine per dataset, so a dataset is
+    loaded at most once per worker. The results of each job are written to <OutputPath>/<Name>.csv as soon as
+    the job finishes, and the throughput of the batch is reported at the end. As the names are file names,
+    they may only contain letters, digits, '-', '_' and '.'.
+    '''
+
+    Engines = {}  # the engines of the current worker process, by dataset
+
+    @staticmethod
+    def LoadJobFile(jobFilePathStr: str) -> dict:
+        '''
+        Reads a job file. Files ending in .yaml or .yml require PyYAML, and any other file is read as JSON.
+        '''
+
+        jobFilePath = Path(jobFilePathStr)
+        with open(jobFilePath, "r") as jobFile:
+            if jobFilePath.suffix.lower() in (".yaml", ".yml"):
+                try:
+                    import yaml
+                except ImportError as error:
+                    raise ImportError("PyYAML is required to read YAML job files. Use a JSON job file, or "
+                                      "install PyYAML.") from error
+                jobFileDict = yaml.safe_load(jobFile)
+            else:
+                jobFileDict = json.load(jobFile)
+
+        defaults = jobFileDict.get("Defaults", {})
+        jobs = []
+        for (i, job) in enumerate(jobFileDict["Jobs"]):
+            job = {**defaults, **job}
+            job.setdefault("Name", f"job{i}")
+            BatchRunner.__CheckJobName(job["Name"])
+            jobs.append(job)
+        if len(set(x["Name"] for x in jobs)) != len(jobs):
+            raise ValueError("The job names must be unique, as they name the output files.")
+
+        return {"Workers": jobFileDict.get("Workers", os.cpu_count()),
+                "OutputPath": jobFileDict.get("OutputPath", "."), "Jobs": jobs}
+
+    @staticmethod
+    def RunJob(job: dict, outputPathStr: str) -> tuple:
+        '''
+        Runs a single job in the worker process and writes its results. Returns the job name, the number of
+        dates backtested and the time taken in seconds.
+        '''
+
+        # The engine, and pandas with it, is only imported by the worker processes, so that the job file is
+        # read and validated without waiting for it.
+        from BacktestingEngine.BacktestingEngine import BacktestingEngine
+        from Common.Analytics.PerformanceAnalytics import PerformanceAnalytics
+
+        BatchRunner.__CheckJobName(job["Name"])
+        startTime = time.perf_counter()
+        dataset = BacktestService.ParseDataset(job)
+        if dataset not in BatchRunner.Engines:
+            BatchRunner.Engines[dataset] = BacktestingEngine(*dataset)
+        portfolioPerformance = BatchRunner.Engines[dataset].BacktestTradingStrategy(
+            **BacktestService.ParseBacktestArguments(job))
+
+        performanceDF = PerformanceAnalytics.ToDataFrame(portfolioPerformance)
+        performanceDF.to_csv(Path(outputPathStr) / f"{job['Name']}.csv", index_label="DateTime")
+        return job["Name"], len(performanceDF.index), time.perf_counter() - startTime
+
+    @staticmethod
+    def RunBatch(jobs: list, outputPathStr: str, numberOfWorkers: int, log=sys.stdout) -> dict:
+        '''
+        Runs the jobs on a pool of worker processes, logging each job as it finishes. Returns the throughput
+        statistics of the batch.
+        '''
+
+        Path(outputPathStr).mkdir(parents=True, exist_ok=True)
+        startTime = time.perf_counter()
+        numberOfDates = 0
+        failedJobs = []
+        with ProcessPoolExecutor(max_workers=numberOfWorkers) as executor:
+            futures = {executor.submit(BatchRunner.RunJob, job, outputPathStr): job["Name"] for job in jobs}
+            for (i, future) in enumerate(as_completed(futures)):
+                try:
+                    name, jobNumberOfDates, jobSeconds = future.result()
+                except Exception as error:
+                    failedJobs.append(futures[future])
+                    print(f"[{i + 1}/{len(jobs)}] {futures[future]} failed: {type(error).__name__}: {error}",
+                          file=log)
+                    continue
+                numberOfDates += jobNumberOfDates
+                print(f"[{i + 1}/{len(jobs)}] {name}: {jobNumberOfDates} dates in {jobSeconds:.3f}s", file=log)
+
+        elapsedSeconds = time.perf_counter() - startTime
+        statistics = {"Jobs": len(jobs), "FailedJobs": failedJobs, "Workers": numberOfWorkers,
+                      "ElapsedSeconds": elapsedSeconds, "JobsPerSecond": len(jobs) / elapsedSeconds,
+                      "DatesPerSecond": numberOfDates / elapsedSeconds}
+        print(f"{len(jobs) - len(failedJobs)}/{len(jobs)} jobs completed in {elapsedSeconds:.3f}s on "
+              f"{numberOfWorkers} workers: {statistics['JobsPerSecond']:.2f} jobs/s, "
+              f"{statistics['DatesPerSecond']:.0f} dates/s", file=log)
+        return statistics
+
+    @staticmethod
+    def __CheckJobName(name):
+        # The name of a job names its output file, so it must not reach outside the output path.
+        if (not isinstance(name, str) or name in ("", ".", "..") or
+                not all(x.isalnum() or x in "-_." for x in name)):
+            raise ValueError(f"The job name must only contain letters, digits, '-', '_' and '.'. The value "
+                             f"provided was {name!r}.")
+
+    @staticmethod
+    def Main(argumentsList: list = None, log=sys.stdout) -> int:
+        '''
+        The command line entry point. Returns a non-zero exit code if any job failed.
+        '''
+
+        argumentParser = argparse.ArgumentParser(description="Runs a batch of backtests from a job file.")
+        argumentParser.add_argument("jobFile", help="a YAML or JSON job file")
+        argumentParser.add_argument("--workers", type=int, help="overrides the number of workers in the job file")
+        argumentParser.add_argument("--output-path", help="overrides the output path in the job file")
+        arguments = argumentParser.parse_args(argumentsList)
+
+        jobFileDict = BatchRunner.LoadJobFile(arguments.jobFile)
+        statistics = BatchRunner.RunBatch(
+            jobFileDict["Jobs"], arguments.output_path or jobFileDict["OutputPath"],
+            arguments.workers or jobFileDict["Workers"], log)
+        return 1 if len(statistics["FailedJobs"]) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(BatchRunner.Main())
@@ -0,0 +1,129 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from pathlib import Path
+
+
+class ImportTimeBenchmark(object):
+    '''
+    Measures the cold start import time of the command line and batch entry points with python -X importtime,
+    and checks it against a budget. Each module is imported in a fresh interpreter several times, and the
+    median is compared to the budget, e.g.
+
+        python -m BacktestingRunner.ImportTimeBenchmark --repeats 7
+
+    The budget file maps each module to its import time budget in milliseconds, and lists the heavy modules
+    that it must not import, e.g. pandas for the batch runner, whose parent process only reads the job file.
+    Besides the time, which depends on the machine, the heavy modules give a check that does not.
+
+    The entry points, which must start without pandas, are the real target of the budgets. The engine and the
+    scraper import pandas by design, so their budgets are set at the measured time plus a stated margin, to
+    catch a regression such as a heavy optional dependency imported at the top level. Each budget may carry
+    a note on how it was set.
+    '''
+
+    BudgetsFilePath = Path(__file__).parent / "ImportTimeBudgets.json"
+
+    @staticmethod
+    def ParseImportTimes(importTimeOutput: str) -> list:
+        '''
+        Parses the stderr output of python -X importtime into a list of (module name, self microseconds,
+        cumulative microseconds, nesting level) tuples, in the order the imports finished.
+        '''
+
+        importTimes = []
+        for line in importTimeOutput.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            selfMicroseconds, cumulativeMicroseconds, moduleName = line[len("import time:"):].split("|")
+            nestingLevel = (len(moduleName) - len(moduleName.lstrip(" ")) - 1) // 2
+            importTimes.append((moduleName.strip(), int(selfMicroseconds), int(cumulativeMicroseconds),
+                                nestingLevel))
+        return importTimes
+
+    @staticmethod
+    def MeasureImportTime(moduleName: str, repeats=5) -> dict:
+        '''
+        Imports a module in fresh interpreters, and returns the median import time in milliseconds, the modules
+        it imported, and the modules that took the most time themselves.
+        '''
+
+        rootPath = Path(__file__).resolve().parent.parent
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.pathsep.join([str(rootPath)] + ([environment["PYTHONPATH"]]
+                                                                       if environment.get("PYTHONPATH") else []))
+        moduleParts = moduleName.split(".")
+        statementModules = {".".join(moduleParts[:i + 1]) for i in range(len(moduleParts))}
+
+        milliseconds = []
+        for _ in range(repeats):
+            process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {moduleName}"],
+                                     cwd=rootPath, env=environment, capture_output=True, text=True)
+            if process.returncode != 0:
+                raise ImportError(f"{moduleName} could not be imported:\n{process.stderr}")
+            importTimes = ImportTimeBenchmark.ParseImportTimes(process.stderr)
+
+            # The import statement is timed by the top level entries of the module and its parent packages,
+            # which include every module they imported that was not already loaded at start up. The imports of
+            # a module are listed before it, after the top level entries of the start up.
+            milliseconds.append(sum(x[2] for x in importTimes if x[3] == 0 and x[0] in statementModules) / 1000.0)
+            firstIndex = min(i for (i, x) in enumerate(importTimes) if x[3] == 0 and x[0] in statementModules)
+            startIndex = max([i + 1 for i in range(firstIndex) if importTimes[i][3] == 0], default=0)
+            importedModules = importTimes[startIndex:]
+
+        slowestModules = sorted(importedModules, key=lambda x: x[1], reverse=True)[:5]
+        return {"Module": moduleName, "Milliseconds": statistics.median(milliseconds),
+                "ImportedModules": sorted({x[0] for x in importedModules}),
+                "SlowestModules": [(x[0], x[1] / 1000.0) for x in slowestModules]}
+
+    @staticmethod
+    def CheckBudgets(budgets: dict, repeats=5, log=sys.stdout) -> bool:
+        '''
+        Measures every module in the budgets and reports it. Returns False if any module exceeds its time
+        budget or imports one of its forbidden modules.
+        '''
+
+        withinBudget = True
+        for (moduleName, budget) in budgets.items():
+            result = ImportTimeBenchmark.MeasureImportTime(moduleName, repeats)
+            forbiddenModules = [x for x in budget.get("ForbiddenModules", [])
+                                if any(y == x or y.startswith(x + ".") for y in result["ImportedModules"])]
+            isOverBudget = result["Milliseconds"] > budget["Milliseconds"]
+            status = "FAIL" if isOverBudget or len(forbiddenModules) > 0 else "ok"
+            print(f"{status:4} {moduleName}: {result['Milliseconds']:.1f}ms (budget {budget['Milliseconds']}ms)",
+                  file=log)
+            if len(forbiddenModules) > 0:
+                print(f"     imports {', '.join(forbiddenModules)}, which should only be imported on first use",
+                      file=log)
+            if status == "FAIL":
+                print("     slowest: " + ", ".join(f"{x} {y:.1f}ms" for (x, y) in result["SlowestModules"]),
+                      file=log)
+                withinBudget = False
+        return withinBudget
+
+    @staticmethod
+    def Main(argumentsList: list = None) -> int:
+        '''
+        The command line entry point. Returns a non-zero exit code if any module is over its budget.
+        '''
+
+        argumentParser = argparse.ArgumentParser(description="Checks the cold start import times against a budget.")
+        argumentParser.add_argument("modules", nargs="*", help="the modules to measure, by default all in the budget")
+        argumentParser.add_argument("--budgets", default=str(ImportTimeBenchmark.BudgetsFilePath),
+                                    help="a JSON file of the budgets")
+        argumentParser.add_argument("--repeats", type=int, default=5, help="the number of fresh imports per module")
+        arguments = argumentParser.parse_args(argumentsList)
+
+        with open(arguments.budgets, "r") as budgetsFile:
+            budgets = json.load(budgetsFile)
+        if len(arguments.modules) > 0:
+            budgets = {x: budgets[x] for x in arguments.modules}
+        return 0 if ImportTimeBenchmark.CheckBudgets(budgets, arguments.repeats) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(ImportTimeBenchmark.Main())
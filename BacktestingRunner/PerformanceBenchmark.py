@@ -0,0 +1,192 @@
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from pathlib import Path
+
+import numpy
+import pandas
+
+from BacktestingEngine.BacktestingEngine import BacktestingEngine
+from BacktestingEngine.DataProvider import DataProvider
+from BacktestingEngine.RebalanceSchedule import RebalanceSchedule
+from BacktestingEngine.SignalCache import SignalCache
+from BacktestingRunner.SyntheticDataset import SyntheticDataset
+from Common.Enumerations.FactorName import FactorName
+from Common.Enumerations.RebalanceFrequency import RebalanceFrequency
+from PortfolioConstruction.PortfolioConstructionName import PortfolioConstructionName
+from TradingStrategies.TradingStrategyName import TradingStrategyName
+
+
+class PerformanceBenchmark(object):
+    '''
+    A performance regression gate. Runs fixed size scenarios on synthetic data, records the wall time and peak
+    memory of each, and compares them to the baseline committed in PerformanceBaseline.json, e.g.
+
+        python -m BacktestingRunner.PerformanceBenchmark
+        python -m BacktestingRunner.PerformanceBenchmark --scenarios Load Engine --repeats 3
+        python -m BacktestingRunner.PerformanceBenchmark --update-baseline
+
+    The wall time of a scenario is the fastest of the repeats, which is the least affected by other load on
+    the machine, and its peak memory is the peak of the Python and numpy allocations traced by tracemalloc in a
+    separate run. A scenario regresses if it is slower than the baseline by more than the time tolerance, or
+    uses more memory by more than the memory tolerance, and the exit code is then non-zero. The baseline
+    times depend on the machine, so it should be updated on the machine that runs the gate.
+    '''
+
+    BaselineFilePath = Path(__file__).parent / "PerformanceBaseline.json"
+
+    ScenarioNames = ["Load", "MixReturns", "Signals", "Rebalance", "Engine"]
+
+    # The size of the csv data set of the Load and Engine scenarios, and of the panels of the others
+    NumberOfDates = 500
+    NumberOfSecurities = 200
+    NumberOfPanelDates = 5000
+    NumberOfPanelSecurities = 1000
+
+    @staticmethod
+    def CreateScenario(name: str, directoryPathStr: str):
+        '''
+        Creates the synthetic data of a scenario in memory, or in the directory, and returns the function that
+        runs the scenario. Only the function is measured. The data of each scenario is only created when it
+        is run, and is released with its function.
+        '''
+
+        directoryPath = Path(directoryPathStr)
+        randomState = numpy.random.RandomState(1)
+        dates = pandas.bdate_range("2000-01-03", periods=PerformanceBenchmark.NumberOfPanelDates)
+        panelShape = (PerformanceBenchmark.NumberOfPanelDates, PerformanceBenchmark.NumberOfPanelSecurities)
+
+        if name in ["Load", "Engine"]:
+            if not (directoryPath / "dataset.csv").is_file():
+                SyntheticDataset.WriteCsv(directoryPath / "dataset.csv", PerformanceBenchmark.NumberOfDates,
+                                          PerformanceBenchmark.NumberOfSecurities)
+            if name == "Load":
+                return lambda: DataProvider.FilteredCachedLoad(directoryPath, "dataset.csv")
+            return lambda: BacktestingEngine(directoryPathStr, "dataset.csv").BacktestTradingStrategy(
+                TradingStrategyName.LongBestShortWorst, PortfolioConstructionName.DollarNeutralEqualWeightPortfolio,
+                FactorName.Factor1, 0.2, 0.01)
+
+        elif name == "MixReturns":
+            forwardReturns = randomState.randn(*panelShape) * 0.02
+            forwardReturns[randomState.rand(*panelShape) < 0.05] = numpy.nan
+            forwardReturns[::50] = 0.0
+            backwardReturns = randomState.randn(*panelShape) * 0.02
+            return lambda: DataProvider.MixReturnValues(forwardReturns, backwardReturns)
+
+        elif name == "Signals":
+            factorDF = pandas.DataFrame(randomState.randn(*panelShape), index=dates)
+            return lambda: SignalCache.GenerateTradingSignals(TradingStrategyName.LongBestShortWorst, factorDF, 0.2)
+
+        elif name == "Rebalance":
+            factorDF = pandas.DataFrame(randomState.randn(*panelShape), index=dates)
+            returnsDF = pandas.DataFrame(randomState.randn(*panelShape) * 0.02, index=dates)
+            weeklySchedule = RebalanceSchedule(RebalanceFrequency.Weekly)
+            return lambda: (weeklySchedule.SelectRebalanceDates(factorDF), weeklySchedule.CompoundReturns(returnsDF))
+
+        raise ValueError(f"The scenario {name} does not exist.")
+
+    @staticmethod
+    def MeasureScenario(scenario, repeats=5) -> dict:
+        '''
+        Returns the fastest wall time in seconds of the repeats of a scenario, and its peak traced memory in
+        bytes.
+        '''
+
+        seconds = []
+        for _ in range(repeats):
+            startTime = time.perf_counter()
+            scenario()
+            seconds.append(time.perf_counter() - startTime)
+
+        tracemalloc.start()
+        try:
+            scenario()
+            _, peakMemoryBytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {"Seconds": min(seconds), "PeakMemoryBytes": peakMemoryBytes}
+
+    @staticmethod
+    def FindRegressions(results: dict, baselineResults: dict, timeTolerance=0.5, memoryTolerance=0.2,
+                        minimumSeconds=0.005, log=sys.stdout) -> list:
+        '''
+        Compares the results of the scenarios to the baseline, reporting each of them. Returns the names of the
+        scenarios that regressed. Differences in time of less than minimumSeconds are ignored, as they are
+        within the timer noise, and scenarios without a baseline are reported but do not regress.
+        '''
+
+        regressions = []
+        for (name, result) in results.items():
+            if name not in baselineResults:
+                print(f"new  {name}: {result['Seconds']:.4f}s, {result['PeakMemoryBytes'] / 1024 ** 2:.1f}MB "
+                      "(no baseline)", file=log)
+                continue
+
+            baselineResult = baselineResults[name]
+            timeRatio = result["Seconds"] / baselineResult["Seconds"]
+            memoryRatio = result["PeakMemoryBytes"] / max(baselineResult["PeakMemoryBytes"], 1)
+            isSlower = (timeRatio > 1.0 + timeTolerance and
+                        result["Seconds"] - baselineResult["Seconds"] > minimumSeconds)
+            usesMoreMemory = memoryRatio > 1.0 + memoryTolerance
+            status = "FAIL" if isSlower or usesMoreMemory else "ok"
+            print(f"{status:4} {name}: {result['Seconds']:.4f}s ({timeRatio:.2f}x baseline), "
+                  f"{result['PeakMemoryBytes'] / 1024 ** 2:.1f}MB ({memoryRatio:.2f}x baseline)", file=log)
+            if status == "FAIL":
+                regressions.append(name)
+        return regressions
+
+    @staticmethod
+    def Main(argumentsList: list = None, log=sys.stdout) -> int:
+        '''
+        The command line entry point. Returns a non-zero exit code if any scenario regressed.
+        '''
+
+        argumentParser = argparse.ArgumentParser(description="Checks the scenario timings against a baseline.")
+        argumentParser.add_argument("--scenarios", nargs="+", choices=PerformanceBenchmark.ScenarioNames,
+                                    help="the scenarios to run, by default all of them")
+        argumentParser.add_argument("--baseline", default=str(PerformanceBenchmark.BaselineFilePath),
+                                    help="a JSON file of the baseline results")
+        argumentParser.add_argument("--repeats", type=int, default=5, help="the number of timed runs per scenario")
+        argumentParser.add_argument("--time-tolerance", type=float, default=0.5,
+                                    help="the allowed relative increase in time, e.g. 0.5 for 50%% slower")
+        argumentParser.add_argument("--memory-tolerance", type=float, default=0.2,
+                                    help="the allowed relative increase in peak memory")
+        argumentParser.add_argument("--update-baseline", action="store_true",
+                                    help="writes the results of the run scenarios to the baseline file")
+        arguments = argumentParser.parse_args(argumentsList)
+
+        baselineFilePath = Path(arguments.baseline)
+        baseline = {"Scenarios": {}}
+        if baselineFilePath.is_file():
+            with open(baselineFilePath, "r") as baselineFile:
+                baseline = json.load(baselineFile)
+
+        results = {}
+        with tempfile.TemporaryDirectory() as directoryPathStr:
+            for name in (arguments.scenarios or PerformanceBenchmark.ScenarioNames):
+                scenario = PerformanceBenchmark.CreateScenario(name, directoryPathStr)
+                results[name] = PerformanceBenchmark.MeasureScenario(scenario, arguments.repeats)
+                del scenario  # releases the data of the scenario before the next one is created
+
+        if arguments.update_baseline:
+            baseline = {"Machine": f"{platform.system()} {platform.machine()}, Python {platform.python_version()}",
+                        "Scenarios": {**baseline["Scenarios"], **{x: {"Seconds": round(y["Seconds"], 6),
+                                                                       "PeakMemoryBytes": y["PeakMemoryBytes"]}
+                                                                   for (x, y) in results.items()}}}
+            with open(baselineFilePath, "w") as baselineFile:
+                json.dump(baseline, baselineFile, indent=4)
+            print(f"Wrote the baseline of {', '.join(results)} to {baselineFilePath}", file=log)
+            return 0
+
+        regressions = PerformanceBenchmark.FindRegressions(
+            results, baseline["Scenarios"], arguments.time_tolerance, arguments.memory_tolerance, log=log)
+        return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(PerformanceBenchmark.Main())
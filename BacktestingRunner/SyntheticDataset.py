@@ -0,0 +1,28 @@
+import numpy
+import pandas
+
+from pathlib import Path
+
+
+class SyntheticDataset(object):
+    '''
+    Writes synthetic data sets in the csv format read by the DataProvider, for the performance benchmark and
+    the unit tests.
+    '''
+
+    @staticmethod
+    def WriteCsv(filePath: Path, numberOfDates: int, numberOfSecurities: int, seed=0):
+        '''
+        Writes a data set of random forward and backward returns and two random factors, for every business
+        day from 2020-01-01 and every security.
+        '''
+        randomState = numpy.random.RandomState(seed)
+        dates = pandas.bdate_range("2020-01-01", periods=numberOfDates)
+        datasetDF = pandas.DataFrame({
+            "date": numpy.repeat(dates.strftime("%Y-%m-%d"), numberOfSecurities),
+            "id_security": numpy.tile(numpy.arange(numberOfSecurities), numberOfDates),
+            "fm_1wd": randomState.randn(numberOfDates * numberOfSecurities) * 0.02,
+            "m_1wd": randomState.randn(numberOfDates * numberOfSecurities) * 0.02,
+            "factor_1": randomState.randn(numberOfDates * numberOfSecurities),
+            "factor_2": randomState.randn(numberOfDates * numberOfSecurities)})
+        datasetDF.to_csv(filePath, index=False)
@@ -1,19 +1,21 @@
-import numpy
-import pandas
+import sys
 
-from BacktestingEngine.BacktestingEngine import BacktestingEngine
-from Common.Enumerations.FactorName import FactorName
-from Common.Enumerations.ReturnType import ReturnType
-from TradingStrategies.TradingStrategyName import TradingStrategyName
-from PortfolioConstruction.PortfolioConstructionName import PortfolioConstructionName
+from pathlib import Path
 
-if __name__ == "__main__":
-    inputCachePathStr = "."
-    filenameStr = "dataset.csv"
-    backtestingEngine = BacktestingEngine(
-        inputCachePathStr=inputCachePathStr, inputDataFilenameStr=filenameStr)
+from BacktestingRunner.BatchRunner import BatchRunner
+
+# The backtests are described by a job file, by default the example jobs, and run by the batch runner, which
+# writes the results of each job to the output path, e.g.
+#
+#   python -m BacktestingRunner.TestHarness
+#   python -m BacktestingRunner.TestHarness nightly.yaml --workers 8 --output-path results
+#
+# takes the same arguments as python -m BacktestingRunner.BatchRunner.
 
-    portfolioPerformance = backtestingEngine.BacktestTradingStrategy(
-        tradingStrategyName=TradingStrategyName.LongBestShortWorst,
-        portfolioConstructionName=PortfolioConstructionName.DollarNeutralEqualWeightPortfolio,
-        factorName=FactorName.Factor2, percentile=0.2, executionCostRate=0.1)
+ExampleJobsFilePath = Path(__file__).parent / "ExampleJobs.yaml"
+
+if __name__ == "__main__":
+    argumentsList = sys.argv[1:]
+    if len(argumentsList) == 0 or argumentsList[0].startswith("-"):
+        argumentsList = [str(ExampleJobsFilePath)] + argumentsList
+    sys.exit(BatchRunner.Main(argumentsList))
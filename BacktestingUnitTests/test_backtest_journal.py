@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from BacktestingEngine.BacktestingEngine import BacktestingEngine
+from BacktestingEngine.BacktestJournal import BacktestJournal
+from BacktestingRunner.SyntheticDataset import SyntheticDataset
+from Common.Analytics.PerformanceAnalytics import PerformanceAnalytics
+from Common.Enumerations.FactorName import FactorName
+from Common.Enumerations.ReturnType import ReturnType
+from PortfolioConstruction.PortfolioConstructionName import PortfolioConstructionName
+from TradingStrategies.TradingStrategyName import TradingStrategyName
+
+
+class TestBacktestJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.directoryPath = Path(self.directory.name)
+        SyntheticDataset.WriteCsv(self.directoryPath / 'dataset.csv', 30, 15)
+        self.arguments = (TradingStrategyName.LongBestShortWorst,
+                          PortfolioConstructionName.DollarNeutralEqualWeightPortfolio, FactorName.Factor1, 0.2, 0.01)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def reviseDataset(self, firstRevisedDate: int):
+        datasetDF = pd.read_csv(self.directoryPath / 'dataset.csv', float_precision='round_trip')
+        isRevised = datasetDF['date'].isin(datasetDF['date'].unique()[firstRevisedDate:])
+        datasetDF.loc[isRevised, 'factor_1'] = -datasetDF.loc[isRevised, 'factor_1']
+        datasetDF.to_csv(self.directoryPath / 'dataset.csv', index=False)
+
+    def assertSamePerformance(self, performance, expectedPerformance):
+        pd.testing.assert_frame_equal(PerformanceAnalytics.ToDataFrame(performance),
+                                      PerformanceAnalytics.ToDataFrame(expectedPerformance))
+
+    def test_incremental_recomputation(self):
+        engine = BacktestingEngine(str(self.directoryPath), 'dataset.csv')
+        performance = engine.BacktestTradingStrategyIncremental(*self.arguments)
+        self.assertSamePerformance(performance, engine.BacktestTradingStrategy(*self.arguments))
+
+        # revise the factor values of the last three dates
+        self.reviseDataset(27)
+        engine.LoadData()
+        journal = list(engine.Journals.values())[0]
+        rowFingerprints = BacktestJournal.CalculateRowFingerprints(
+            engine.Data[FactorName.Factor1], engine.Data[ReturnType.Mixed])
+        self.assertEqual(journal.FindFirstChangedRow(
+            engine.Data[FactorName.Factor1].index, engine.Data[FactorName.Factor1].columns, rowFingerprints), 27)
+
+        performance = engine.BacktestTradingStrategyIncremental(*self.arguments)
+        freshEngine = BacktestingEngine(str(self.directoryPath), 'dataset.csv')
+        self.assertSamePerformance(performance, freshEngine.BacktestTradingStrategy(*self.arguments))
+        np.testing.assert_allclose(
+            journal.LongShortEquity,
+            np.cumprod(1.0 + PerformanceAnalytics.ToDataFrame(performance)['LongShortPortfolioReturn'].values))
+
+    def test_save_and_load(self):
+        engine = BacktestingEngine(str(self.directoryPath), 'dataset.csv')
+        engine.BacktestTradingStrategyIncremental(*self.arguments)
+        journalFilePath = self.directoryPath / 'journal.npz'
+        list(engine.Journals.values())[0].Save(str(journalFilePath))
+
+        # a new process picks up the saved journal, and only recomputes the revised dates
+        self.reviseDataset(20)
+        journal = BacktestJournal.Load(str(journalFilePath))
+        self.assertEqual(len(journal), 30)
+        newEngine = BacktestingEngine(str(self.directoryPath), 'dataset.csv')
+        performance = newEngine.BacktestTradingStrategyIncremental(*self.arguments, journal=journal)
+        self.assertSamePerformance(performance, newEngine.BacktestTradingStrategy(*self.arguments))
+
+
+    def test_journal_of_other_arguments(self):
+        engine = BacktestingEngine(str(self.directoryPath), 'dataset.csv')
+        engine.BacktestTradingStrategyIncremental(*self.arguments)
+        journalFilePath = self.directoryPath / 'journal.npz'
+        list(engine.Journals.values())[0].Save(str(journalFilePath))
+
+        # a journal saved for one set of arguments is not reused for another
+        journal = BacktestJournal.Load(str(journalFilePath))
+        self.assertEqual(journal.ArgumentsKey, BacktestJournal.CreateArgumentsKey(*self.arguments))
+        otherArguments = self.arguments[:3] + (0.4, 0.0)
+        performance = engine.BacktestTradingStrategyIncremental(*otherArguments, journal=journal)
+        self.assertSamePerformance(performance, engine.BacktestTradingStrategy(*otherArguments))
+        self.assertEqual(journal.ArgumentsKey, BacktestJournal.CreateArgumentsKey(*otherArguments))
+
+
+if __name__ == '__main__':
+    unittest.main()
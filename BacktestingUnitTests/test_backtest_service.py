@@ -0,0 +1,99 @@
+import json
+import numpy as np
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from BacktestingEngine.BacktestingEngine import BacktestingEngine
+from BacktestingEngine.SignalCache import SignalCache
+from BacktestingRunner.BacktestService import BacktestService
+from BacktestingRunner.SyntheticDataset import SyntheticDataset
+from Common.Analytics.PerformanceAnalytics import PerformanceAnalytics
+from Common.Enumerations.FactorName import FactorName
+from PortfolioConstruction.PortfolioConstructionName import PortfolioConstructionName
+from TradingStrategies.TradingStrategyName import TradingStrategyName
+
+
+class TestBacktestService(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        SyntheticDataset.WriteCsv(Path(self.directory.name) / 'dataset.csv', 25, 10)
+        self.service = BacktestService(port=0, numberOfWorkers=2)
+        self.service.Start()
+        self.url = f"http://{self.service.Address[0]}:{self.service.Address[1]}"
+
+    def tearDown(self):
+        self.service.Stop()
+        self.directory.cleanup()
+
+    def post(self, request: dict) -> dict:
+        httpRequest = urllib.request.Request(self.url + '/backtest', data=json.dumps(request).encode('utf-8'),
+                                             headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(httpRequest, timeout=30) as response:
+            return json.loads(response.read())
+
+    def test_backtest_requests(self):
+        requests = [{'InputCachePath': self.directory.name, 'InputDataFilename': 'dataset.csv', 'Factor': factor,
+                     'Percentile': 0.2, 'ExecutionCostRate': 0.01} for factor in ['Factor1', 'Factor2'] * 3]
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            responses = list(executor.map(self.post, requests))
+        self.assertEqual(len(self.service.Engines), 1)  # the dataset is loaded once
+
+        engine = BacktestingEngine(self.directory.name, 'dataset.csv')
+        expectedDF = PerformanceAnalytics.ToDataFrame(engine.BacktestTradingStrategy(
+            TradingStrategyName.LongBestShortWorst, PortfolioConstructionName.DollarNeutralEqualWeightPortfolio,
+            FactorName.Factor2, 0.2, 0.01))
+        self.assertEqual(responses[1]['Dates'], [x.isoformat() for x in expectedDF.index])
+        for column in expectedDF.columns:
+            np.testing.assert_allclose(np.array(responses[5][column], dtype=float), expectedDF[column].values)
+
+    def test_concurrent_requests_on_one_dataset(self):
+        # each request waits in the signal generation until the other one has reached it as well
+        barrier = threading.Barrier(2, timeout=10)
+        generateTradingSignals = SignalCache.GenerateTradingSignals
+
+        def generateTogether(*arguments):
+            barrier.wait()
+            return generateTradingSignals(*arguments)
+
+        self.service.GetEngine(self.directory.name, 'dataset.csv')
+        requests = [{'InputCachePath': self.directory.name, 'InputDataFilename': 'dataset.csv', 'Factor': factor,
+                     'Percentile': 0.2} for factor in ['Factor1', 'Factor2']]
+        with mock.patch.object(SignalCache, 'GenerateTradingSignals', side_effect=generateTogether):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                responses = list(executor.map(self.post, requests))
+        self.assertEqual([len(x['Dates']) for x in responses], [25, 25])
+
+    def test_bad_request(self):
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.post({'InputCachePath': self.directory.name, 'InputDataFilename': 'dataset.csv',
+                       'Factor': 'Factor9', 'Percentile': 0.2})
+        self.assertEqual(context.exception.code, 400)
+
+        # a request of the wrong type is also a bad request
+        for request in [[1, 2], {'InputCachePath': self.directory.name, 'InputDataFilename': 'dataset.csv',
+                                 'Factor': 'Factor1', 'Percentile': [0.2]}]:
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                self.post(request)
+            self.assertEqual(context.exception.code, 400)
+
+        # any other error is reported as a server error
+        with mock.patch.object(self.service, 'RunBacktest', side_effect=RuntimeError('unexpected')):
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                self.post({'InputDataFilename': 'dataset.csv'})
+        self.assertEqual(context.exception.code, 500)
+        self.assertEqual(json.loads(context.exception.read())['Error'], 'RuntimeError: unexpected')
+
+        with urllib.request.urlopen(self.url + '/health', timeout=30) as response:
+            self.assertEqual(json.loads(response.read())['Status'], 'Ok')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import io
+import json
+import numpy as np
+import pandas as pd
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from BacktestingEngine.BacktestingEngine import BacktestingEngine
+from BacktestingRunner.BatchRunner import BatchRunner
+from BacktestingRunner.SyntheticDataset import SyntheticDataset
+from Common.Analytics.PerformanceAnalytics import PerformanceAnalytics
+from Common.Enumerations.FactorName import FactorName
+from PortfolioConstruction.PortfolioConstructionName import PortfolioConstructionName
+from TradingStrategies.TradingStrategyName import TradingStrategyName
+
+
+class TestBatchRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.directoryPath = Path(self.directory.name)
+        SyntheticDataset.WriteCsv(self.directoryPath / 'dataset.csv', 25, 10)
+        self.jobFileDict = {
+            'Workers': 2, 'OutputPath': str(self.directoryPath / 'results'),
+            'Defaults': {'InputCachePath': self.directory.name, 'InputDataFilename': 'dataset.csv',
+                         'ExecutionCostRate': 0.01},
+            'Jobs': [{'Name': 'factor1', 'Factor': 'Factor1', 'Percentile': 0.2},
+                     {'Name': 'factor2', 'Factor': 'Factor2', 'Percentile': 0.3, 'ExecutionCostRate': 0.0},
+                     {'Factor': 'Factor2', 'Percentile': 0.1}]}
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_json_job_file(self):
+        jobFilePath = self.directoryPath / 'jobs.json'
+        jobFilePath.write_text(json.dumps(self.jobFileDict))
+        jobFileDict = BatchRunner.LoadJobFile(str(jobFilePath))
+        self.assertEqual([x['Name'] for x in jobFileDict['Jobs']], ['factor1', 'factor2', 'job2'])
+
+        log = io.StringIO()
+        statistics = BatchRunner.RunBatch(jobFileDict['Jobs'], jobFileDict['OutputPath'], 2, log)
+        self.assertEqual((statistics['Jobs'], statistics['FailedJobs']), (3, []))
+        self.assertIn('3/3 jobs completed', log.getvalue())
+
+        engine = BacktestingEngine(self.directory.name, 'dataset.csv')
+        expectedDF = PerformanceAnalytics.ToDataFrame(engine.BacktestTradingStrategy(
+            TradingStrategyName.LongBestShortWorst, PortfolioConstructionName.DollarNeutralEqualWeightPortfolio,
+            FactorName.Factor2, 0.3, 0.0))
+        resultsDF = pd.read_csv(self.directoryPath / 'results' / 'factor2.csv', index_col=0, parse_dates=True)
+        np.testing.assert_allclose(resultsDF.values, expectedDF.values, rtol=1e-12)
+
+    def test_failed_job(self):
+        self.jobFileDict['Jobs'].append({'Name': 'missing', 'Factor': 'Factor1', 'Percentile': 0.2,
+                                         'InputDataFilename': 'missing.csv'})
+        jobFilePath = self.directoryPath / 'jobs.json'
+        jobFilePath.write_text(json.dumps(self.jobFileDict))
+        log = io.StringIO()
+        self.assertEqual(BatchRunner.Main([str(jobFilePath), '--workers', '1'], log=log), 1)
+        self.assertTrue((self.directoryPath / 'results' / 'factor1.csv').is_file())
+        self.assertIn('missing failed: FileNotFoundError', log.getvalue())
+        self.assertIn('3/4 jobs completed', log.getvalue())
+
+    def test_job_names_are_file_names(self):
+        for name in ['../escaped', 'results/factor1', '..', '']:
+            with self.subTest(name=name):
+                self.jobFileDict['Jobs'][0]['Name'] = name
+                jobFilePath = self.directoryPath / 'jobs.json'
+                jobFilePath.write_text(json.dumps(self.jobFileDict))
+                with self.assertRaises(ValueError):
+                    BatchRunner.LoadJobFile(str(jobFilePath))
+                with self.assertRaises(ValueError):
+                    BatchRunner.RunJob(self.jobFileDict['Jobs'][0], str(self.directoryPath / 'results'))
+        self.assertFalse((self.directoryPath / 'escaped.csv').exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import numpy as np
+import unittest
+
+from PortfolioConstruction.BatchedDollarNeutralEqualWeightPortfolio import BatchedDollarNeutralEqualWeightPortfolio
+from PortfolioConstruction.DollarNeutralEqualWeightPortfolio import DollarNeutralEqualWeightPortfolio
+
+
+class TestBatchedPortfolioConstruction(unittest.TestCase):
+
+    def test_matches_single_portfolios(self):
+        randomState = np.random.RandomState(0)
+        numberOfVariants = 5
+        numberOfSecurities = 30
+        executionCostRates = np.linspace(0.0, 0.2, numberOfVariants)
+
+        previousWeights = np.zeros((numberOfVariants, numberOfSecurities))
+        for i in range(8):
+            signals = randomState.choice([-1.0, 0.0, 0.0, 1.0], (numberOfVariants, numberOfSecurities))
+            returns = randomState.randn(numberOfSecurities) * 0.02
+
+            batchedPortfolio = BatchedDollarNeutralEqualWeightPortfolio(previousWeights, signals)
+            batchedPerformance = batchedPortfolio.CalculatePortfolioReturns(returns, executionCostRates)
+
+            for v in range(numberOfVariants):
+                portfolio = DollarNeutralEqualWeightPortfolio(previousWeights[v], signals[v])
+                performance = portfolio.CalculatePortfolioReturns(returns, executionCostRates[v])
+                np.testing.assert_allclose(batchedPortfolio.PortfolioWeights[v], portfolio.PortfolioWeights)
+                self.assertAlmostEqual(batchedPerformance[v].LongPortfolioReturn, performance.LongPortfolioReturn)
+                self.assertAlmostEqual(batchedPerformance[v].ShortPortfolioReturn, performance.ShortPortfolioReturn)
+                self.assertAlmostEqual(
+                    batchedPerformance[v].LongShortPortfolioReturn, performance.LongShortPortfolioReturn)
+                self.assertAlmostEqual(
+                    batchedPerformance[v].LongShortTuroverRatio, performance.LongShortTuroverRatio)
+
+            previousWeights = batchedPortfolio.PortfolioWeights
+
+    def test_negative_execution_cost(self):
+        portfolio = BatchedDollarNeutralEqualWeightPortfolio(np.zeros((2, 4)), [[1, -1, 0, 0], [0, 1, -1, 0]])
+        with self.assertRaises(ValueError):
+            portfolio.CalculatePortfolioReturns(np.zeros(4), [0.1, -0.1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import numpy as np
+import unittest
+
+from Common.DataStructures.PortfolioPerformance import PortfolioPerformance
+from PortfolioConstruction.IPortfolio import IPortfolio
+
+
+class TestEquityCurve(unittest.TestCase):
+
+    def setUp(self):
+        self.longShortReturns = [0.1, -0.2, 0.05, np.nan, 0.3]
+        self.portfolioPerformance = {
+            i: PortfolioPerformance(
+                longPortfolioReturn=0.01, shortPortfolioReturn=-0.01, longShortPortfolioReturn=x,
+                longShortTurnoverRatio=1.0)
+            for (i, x) in enumerate(self.longShortReturns)}
+
+    def test_equity_curve(self):
+        equityCurve = IPortfolio.BacktestPortfolio(self.portfolioPerformance)
+
+        expectedEquity = np.cumprod(1.0 + np.nan_to_num(self.longShortReturns))
+        expectedHighWaterMark = np.maximum.accumulate(np.maximum(expectedEquity, 1.0))
+        np.testing.assert_allclose(equityCurve.Equity(), expectedEquity)
+        np.testing.assert_allclose(equityCurve.HighWaterMark(), expectedHighWaterMark)
+        np.testing.assert_allclose(equityCurve.Drawdown(), expectedEquity / expectedHighWaterMark - 1.0)
+        self.assertAlmostEqual(equityCurve.MaximumDrawdown(), -0.2)
+
+        np.testing.assert_allclose(equityCurve.Equity('Long'), 1.01 ** np.arange(1, 6))
+        np.testing.assert_allclose(equityCurve.Drawdown('Short'), 0.99 ** np.arange(1, 6) - 1.0)
+        self.assertEqual(equityCurve.Dates, list(range(5)))
+
+    def test_streaming_input(self):
+        equityCurve = IPortfolio.BacktestPortfolio(self.portfolioPerformance)
+        streamedEquityCurve = IPortfolio.BacktestPortfolio(
+            (date, performance) for (date, performance) in self.portfolioPerformance.items())
+        np.testing.assert_array_equal(equityCurve.Equity(), streamedEquityCurve.Equity())
+
+        # The curve can keep growing after it has been read
+        streamedEquityCurve.Update(5, self.portfolioPerformance[0])
+        self.assertEqual(len(streamedEquityCurve.Equity()), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
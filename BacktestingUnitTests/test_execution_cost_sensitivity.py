@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import unittest
+
+from BacktestingEngine.ExecutionCostSensitivity import ExecutionCostSensitivity
+from PortfolioConstruction.DollarNeutralEqualWeightPortfolio import DollarNeutralEqualWeightPortfolio
+
+
+class TestExecutionCostSensitivity(unittest.TestCase):
+
+    def setUp(self):
+        randomState = np.random.RandomState(0)
+        numberOfDates = 12
+        numberOfSecurities = 20
+        self.executionCostRates = [0.0, 0.001, 0.05, 0.2]
+        self.expectedPerformance = {x: [] for x in self.executionCostRates}
+
+        portfolioValues = []
+        absoluteChangeInPortfolioWeights = []
+        turnoverRatios = []
+        previousWeights = np.zeros(numberOfSecurities)
+        for i in range(numberOfDates):
+            signals = randomState.choice([-1.0, 0.0, 1.0], numberOfSecurities)
+            returns = randomState.randn(numberOfSecurities) * 0.02 + 0.001 * signals
+            portfolio = DollarNeutralEqualWeightPortfolio(previousWeights, signals)
+            portfolioValues.append(portfolio.CalculatePortfolioValues(returns))
+            absoluteChangeInPortfolioWeights.append(portfolio.AbsoluteChangeInPortfolioWeights)
+            turnoverRatios.append(portfolio.TurnoverRatio)
+            for executionCostRate in self.executionCostRates:
+                self.expectedPerformance[executionCostRate].append(
+                    portfolio.CalculatePortfolioReturns(returns, executionCostRate))
+            previousWeights = portfolio.PortfolioWeights
+
+        portfolioValues = np.array(portfolioValues)
+        self.sensitivity = ExecutionCostSensitivity(
+            pd.date_range('2020-01-01', periods=numberOfDates), portfolioValues[:, 0], portfolioValues[:, 1],
+            portfolioValues[:, 2], portfolioValues[:, 3], absoluteChangeInPortfolioWeights, turnoverRatios)
+
+    def test_returns_match_portfolio(self):
+        portfolioReturns = self.sensitivity.CalculatePortfolioReturns(self.executionCostRates)
+        for executionCostRate in self.executionCostRates:
+            expected = self.expectedPerformance[executionCostRate]
+            np.testing.assert_allclose(portfolioReturns['LongPortfolioReturn'][executionCostRate].values,
+                                       [x.LongPortfolioReturn for x in expected])
+            np.testing.assert_allclose(portfolioReturns['ShortPortfolioReturn'][executionCostRate].values,
+                                       [x.ShortPortfolioReturn for x in expected])
+            np.testing.assert_allclose(portfolioReturns['LongShortPortfolioReturn'][executionCostRate].values,
+                                       [x.LongShortPortfolioReturn for x in expected])
+
+    def test_break_even(self):
+        breakEvenExecutionCostRate = self.sensitivity.CalculateBreakEvenExecutionCostRate()
+        summaryStatistics = self.sensitivity.CalculateSummaryStatistics([breakEvenExecutionCostRate])
+        if breakEvenExecutionCostRate > 0.0:
+            self.assertAlmostEqual(summaryStatistics['MeanReturn'].iloc[0], 0.0)
+        else:
+            self.assertLessEqual(summaryStatistics['MeanReturn'].iloc[0], 0.0)
+
+    def test_negative_execution_cost(self):
+        with self.assertRaises(ValueError):
+            self.sensitivity.CalculatePortfolioReturns([0.1, -0.1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import unittest
+
+from Common.Enumerations.FactorName import FactorName
+from FactorPipeline.FactorNeutralisation import FactorNeutralisation
+from FactorPipeline.NeutralisedFactor import NeutralisedFactor
+from TradingStrategies.LongBestShortWorst import LongBestShortWorst
+
+
+class TestFactorNeutralisation(unittest.TestCase):
+
+    def setUp(self):
+        randomState = np.random.RandomState(0)
+        index = pd.date_range('2020-01-01', periods=10)
+        columns = list(range(25))
+        self.betaDF = pd.DataFrame(randomState.randn(10, 25), index=index, columns=columns)
+        self.sizeDF = pd.DataFrame(randomState.randn(10, 25), index=index, columns=columns)
+        self.factorDF = 0.5 * self.betaDF - 2.0 * self.sizeDF + 1.0 + pd.DataFrame(
+            randomState.randn(10, 25) * 0.1, index=index, columns=columns)
+        self.factorDF.iloc[3, 5] = np.nan
+        self.sizeDF.iloc[4, 6] = np.nan
+
+    def test_matches_per_date_least_squares(self):
+        residualsDF = FactorNeutralisation.NeutraliseFactor(self.factorDF, [self.betaDF, self.sizeDF])
+        coefficientsDF = FactorNeutralisation.CalculateRegressionCoefficients(
+            self.factorDF, [self.betaDF, self.sizeDF])
+
+        for t in range(len(self.factorDF.index)):
+            y = self.factorDF.iloc[t].values
+            X = np.column_stack([np.ones(25), self.betaDF.iloc[t].values, self.sizeDF.iloc[t].values])
+            isValid = ~np.isnan(y) & ~np.isnan(X).any(axis=1)
+            coefficients = np.linalg.lstsq(X[isValid], y[isValid], rcond=None)[0]
+            np.testing.assert_allclose(coefficientsDF.iloc[t].values, coefficients, rtol=1e-8)
+
+            expectedResiduals = np.full(25, np.nan)
+            expectedResiduals[isValid] = y[isValid] - X[isValid] @ coefficients
+            np.testing.assert_allclose(residualsDF.iloc[t].values, expectedResiduals, atol=1e-10)
+
+        self.assertTrue(np.isnan(residualsDF.iloc[3, 5]))
+        self.assertTrue(np.isnan(residualsDF.iloc[4, 6]))
+        self.assertEqual(list(coefficientsDF.columns), ['Intercept', 0, 1])
+
+    def test_insufficient_securities(self):
+        factorDF = self.factorDF.copy()
+        factorDF.iloc[0, 2:] = np.nan  # only two securities left on the first date
+        residualsDF = FactorNeutralisation.NeutraliseFactor(factorDF, [self.betaDF, self.sizeDF])
+        self.assertTrue(residualsDF.iloc[0].isna().all())
+        self.assertFalse(residualsDF.iloc[1].isna().any())
+
+    def test_neutralised_factor(self):
+        dataDict = {FactorName.Factor1: self.factorDF, FactorName.Factor3: self.betaDF,
+                    FactorName.Factor4: self.sizeDF}
+        neutralisedFactor = NeutralisedFactor(FactorName.Factor1, [FactorName.Factor3, FactorName.Factor4])
+        residualsDF = neutralisedFactor.CalculateFactorData(dataDict)
+        signalsDF = LongBestShortWorst.GenerateTradingSignals(residualsDF, 0.2)
+        self.assertEqual(signalsDF.shape, self.factorDF.shape)
+        self.assertEqual(repr(neutralisedFactor), 'NeutralisedFactor(Factor1,[Factor3,Factor4],True)')
+
+
+if __name__ == '__main__':
+    unittest.main()
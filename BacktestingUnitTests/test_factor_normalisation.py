@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import unittest
+import pandas.testing as pd_testing
+
+from Common.Enumerations.FactorName import FactorName
+from Common.Enumerations.FactorNormalisationType import FactorNormalisationType
+from FactorPipeline.CompositeFactor import CompositeFactor
+from FactorPipeline.FactorNormalisation import FactorNormalisation
+from TradingStrategies.LongBestShortWorst import LongBestShortWorst
+
+
+class TestFactorNormalisation(unittest.TestCase):
+    def assertDataframeEqual(self, a, b, msg):
+        try:
+            pd_testing.assert_frame_equal(a, b)
+        except AssertionError as e:
+            raise self.failureException(msg) from e
+
+    def setUp(self):
+        self.addTypeEqualityFunc(pd.DataFrame, self.assertDataframeEqual)
+        randomState = np.random.RandomState(0)
+        index = pd.date_range('2020-01-01', periods=8)
+        self.factor1DF = pd.DataFrame(randomState.randn(8, 12), index=index, columns=range(12))
+        self.factor2DF = pd.DataFrame(randomState.randn(8, 12) * 5.0 + 3.0, index=index, columns=range(12))
+        self.factor1DF.iloc[1, 4] = np.nan
+        self.factor2DF.iloc[2, 7] = np.nan
+        self.dataDict = {FactorName.Factor1: self.factor1DF, FactorName.Factor2: self.factor2DF}
+
+    def test_z_score(self):
+        expectedDF = self.factor1DF.sub(self.factor1DF.mean(axis=1), axis=0).div(self.factor1DF.std(axis=1), axis=0)
+        self.assertEqual(expectedDF, FactorNormalisation.ZScore(self.factor1DF))
+
+    def test_rank_normalise(self):
+        rankedDF = FactorNormalisation.RankNormalise(self.factor1DF)
+        # Ranks are centred and preserve the ordering of the raw values
+        np.testing.assert_allclose(rankedDF.mean(axis=1).values, 0.0, atol=1e-15)
+        self.assertTrue(rankedDF.isna().equals(self.factor1DF.isna()))
+        self.assertEqual(LongBestShortWorst.GenerateTradingSignals(self.factor1DF, 0.25),
+                         LongBestShortWorst.GenerateTradingSignals(rankedDF, 0.25))
+
+    def test_winsorise(self):
+        winsorisedDF = FactorNormalisation.Winsorise(self.factor2DF, 0.1, 0.9)
+        lowerBounds = self.factor2DF.quantile(0.1, axis=1)
+        upperBounds = self.factor2DF.quantile(0.9, axis=1)
+        expectedDF = self.factor2DF.clip(lowerBounds, upperBounds, axis=0)
+        self.assertEqual(expectedDF, winsorisedDF)
+
+        with self.assertRaises(ValueError):
+            FactorNormalisation.Winsorise(self.factor2DF, 0.9, 0.1)
+
+    def test_composite_factor(self):
+        compositeFactor = CompositeFactor(
+            {FactorName.Factor1: 0.75, FactorName.Factor2: 0.25}, FactorNormalisationType.ZScore)
+        compositeDF = compositeFactor.CalculateFactorData(self.dataDict)
+
+        zScore1DF = FactorNormalisation.ZScore(self.factor1DF)
+        zScore2DF = FactorNormalisation.ZScore(self.factor2DF)
+        expectedDF = 0.75 * zScore1DF + 0.25 * zScore2DF
+        # Missing factors are dropped and the remaining weights rescaled
+        expectedDF.iloc[1, 4] = zScore2DF.iloc[1, 4]
+        expectedDF.iloc[2, 7] = zScore1DF.iloc[2, 7]
+        self.assertEqual(expectedDF, compositeDF)
+
+        # The composite feeds the trading strategy directly
+        signalsDF = LongBestShortWorst.GenerateTradingSignals(compositeDF, 0.25)
+        self.assertEqual(signalsDF.shape, compositeDF.shape)
+        self.assertTrue(((signalsDF == 1.0).sum(axis=1) == 3).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import unittest
+
+from Common.Enumerations.FactorName import FactorName
+from Common.Enumerations.ReturnType import ReturnType
+from FactorPipeline.FactorResearch import FactorResearch
+
+
+def spearmanCorrelation(a: pd.Series, b: pd.Series) -> float:
+    isValid = a.notna() & b.notna()
+    return a[isValid].rank().corr(b[isValid].rank())
+
+
+class TestFactorResearch(unittest.TestCase):
+
+    def setUp(self):
+        randomState = np.random.RandomState(0)
+        index = pd.date_range('2020-01-01', periods=30)
+        columns = list(range(15))
+        self.returnsDF = pd.DataFrame(randomState.randn(30, 15) * 0.02, index=index, columns=columns)
+        self.factor1DF = self.returnsDF + pd.DataFrame(randomState.randn(30, 15) * 0.02, index=index,
+                                                       columns=columns)
+        self.factor2DF = pd.DataFrame(randomState.randn(30, 15), index=index, columns=columns)
+        self.factor1DF.iloc[4, 2] = np.nan
+        self.returnsDF.iloc[6, 3] = np.nan
+        self.dataDict = {FactorName.Factor1: self.factor1DF, FactorName.Factor2: self.factor2DF,
+                         ReturnType.Mixed: self.returnsDF}
+
+    def test_forward_returns(self):
+        forwardReturnsDF = FactorResearch.CalculateForwardReturns(self.returnsDF, 3)
+        expectedDF = (1.0 + self.returnsDF).rolling(3).apply(np.prod, raw=True).shift(-2) - 1.0
+        pd.testing.assert_frame_equal(forwardReturnsDF, expectedDF)
+
+    def test_information_coefficients(self):
+        informationCoefficientsDF = FactorResearch.CalculateInformationCoefficients(
+            self.dataDict, [FactorName.Factor1, FactorName.Factor2], [1, 5])
+        self.assertEqual(informationCoefficientsDF.shape, (30, 4))
+
+        forwardReturnsDF = FactorResearch.CalculateForwardReturns(self.returnsDF, 5)
+        for t in [0, 4, 6, 20]:
+            expected = spearmanCorrelation(self.factor1DF.iloc[t], forwardReturnsDF.iloc[t])
+            self.assertAlmostEqual(informationCoefficientsDF[(FactorName.Factor1, 5)].iloc[t], expected)
+        self.assertTrue(informationCoefficientsDF[(FactorName.Factor1, 5)].iloc[-4:].isna().all())
+
+        # Factor1 is built from the one period returns, so its IC is high
+        summaryDF = FactorResearch.SummariseInformationCoefficients(informationCoefficientsDF)
+        self.assertGreater(summaryDF.loc[(FactorName.Factor1, 1), 'MeanIC'], 0.5)
+        self.assertLess(abs(summaryDF.loc[(FactorName.Factor2, 1), 'MeanIC']), 0.2)
+
+    def test_rank_autocorrelation(self):
+        autocorrelationsDF = FactorResearch.CalculateRankAutocorrelation(
+            self.dataDict, [FactorName.Factor1, FactorName.Factor2], [1, 2])
+        self.assertTrue(autocorrelationsDF[(FactorName.Factor2, 2)].iloc[:2].isna().all())
+        expected = spearmanCorrelation(self.factor2DF.iloc[10], self.factor2DF.iloc[8])
+        self.assertAlmostEqual(autocorrelationsDF[(FactorName.Factor2, 2)].iloc[10], expected)
+
+        # A factor compared with itself is perfectly correlated
+        autocorrelationsDF = FactorResearch.CalculateRankAutocorrelation(
+            {FactorName.Factor1: pd.concat([self.factor2DF.iloc[[0]]] * 5)}, [FactorName.Factor1])
+        np.testing.assert_allclose(autocorrelationsDF.iloc[1:].values, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import io
+import unittest
+
+from BacktestingRunner.ImportTimeBenchmark import ImportTimeBenchmark
+
+
+class TestImportTimeBenchmark(unittest.TestCase):
+
+    def test_parse_import_times(self):
+        importTimeOutput = ("import time: self [us] | cumulative | imported package\n"
+                            "import time:       120 |        120 |   _io\n"
+                            "import time:      1500 |       1620 | site\n"
+                            "import time:        80 |         80 |     json.decoder\n"
+                            "import time:       300 |        380 |   json\n"
+                            "import time:       200 |        580 | BacktestingRunner\n")
+        self.assertEqual(ImportTimeBenchmark.ParseImportTimes(importTimeOutput),
+                         [('_io', 120, 120, 1), ('site', 1500, 1620, 0), ('json.decoder', 80, 80, 2),
+                          ('json', 300, 380, 1), ('BacktestingRunner', 200, 580, 0)])
+
+    def test_runners_do_not_import_the_engine(self):
+        result = ImportTimeBenchmark.MeasureImportTime('BacktestingRunner.BatchRunner', repeats=1)
+        self.assertIn('BacktestingRunner.BacktestService', result['ImportedModules'])
+        self.assertNotIn('pandas', result['ImportedModules'])
+        self.assertNotIn('site', result['ImportedModules'])
+        self.assertGreater(result['Milliseconds'], 0.0)
+
+    def test_budgets(self):
+        log = io.StringIO()
+        self.assertTrue(ImportTimeBenchmark.CheckBudgets(
+            {'YahooDataScraper.yahoo_scrapper': {'Milliseconds': 60000, 'ForbiddenModules': ['selenium']}},
+            repeats=1, log=log))
+        self.assertFalse(ImportTimeBenchmark.CheckBudgets(
+            {'YahooDataScraper.yahoo_scrapper': {'Milliseconds': 60000, 'ForbiddenModules': ['pandas']}},
+            repeats=1, log=log))
+        self.assertIn('FAIL YahooDataScraper.yahoo_scrapper', log.getvalue())
+        self.assertIn('imports pandas', log.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from BacktestingEngine.BacktestingEngine import BacktestingEngine
+from BacktestingEngine.DataProvider import DataProvider
+from BacktestingEngine.PanelStore import PanelStore
+from BacktestingRunner.SyntheticDataset import SyntheticDataset
+from Common.Analytics.PerformanceAnalytics import PerformanceAnalytics
+from Common.Enumerations.CacheType import CacheType
+from Common.Enumerations.FactorName import FactorName
+from Common.Enumerations.ReturnType import ReturnType
+from PortfolioConstruction.PortfolioConstructionName import PortfolioConstructionName
+from TradingStrategies.TradingStrategyName import TradingStrategyName
+
+
+class TestPanelStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.directoryPath = Path(self.directory.name)
+        SyntheticDataset.WriteCsv(self.directoryPath / 'dataset.csv', 30, 12)
+
+        # add an all zero row and missing forward returns, which are mixed with the next backward returns
+        datasetDF = pd.read_csv(self.directoryPath / 'dataset.csv')
+        datasetDF.loc[datasetDF['date'] == datasetDF['date'].unique()[6], 'fm_1wd'] = 0.0
+        datasetDF.loc[datasetDF.index % 17 == 0, 'fm_1wd'] = np.nan
+        datasetDF.to_csv(self.directoryPath / 'dataset.csv', index=False)
+
+        self.dataDict = DataProvider.CachedLoad(self.directoryPath, 'dataset.csv')
+        PanelStore.FromDataDict(self.directoryPath / 'panel', self.dataDict)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read_blocks(self):
+        panelStore = PanelStore(self.directoryPath / 'panel')
+        self.assertEqual(panelStore.NumberOfDates, 30)
+        self.assertNotIn(ReturnType.Mixed, panelStore.Fields)
+
+        blockDict = panelStore.ReadDataDict(5, 11)
+        pd.testing.assert_frame_equal(blockDict[FactorName.Factor2], self.dataDict[FactorName.Factor2].iloc[5:11],
+                                      check_names=False, check_freq=False)
+
+        # appended rows are read back after the existing ones
+        panelStore.Append(self.dataDict[FactorName.Factor1].index[:2],
+                          {x: self.dataDict[x].iloc[:2] for x in panelStore.Fields})
+        reopenedStore = PanelStore(self.directoryPath / 'panel')
+        self.assertEqual(reopenedStore.NumberOfDates, 32)
+        np.testing.assert_array_equal(reopenedStore.ReadValues(FactorName.Factor1, 30),
+                                      self.dataDict[FactorName.Factor1].values[:2])
+
+    def test_out_of_core_backtest(self):
+        arguments = (TradingStrategyName.LongBestShortWorst,
+                     PortfolioConstructionName.DollarNeutralEqualWeightPortfolio, FactorName.Factor1, 0.2)
+        inMemoryEngine = BacktestingEngine(str(self.directoryPath), 'dataset.csv')
+        expectedDF = PerformanceAnalytics.ToDataFrame(inMemoryEngine.BacktestTradingStrategy(*arguments, 0.01))
+
+        # a budget of seven dates per block, so the blocks do not line up with the zero row
+        outOfCoreEngine = BacktestingEngine(str(self.directoryPath), 'panel', CacheType.Panel)
+        outputFilePath = self.directoryPath / 'results.csv'
+        numberOfDates = outOfCoreEngine.BacktestTradingStrategyOutOfCore(
+            *arguments, str(outputFilePath), executionCostRate=0.01, maximumMemoryBytes=7 * 8 * 12 * (4 + 4))
+        self.assertEqual(numberOfDates, 30)
+
+        resultsDF = pd.read_csv(outputFilePath, index_col=0, parse_dates=True)
+        np.testing.assert_allclose(resultsDF[expectedDF.columns].values, expectedDF.values, rtol=1e-12)
+        np.testing.assert_allclose(
+            resultsDF['LongShortEquity'].values, np.cumprod(1.0 + expectedDF['LongShortPortfolioReturn'].values),
+            rtol=1e-12)
+
+        # the panel store can also be loaded whole through the data provider
+        self.assertEqual(outOfCoreEngine.BacktestTradingStrategy(*arguments, 0.01).keys(),
+                         inMemoryEngine.BacktestTradingStrategy(*arguments, 0.01).keys())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import unittest
+
+from Common.Analytics.PerformanceAnalytics import PerformanceAnalytics
+from Common.DataStructures.PortfolioPerformance import PortfolioPerformance
+
+
+class TestPerformanceAnalytics(unittest.TestCase):
+
+    def setUp(self):
+        randomState = np.random.RandomState(0)
+        self.returns = randomState.randn(200, 3) * 0.01 + 0.001
+        self.returns[[5, 50, 51], [0, 1, 1]] = np.nan
+        self.window = 20
+
+    def test_summary_statistics(self):
+        returnsDF = pd.DataFrame(self.returns)
+        np.testing.assert_allclose(PerformanceAnalytics.SharpeRatio(self.returns, 52),
+                                   returnsDF.mean() / returnsDF.std() * np.sqrt(52))
+        np.testing.assert_allclose(PerformanceAnalytics.HitRate(self.returns),
+                                   (returnsDF > 0).sum() / returnsDF.count())
+
+        # Each column of a sweep gives the same result as on its own
+        for j in range(3):
+            self.assertAlmostEqual(PerformanceAnalytics.MaximumDrawdown(self.returns)[j],
+                                   PerformanceAnalytics.MaximumDrawdown(self.returns[:, j]))
+            self.assertAlmostEqual(PerformanceAnalytics.SortinoRatio(self.returns)[j],
+                                   PerformanceAnalytics.SortinoRatio(self.returns[:, j]))
+
+        self.assertAlmostEqual(PerformanceAnalytics.MaximumDrawdown([0.1, -0.5, 0.2, -0.1]), -0.5)
+
+    def test_rolling_statistics(self):
+        returnsDF = pd.DataFrame(self.returns)
+        rolling = returnsDF.rolling(self.window, min_periods=2)
+        start = self.window - 1
+
+        np.testing.assert_allclose(
+            PerformanceAnalytics.RollingSharpeRatio(self.returns, self.window)[start:],
+            (rolling.mean() / rolling.std()).values[start:])
+        np.testing.assert_allclose(
+            PerformanceAnalytics.RollingHitRate(self.returns, self.window)[start:],
+            ((returnsDF > 0).rolling(self.window).sum() /
+             returnsDF.notna().rolling(self.window).sum()).values[start:])
+        np.testing.assert_allclose(
+            PerformanceAnalytics.RollingAverageTurnover(self.returns, self.window)[start:],
+            rolling.mean().values[start:])
+        self.assertTrue(np.isnan(PerformanceAnalytics.RollingSharpeRatio(self.returns, self.window)[:start]).all())
+
+        for j in range(3):
+            expectedSortino = [PerformanceAnalytics.SortinoRatio(self.returns[i - self.window + 1:i + 1, j])
+                               for i in range(start, len(self.returns))]
+            np.testing.assert_allclose(
+                PerformanceAnalytics.RollingSortinoRatio(self.returns, self.window)[start:, j], expectedSortino)
+
+    def test_rolling_drawdown(self):
+        equity = PerformanceAnalytics.Equity(self.returns)
+        expected = equity / pd.DataFrame(equity).rolling(self.window).max().values - 1.0
+        np.testing.assert_allclose(PerformanceAnalytics.RollingDrawdown(self.returns, self.window), expected)
+        rollingDrawdown = PerformanceAnalytics.RollingDrawdown(self.returns, self.window)
+        self.assertTrue((rollingDrawdown[self.window - 1:] <= 0).all())
+
+    def test_window_longer_than_series(self):
+        returns = [0.01, -0.02, 0.03]
+        for window in [3, 5, 10]:
+            rollingDrawdown = PerformanceAnalytics.RollingDrawdown(returns, window)
+            self.assertEqual(np.isnan(rollingDrawdown).all(), window > len(returns))
+            self.assertEqual(np.isnan(PerformanceAnalytics.RollingSharpeRatio(returns, window)).all(),
+                             window > len(returns))
+        with self.assertRaises(ValueError):
+            PerformanceAnalytics.RollingDrawdown(returns, 0)
+
+    def test_to_data_frame(self):
+        portfolioPerformance = {
+            pd.Timestamp('2020-01-01'): PortfolioPerformance(0.01, -0.02, 0.03, 1.5),
+            pd.Timestamp('2020-01-02'): PortfolioPerformance(0.04, 0.05, -0.06, 0.5)}
+        performanceDF = PerformanceAnalytics.ToDataFrame(portfolioPerformance)
+        self.assertEqual(list(performanceDF.columns), list(PerformanceAnalytics.PerformanceColumns))
+        np.testing.assert_allclose(performanceDF['LongShortPortfolioReturn'].values, [0.03, -0.06])
+        self.assertAlmostEqual(PerformanceAnalytics.AverageTurnover(performanceDF['LongShortTuroverRatio']), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
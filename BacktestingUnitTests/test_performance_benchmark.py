@@ -0,0 +1,68 @@
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from BacktestingRunner.PerformanceBenchmark import PerformanceBenchmark
+
+
+class TestPerformanceBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.baselineFilePath = Path(self.directory.name) / 'baseline.json'
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_find_regressions(self):
+        baselineResults = {'Load': {'Seconds': 0.1, 'PeakMemoryBytes': 1000},
+                           'Engine': {'Seconds': 0.1, 'PeakMemoryBytes': 1000},
+                           'Signals': {'Seconds': 0.001, 'PeakMemoryBytes': 1000}}
+        results = {'Load': {'Seconds': 0.14, 'PeakMemoryBytes': 1100},
+                   'Engine': {'Seconds': 0.2, 'PeakMemoryBytes': 1000},
+                   'Signals': {'Seconds': 0.003, 'PeakMemoryBytes': 1300},
+                   'Rebalance': {'Seconds': 0.1, 'PeakMemoryBytes': 1000}}
+        log = io.StringIO()
+        self.assertEqual(PerformanceBenchmark.FindRegressions(results, baselineResults, log=log),
+                         ['Engine', 'Signals'])
+        self.assertIn('new  Rebalance', log.getvalue())
+
+        # the slower signals are within the timer noise, but use more memory
+        results['Signals']['PeakMemoryBytes'] = 1000
+        self.assertEqual(PerformanceBenchmark.FindRegressions(results, baselineResults, log=log), ['Engine'])
+
+    def test_gate(self):
+        arguments = ['--scenarios', 'MixReturns', 'Rebalance', '--repeats', '1', '--baseline',
+                     str(self.baselineFilePath)]
+        log = io.StringIO()
+        self.assertEqual(PerformanceBenchmark.Main(arguments + ['--update-baseline'], log=log), 0)
+        with open(self.baselineFilePath) as baselineFile:
+            baseline = json.load(baselineFile)
+        self.assertEqual(sorted(baseline['Scenarios']), ['MixReturns', 'Rebalance'])
+        self.assertGreater(baseline['Scenarios']['MixReturns']['PeakMemoryBytes'], 0)
+
+        # the same run is within a loose tolerance of its own baseline
+        self.assertEqual(PerformanceBenchmark.Main(arguments + ['--time-tolerance', '100'], log=log), 0)
+
+        # and regresses against a baseline that uses a tenth of the memory
+        for result in baseline['Scenarios'].values():
+            result['PeakMemoryBytes'] //= 10
+        with open(self.baselineFilePath, 'w') as baselineFile:
+            json.dump(baseline, baselineFile)
+        log = io.StringIO()
+        self.assertEqual(PerformanceBenchmark.Main(arguments + ['--time-tolerance', '100'], log=log), 1)
+        self.assertIn('FAIL MixReturns', log.getvalue())
+
+    def test_unknown_scenario(self):
+        with contextlib.redirect_stderr(io.StringIO()) as errors:
+            with self.assertRaises(SystemExit):
+                PerformanceBenchmark.Main(['--scenarios', 'Unknown', '--baseline', str(self.baselineFilePath)])
+        self.assertIn("invalid choice: 'Unknown'", errors.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from BacktestingEngine.BacktestingEngine import BacktestingEngine
+from BacktestingEngine.DataProvider import DataProvider
+from BacktestingEngine.PriceIngestion import PriceIngestion
+from Common.Analytics.PerformanceAnalytics import PerformanceAnalytics
+from Common.Enumerations.CacheType import CacheType
+from Common.Enumerations.FactorName import FactorName
+from Common.Enumerations.ReturnType import ReturnType
+from PortfolioConstruction.PortfolioConstructionName import PortfolioConstructionName
+from TradingStrategies.TradingStrategyName import TradingStrategyName
+
+
+class TestPriceIngestion(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.directoryPath = Path(self.directory.name)
+
+        # a price data frame in the format of the Yahoo data scraper, with a missing price
+        randomState = np.random.RandomState(0)
+        self.tickers = ['BHP', 'CBA', 'RIO', 'BTC', 'ETH', 'LTC', 'FVX', 'TNX', 'TYX', 'XRP']
+        prices = 100.0 * np.exp(np.cumsum(randomState.normal(0.0, 0.02, (40, len(self.tickers))), axis=0))
+        prices[12, 3] = np.nan
+        self.pricesDF = pd.DataFrame(prices, columns=[x + '_Close' for x in self.tickers])
+        self.pricesDF.insert(0, 'Date', pd.date_range('2020-01-06', periods=40, freq='W-MON'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_returns(self):
+        pricePanelDF = PriceIngestion.ToPricePanel(self.pricesDF)
+        self.assertEqual(list(pricePanelDF.columns), self.tickers)
+        returnsDict = PriceIngestion.CalculateReturns(pricePanelDF)
+
+        expectedDF = pricePanelDF.ffill() / pricePanelDF.ffill().shift(1) - 1.0
+        pd.testing.assert_frame_equal(returnsDict[ReturnType.Backward], expectedDF)
+        pd.testing.assert_frame_equal(returnsDict[ReturnType.Forward], expectedDF.shift(-1))
+
+        # the return over the missing price is measured between the prices either side of it
+        prices = pricePanelDF.values[:, 3]
+        np.testing.assert_allclose(returnsDict[ReturnType.Forward].values[[11, 12], 3],
+                                   [0.0, prices[13] / prices[11] - 1.0])
+
+    def test_panel_store_backtest(self):
+        # a factor that is long the lowest and short the highest prices
+        pricePanelDF = PriceIngestion.ToPricePanel(self.pricesDF)
+        factorDF = -pricePanelDF.ffill()
+        PriceIngestion.WritePanelStore(self.directoryPath / 'prices', self.pricesDF, {FactorName.Factor1: factorDF})
+
+        dataDict = DataProvider.FilteredCachedLoad(self.directoryPath, 'prices', CacheType.Panel)
+        self.assertEqual(list(dataDict[FactorName.Factor1].columns), self.tickers)
+        np.testing.assert_array_equal(dataDict[ReturnType.Mixed].values, dataDict[ReturnType.Forward].values)
+
+        arguments = (TradingStrategyName.LongBestShortWorst,
+                     PortfolioConstructionName.DollarNeutralEqualWeightPortfolio, FactorName.Factor1, 0.2)
+        engine = BacktestingEngine(str(self.directoryPath), 'prices', CacheType.Panel)
+        resultsDF = PerformanceAnalytics.ToDataFrame(engine.BacktestTradingStrategy(*arguments))
+
+        # the last date, without forward returns, is not stored
+        self.assertEqual(list(resultsDF.index), list(pricePanelDF.index[:-1]))
+        self.assertFalse(np.isnan(resultsDF.values).any())
+        self.assertFalse((resultsDF['LongShortPortfolioReturn'] == -1.0).any())
+
+        outputFilePath = self.directoryPath / 'results.csv'
+        engine.BacktestTradingStrategyOutOfCore(*arguments, str(outputFilePath), maximumMemoryBytes=2000)
+        outOfCoreDF = pd.read_csv(outputFilePath, index_col=0, parse_dates=True)
+        np.testing.assert_allclose(outOfCoreDF[resultsDF.columns].values, resultsDF.values, rtol=1e-12)
+
+    def test_missing_price_of_a_held_security(self):
+        # a factor that is always long the security with the missing price
+        pricePanelDF = PriceIngestion.ToPricePanel(self.pricesDF)
+        factorDF = -pricePanelDF.ffill()
+        factorDF[self.tickers[3]] = 1000.0
+        PriceIngestion.WritePanelStore(self.directoryPath / 'prices', self.pricesDF, {FactorName.Factor1: factorDF})
+
+        engine = BacktestingEngine(str(self.directoryPath), 'prices', CacheType.Panel)
+        resultsDF = PerformanceAnalytics.ToDataFrame(engine.BacktestTradingStrategy(
+            TradingStrategyName.LongBestShortWorst, PortfolioConstructionName.DollarNeutralEqualWeightPortfolio,
+            FactorName.Factor1, 0.2))
+        # a missing return would lose the half of the long book held in the security
+        self.assertFalse(np.isnan(resultsDF.values).any())
+        self.assertTrue((resultsDF['LongPortfolioReturn'].abs() < 0.2).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
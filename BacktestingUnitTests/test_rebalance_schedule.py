@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from BacktestingEngine.BacktestingEngine import BacktestingEngine
+from BacktestingEngine.RebalanceSchedule import RebalanceSchedule
+from BacktestingRunner.SyntheticDataset import SyntheticDataset
+from Common.Enumerations.FactorName import FactorName
+from Common.Enumerations.RebalanceFrequency import RebalanceFrequency
+from PortfolioConstruction.PortfolioConstructionName import PortfolioConstructionName
+from TradingStrategies.TradingStrategyName import TradingStrategyName
+
+
+class TestRebalanceSchedule(unittest.TestCase):
+
+    def setUp(self):
+        self.dates = pd.bdate_range('2020-01-01', periods=45)
+
+    def test_rebalance_masks(self):
+        mask = RebalanceSchedule(RebalanceFrequency.EveryNBars, numberOfBars=5).GetRebalanceMask(self.dates)
+        np.testing.assert_array_equal(np.flatnonzero(mask), np.arange(0, 45, 5))
+
+        mask = RebalanceSchedule(RebalanceFrequency.Weekly).GetRebalanceMask(self.dates)
+        self.assertTrue(mask[0])
+        self.assertTrue((self.dates[mask][1:].dayofweek == 0).all())  # the later weeks start on Mondays
+
+        mask = RebalanceSchedule(RebalanceFrequency.Monthly).GetRebalanceMask(self.dates)
+        self.assertEqual(list(self.dates[mask].strftime('%Y-%m-%d')), ['2020-01-01', '2020-02-03', '2020-03-02'])
+
+        # explicit dates roll forward to the next bar, and dates after the data are ignored
+        schedule = RebalanceSchedule(
+            RebalanceFrequency.Dates, rebalanceDates=['2020-01-04', '2020-01-15', '2021-01-01'])
+        mask = schedule.GetRebalanceMask(self.dates)
+        self.assertEqual(list(self.dates[mask].strftime('%Y-%m-%d')), ['2020-01-06', '2020-01-15'])
+
+        with self.assertRaises(ValueError):
+            RebalanceSchedule(RebalanceFrequency.EveryNBars, numberOfBars=0)
+
+    def test_compound_returns(self):
+        randomState = np.random.RandomState(0)
+        returnsDF = pd.DataFrame(randomState.randn(45, 4) * 0.02, index=self.dates)
+        returnsDF.iloc[3, 1] = np.nan
+        returnsDF.iloc[0:5, 2] = np.nan  # a whole holding period is missing
+
+        schedule = RebalanceSchedule(RebalanceFrequency.EveryNBars, numberOfBars=5)
+        compoundedDF = schedule.CompoundReturns(returnsDF)
+
+        periodIds = np.arange(45) // 5
+        expectedDF = (1.0 + returnsDF).groupby(periodIds).prod(min_count=1) - 1.0
+        expectedDF.index = self.dates[::5]
+        pd.testing.assert_frame_equal(compoundedDF, expectedDF, check_freq=False)
+        self.assertTrue(np.isnan(compoundedDF.iloc[0, 2]))
+
+    def test_engine_rebalance_schedule(self):
+        with tempfile.TemporaryDirectory() as directoryStr:
+            SyntheticDataset.WriteCsv(Path(directoryStr) / 'dataset.csv', 40, 20)
+            engine = BacktestingEngine(directoryStr, 'dataset.csv')
+            arguments = (TradingStrategyName.LongBestShortWorst,
+                         PortfolioConstructionName.DollarNeutralEqualWeightPortfolio, FactorName.Factor1, 0.2, 0.01)
+
+            # rebalancing on every bar is the default behaviour
+            dailyPerformance = engine.BacktestTradingStrategy(*arguments)
+            everyBarPerformance = engine.BacktestTradingStrategy(
+                *arguments, rebalanceSchedule=RebalanceSchedule(RebalanceFrequency.EveryNBars))
+            self.assertEqual(list(dailyPerformance.keys()), list(everyBarPerformance.keys()))
+            for date in dailyPerformance:
+                self.assertEqual(vars(dailyPerformance[date]), vars(everyBarPerformance[date]))
+
+            schedule = RebalanceSchedule(RebalanceFrequency.Weekly)
+            weeklyPerformance = engine.BacktestTradingStrategy(*arguments, rebalanceSchedule=schedule)
+            rebalanceDates = engine.Data[FactorName.Factor1].index[schedule.GetRebalanceMask(
+                engine.Data[FactorName.Factor1].index)]
+            self.assertEqual(list(weeklyPerformance.keys()), list(rebalanceDates))
+
+            sparsePerformance = engine.BacktestTradingStrategy(
+                TradingStrategyName.LongBestShortWorst,
+                PortfolioConstructionName.SparseDollarNeutralEqualWeightPortfolio, FactorName.Factor1, 0.2, 0.01,
+                rebalanceSchedule=schedule)
+            for date in weeklyPerformance:
+                self.assertAlmostEqual(weeklyPerformance[date].LongShortPortfolioReturn,
+                                       sparsePerformance[date].LongShortPortfolioReturn)
+
+            variantsDict = engine.BacktestTradingStrategyVariants(
+                TradingStrategyName.LongBestShortWorst, PortfolioConstructionName.DollarNeutralEqualWeightPortfolio,
+                [(FactorName.Factor1, 0.2, 0.01)], rebalanceSchedule=schedule)
+            np.testing.assert_allclose(
+                variantsDict["LongShortPortfolioReturn"][0].values,
+                [weeklyPerformance[date].LongShortPortfolioReturn for date in rebalanceDates])
+
+
+if __name__ == '__main__':
+    unittest.main()
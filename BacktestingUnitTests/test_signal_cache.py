@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import tempfile
+import unittest
+import pandas.testing as pd_testing
+
+from concurrent.futures import ThreadPoolExecutor
+
+from BacktestingEngine.SignalCache import SignalCache
+from Common.Enumerations.FactorName import FactorName
+from TradingStrategies.LongBestShortWorst import LongBestShortWorst
+from TradingStrategies.TradingStrategyName import TradingStrategyName
+
+
+class TestSignalCache(unittest.TestCase):
+    def assertDataframeEqual(self, a, b, msg):
+        try:
+            pd_testing.assert_frame_equal(a, b)
+        except AssertionError as e:
+            raise self.failureException(msg) from e
+
+    def setUp(self):
+        self.addTypeEqualityFunc(pd.DataFrame, self.assertDataframeEqual)
+        self.factorDataDF = pd.DataFrame(
+            np.random.RandomState(0).randn(6, 10),
+            index=pd.date_range('2020-01-01', periods=6), columns=list(range(10)))
+        self.factorDataDF.iloc[2, 3] = np.nan
+
+    def test_signals_match_strategy(self):
+        cache = SignalCache()
+        signalsDF = cache.GetTradingSignals(
+            TradingStrategyName.LongBestShortWorst, FactorName.Factor1, 0.2, self.factorDataDF)
+        self.assertEqual(LongBestShortWorst.GenerateTradingSignals(self.factorDataDF, 0.2), signalsDF)
+
+    def test_cache_hit_and_invalidation(self):
+        cache = SignalCache()
+        cache.GetTradingSignals(TradingStrategyName.LongBestShortWorst, FactorName.Factor1, 0.2, self.factorDataDF)
+        cache.GetTradingSignals(TradingStrategyName.LongBestShortWorst, FactorName.Factor1, 0.2, self.factorDataDF)
+        self.assertEqual((cache.Hits, cache.Misses), (1, 1))
+
+        # A different percentile is a different entry
+        cache.GetTradingSignals(TradingStrategyName.LongBestShortWorst, FactorName.Factor1, 0.3, self.factorDataDF)
+        self.assertEqual((cache.Hits, cache.Misses), (1, 2))
+
+        # Revising the factor data invalidates the entry
+        revisedFactorDataDF = self.factorDataDF.copy(deep=True)
+        revisedFactorDataDF.iloc[5] = -revisedFactorDataDF.iloc[5]
+        signalsDF = cache.GetTradingSignals(
+            TradingStrategyName.LongBestShortWorst, FactorName.Factor1, 0.2, revisedFactorDataDF)
+        self.assertEqual((cache.Hits, cache.Misses), (1, 3))
+        self.assertEqual(LongBestShortWorst.GenerateTradingSignals(revisedFactorDataDF, 0.2), signalsDF)
+
+    def test_disk_spill(self):
+        with tempfile.TemporaryDirectory() as cacheDirectoryStr:
+            cache = SignalCache(cacheDirectoryStr)
+            expectedDF = cache.GetTradingSignals(
+                TradingStrategyName.LongBestShortWorst, FactorName.Factor2, 0.2, self.factorDataDF)
+
+            # A new cache pointing at the same directory reloads the int8 signals from disk
+            newCache = SignalCache(cacheDirectoryStr)
+            signalsDF = newCache.GetTradingSignals(
+                TradingStrategyName.LongBestShortWorst, FactorName.Factor2, 0.2, self.factorDataDF)
+            self.assertEqual((newCache.Hits, newCache.Misses), (1, 0))
+            self.assertEqual(expectedDF, signalsDF)
+
+            files = list(newCache.CacheDirectory.glob('signals_*.npy'))
+            self.assertEqual(len(files), 1)
+            self.assertEqual(np.load(files[0]).dtype, np.int8)
+
+            newCache.Clear()
+            self.assertEqual(list(newCache.CacheDirectory.glob('signals_*.npy')), [])
+
+
+    def test_shared_between_threads(self):
+        revisedFactorDataDF = -self.factorDataDF
+        expectedDFs = [LongBestShortWorst.GenerateTradingSignals(x, 0.2)
+                       for x in [self.factorDataDF, revisedFactorDataDF]]
+        with tempfile.TemporaryDirectory() as cacheDirectoryStr:
+            # the threads keep revising the same entry, which replaces its file on every miss
+            cache = SignalCache(cacheDirectoryStr)
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                signalsDFs = list(executor.map(
+                    lambda i: cache.GetTradingSignals(TradingStrategyName.LongBestShortWorst, FactorName.Factor1,
+                                                      0.2, [self.factorDataDF, revisedFactorDataDF][i % 2]),
+                    range(200)))
+            self.assertEqual(cache.Hits + cache.Misses, 200)
+            for (i, signalsDF) in enumerate(signalsDFs):
+                self.assertEqual(expectedDFs[i % 2], signalsDF)
+            self.assertEqual(len(list(cache.CacheDirectory.glob('signals_*.npy'))), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
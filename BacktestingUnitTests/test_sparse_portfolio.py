@@ -0,0 +1,95 @@
+import numpy as np
+import unittest
+
+from Common.DataStructures.SparsePositions import SparsePositions
+from PortfolioConstruction.BatchedDollarNeutralEqualWeightPortfolio import BatchedDollarNeutralEqualWeightPortfolio
+from PortfolioConstruction.DollarNeutralEqualWeightPortfolio import DollarNeutralEqualWeightPortfolio
+from PortfolioConstruction.SparseDollarNeutralEqualWeightPortfolio import SparseDollarNeutralEqualWeightPortfolio
+
+
+class TestSparsePortfolioConstruction(unittest.TestCase):
+
+    def test_portfolio_construction(self):
+        # Same inputs as test_portfolio.test_portfolio_construction, in sparse form.
+        previousPortfolioPositions = SparsePositions(
+            [0, 2, 3], [0.336035009195627, 0.336407140988756, 0.335493726587439], [1], [-1.013382533016710])
+        currentPortfolioSignals = SparsePositions.FromDenseSignals([-1.0, 0.0, 1.0, 0.0])
+
+        portfolio = SparseDollarNeutralEqualWeightPortfolio(previousPortfolioPositions, currentPortfolioSignals)
+
+        np.testing.assert_array_equal(portfolio.PortfolioPositions.LongIndices, [2])
+        np.testing.assert_array_equal(portfolio.PortfolioPositions.ShortIndices, [0])
+        np.testing.assert_allclose(portfolio.PortfolioPositions.ToDense(4),
+                                   [-1.01065920489427, 0.0, 1.01065920489427, 0.0])
+        np.testing.assert_array_equal(portfolio.ChangeInPortfolioWeightsIndices, [0, 1, 2, 3])
+        np.testing.assert_allclose(portfolio.ChangeInPortfolioWeights,
+                                   [-1.346694214089890, 1.013382533016710, 0.674252063905511, -0.335493726587439])
+
+    def test_matches_dense_portfolio(self):
+        randomState = np.random.RandomState(0)
+        numberOfSecurities = 50
+        previousWeights = np.zeros(numberOfSecurities)
+        previousPositions = SparsePositions.Empty()
+        for i in range(10):
+            signals = randomState.choice([-1.0, 0.0, 0.0, 0.0, 1.0], numberOfSecurities)
+            returns = randomState.randn(numberOfSecurities) * 0.02
+            returns[randomState.rand(numberOfSecurities) < 0.1] = np.nan
+
+            densePortfolio = DollarNeutralEqualWeightPortfolio(previousWeights, signals)
+            sparsePortfolio = SparseDollarNeutralEqualWeightPortfolio(
+                previousPositions, SparsePositions.FromDenseSignals(signals))
+            np.testing.assert_allclose(sparsePortfolio.PortfolioPositions.ToDense(numberOfSecurities),
+                                       densePortfolio.PortfolioWeights)
+
+            densePerformance = densePortfolio.CalculatePortfolioReturns(returns, 0.01)
+            sparsePerformance = sparsePortfolio.CalculatePortfolioReturns(returns, 0.01)
+            self.assertAlmostEqual(sparsePerformance.LongPortfolioReturn, densePerformance.LongPortfolioReturn)
+            self.assertAlmostEqual(sparsePerformance.ShortPortfolioReturn, densePerformance.ShortPortfolioReturn)
+            self.assertAlmostEqual(
+                sparsePerformance.LongShortPortfolioReturn, densePerformance.LongShortPortfolioReturn)
+            self.assertAlmostEqual(
+                sparsePerformance.LongShortTuroverRatio, densePerformance.LongShortTuroverRatio)
+
+            previousWeights = densePortfolio.PortfolioWeights
+            previousPositions = sparsePortfolio.PortfolioPositions
+
+    def test_empty_books(self):
+        # the dense, sparse and batched portfolios hold nothing in an empty book, and its returns are missing
+        previousWeights = np.array([0.5, 0.5, -0.5, -0.5])
+        returns = np.array([0.1, 0.2, 0.3, 0.4])
+        for signals in [np.array([1.0, 0.0, 0.0, 0.0]), np.array([0.0, 0.0, -1.0, 0.0]), np.zeros(4)]:
+            with self.subTest(signals=signals):
+                densePortfolio = DollarNeutralEqualWeightPortfolio(previousWeights, signals)
+                sparsePortfolio = SparseDollarNeutralEqualWeightPortfolio(
+                    SparsePositions([0, 1], [0.5, 0.5], [2, 3], [-0.5, -0.5]),
+                    SparsePositions.FromDenseSignals(signals))
+                batchedPortfolio = BatchedDollarNeutralEqualWeightPortfolio(
+                    previousWeights[np.newaxis, :], signals[np.newaxis, :])
+                np.testing.assert_array_equal(densePortfolio.PortfolioWeights, signals)
+                np.testing.assert_array_equal(sparsePortfolio.PortfolioPositions.ToDense(4), signals)
+                np.testing.assert_array_equal(batchedPortfolio.PortfolioWeights[0], signals)
+
+                densePerformance = densePortfolio.CalculatePortfolioReturns(returns, 0.01)
+                sparsePerformance = sparsePortfolio.CalculatePortfolioReturns(returns, 0.01)
+                batchedPerformance = batchedPortfolio.CalculatePortfolioReturns(returns, 0.01)[0]
+                for performance in [sparsePerformance, batchedPerformance]:
+                    np.testing.assert_allclose(
+                        [performance.LongPortfolioReturn, performance.ShortPortfolioReturn,
+                         performance.LongShortPortfolioReturn, performance.LongShortTuroverRatio],
+                        [densePerformance.LongPortfolioReturn, densePerformance.ShortPortfolioReturn,
+                         densePerformance.LongShortPortfolioReturn, densePerformance.LongShortTuroverRatio])
+                self.assertTrue(np.isnan(densePerformance.ShortPortfolioReturn if signals.max() > 0.0
+                                         else densePerformance.LongPortfolioReturn))
+                self.assertFalse(np.isinf([densePerformance.LongPortfolioReturn,
+                                           densePerformance.ShortPortfolioReturn]).any())
+
+    def test_signals_matrix(self):
+        signalsMatrix = np.array([[1, 0, -1, 0], [0, 0, 0, 0], [-1, 1, 1, -1]], dtype=np.int8)
+        sparseSignals = SparsePositions.FromSignalsMatrix(signalsMatrix)
+        self.assertEqual(len(sparseSignals), 3)
+        for row, signals in zip(signalsMatrix, sparseSignals):
+            np.testing.assert_array_equal(signals.ToDense(4), row)
+
+
+if __name__ == '__main__':
+    unittest.main()
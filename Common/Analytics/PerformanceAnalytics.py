@@ -0,0 +1,188 @@
+import numpy
+import pandas
+
+
+class PerformanceAnalytics(object):
+    '''
+    Performance statistics computed as array operations over backtest results.
+
+    The statistics take a one dimensional array of per period values for a single result, or a periods x
+    results array (e.g. the output of a parameter sweep) in which case every column is treated as a separate
+    result. Missing (NaN) values are ignored.
+
+    The rolling statistics are built from running sums, so each step costs O(1) regardless of the window
+    length. The rolling drawdown uses a block wise running maximum, which is also O(1) per step.
+    '''
+
+    PerformanceColumns = ("LongPortfolioReturn", "ShortPortfolioReturn", "LongShortPortfolioReturn",
+                          "LongShortTuroverRatio")
+
+    @staticmethod
+    def ToDataFrame(portfolioPerformance: dict) -> pandas.DataFrame:
+        '''
+        Converts the dictionary of PortfolioPerformance by date returned by the backtesting engine to a data
+        frame with one column per PortfolioPerformance attribute.
+        '''
+        values = numpy.array([[getattr(performance, x) for x in PerformanceAnalytics.PerformanceColumns]
+                              for performance in portfolioPerformance.values()], dtype=numpy.float64)
+        return pandas.DataFrame(values.reshape(-1, len(PerformanceAnalytics.PerformanceColumns)),
+                                index=list(portfolioPerformance.keys()),
+                                columns=list(PerformanceAnalytics.PerformanceColumns))
+
+    # Summary statistics
+    # ==================
+
+    @staticmethod
+    def SharpeRatio(returns, periodsPerYear=1.0):
+        '''
+        The mean return over the standard deviation of the returns, annualised by the number of periods per
+        year. No risk free rate is deducted, as the long-short portfolio is dollar neutral.
+        '''
+        returns = PerformanceAnalytics.__AsArray(returns)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            return (numpy.nanmean(returns, axis=0) / numpy.nanstd(returns, axis=0, ddof=1) *
+                    numpy.sqrt(periodsPerYear))
+
+    @staticmethod
+    def SortinoRatio(returns, periodsPerYear=1.0):
+        '''
+        The mean return over the downside deviation (root mean square of the negative returns), annualised by
+        the number of periods per year.
+        '''
+        returns = PerformanceAnalytics.__AsArray(returns)
+        downsideDeviation = numpy.sqrt(numpy.nanmean(numpy.minimum(returns, 0.0) ** 2, axis=0))
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            return numpy.nanmean(returns, axis=0) / downsideDeviation * numpy.sqrt(periodsPerYear)
+
+    @staticmethod
+    def MaximumDrawdown(returns):
+        '''
+        The largest fall of the compounded equity curve from its running high-water mark, as a non-positive
+        fraction.
+        '''
+        equity = PerformanceAnalytics.Equity(returns)
+        highWaterMark = numpy.maximum.accumulate(numpy.maximum(equity, 1.0), axis=0)
+        return (equity / highWaterMark - 1.0).min(axis=0, initial=0.0)
+
+    @staticmethod
+    def HitRate(returns):
+        '''
+        The fraction of periods with a positive return.
+        '''
+        returns = PerformanceAnalytics.__AsArray(returns)
+        isValid = ~numpy.isnan(returns)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            return (returns > 0.0).sum(axis=0) / isValid.sum(axis=0)
+
+    @staticmethod
+    def AverageTurnover(turnoverRatios):
+        turnoverRatios = PerformanceAnalytics.__AsArray(turnoverRatios)
+        return numpy.nanmean(turnoverRatios, axis=0)
+
+    @staticmethod
+    def Equity(returns) -> numpy.ndarray:
+        '''
+        The equity curve from compounding the returns, starting from 1. Missing returns leave the equity
+        unchanged.
+        '''
+        returns = PerformanceAnalytics.__AsArray(returns)
+        return numpy.cumprod(1.0 + numpy.nan_to_num(returns), axis=0)
+
+    # Rolling statistics
+    # ==================
+
+    @staticmethod
+    def RollingSharpeRatio(returns, window: int, periodsPerYear=1.0) -> numpy.ndarray:
+        returns = PerformanceAnalytics.__AsArray(returns)
+        count, mean, variance = PerformanceAnalytics.__RollingMoments(returns, window)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            return mean / numpy.sqrt(variance) * numpy.sqrt(periodsPerYear)
+
+    @staticmethod
+    def RollingSortinoRatio(returns, window: int, periodsPerYear=1.0) -> numpy.ndarray:
+        returns = PerformanceAnalytics.__AsArray(returns)
+        count, mean, variance = PerformanceAnalytics.__RollingMoments(returns, window)
+        downsideSquares = PerformanceAnalytics.__RollingSum(numpy.minimum(returns, 0.0) ** 2, window)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            return mean / numpy.sqrt(downsideSquares / count) * numpy.sqrt(periodsPerYear)
+
+    @staticmethod
+    def RollingHitRate(returns, window: int) -> numpy.ndarray:
+        returns = PerformanceAnalytics.__AsArray(returns)
+        count = PerformanceAnalytics.__RollingSum(~numpy.isnan(returns), window)
+        hits = PerformanceAnalytics.__RollingSum(returns > 0.0, window)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            return hits / count
+
+    @staticmethod
+    def RollingAverageTurnover(turnoverRatios, window: int) -> numpy.ndarray:
+        turnoverRatios = PerformanceAnalytics.__AsArray(turnoverRatios)
+        count = PerformanceAnalytics.__RollingSum(~numpy.isnan(turnoverRatios), window)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            return PerformanceAnalytics.__RollingSum(turnoverRatios, window) / count
+
+    @staticmethod
+    def RollingDrawdown(returns, window: int) -> numpy.ndarray:
+        '''
+        The drawdown of the equity curve from its highest value over the trailing window, as a non-positive
+        fraction.
+        '''
+        equity = PerformanceAnalytics.Equity(returns)
+        rollingDrawdown = equity / PerformanceAnalytics.__RollingMaximum(equity, window) - 1.0
+        rollingDrawdown[:window - 1] = numpy.nan
+        return rollingDrawdown
+
+    # Helpers
+    # =======
+
+    @staticmethod
+    def __AsArray(values) -> numpy.ndarray:
+        return numpy.asarray(values, dtype=numpy.float64)
+
+    @staticmethod
+    def __RollingSum(values: numpy.ndarray, window: int) -> numpy.ndarray:
+        # Trailing window sums from the difference of running sums. Missing values count as zero, and the
+        # first window - 1 periods are NaN.
+        if window < 1:
+            raise ValueError(f"The window must be at least 1. The value provided was {window}.")
+        values = numpy.nan_to_num(numpy.asarray(values, dtype=numpy.float64))
+        cumulativeSum = numpy.cumsum(values, axis=0)
+        rollingSum = cumulativeSum.copy()
+        rollingSum[window:] -= cumulativeSum[:-window]
+        rollingSum[:window - 1] = numpy.nan
+        return rollingSum
+
+    @staticmethod
+    def __RollingMoments(values: numpy.ndarray, window: int) -> tuple:
+        # Rolling count, mean and sample variance of the non missing values.
+        count = PerformanceAnalytics.__RollingSum(~numpy.isnan(values), window)
+        total = PerformanceAnalytics.__RollingSum(values, window)
+        totalOfSquares = PerformanceAnalytics.__RollingSum(values ** 2, window)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            mean = total / count
+            variance = (totalOfSquares - total * mean) / (count - 1.0)
+        variance[count < 2] = numpy.nan
+        return count, mean, numpy.maximum(variance, 0.0)
+
+    @staticmethod
+    def __RollingMaximum(values: numpy.ndarray, window: int) -> numpy.ndarray:
+        # Trailing window maximum using the van Herk/Gil-Werman algorithm: running maxima forwards and
+        # backwards within blocks of the window length, combined with one comparison per step. A window longer
+        # than the series has no full window, so every period is NaN.
+        if window < 1:
+            raise ValueError(f"The window must be at least 1. The value provided was {window}.")
+        numberOfPeriods = values.shape[0]
+        if window > numberOfPeriods:
+            return numpy.full(values.shape, numpy.nan)
+        numberOfBlocks = -(-numberOfPeriods // window)
+        paddedShape = (numberOfBlocks * window,) + values.shape[1:]
+        padded = numpy.full(paddedShape, -numpy.inf)
+        padded[:numberOfPeriods] = values
+        blocks = padded.reshape((numberOfBlocks, window) + values.shape[1:])
+        prefixMaximum = numpy.maximum.accumulate(blocks, axis=1).reshape(paddedShape)
+        suffixMaximum = numpy.flip(numpy.maximum.accumulate(numpy.flip(blocks, axis=1), axis=1), axis=1).reshape(
+            paddedShape)
+        rollingMaximum = prefixMaximum[:numberOfPeriods].copy()
+        rollingMaximum[window - 1:] = numpy.maximum(
+            suffixMaximum[:numberOfPeriods - window + 1], prefixMaximum[window - 1:numberOfPeriods])
+        return rollingMaximum
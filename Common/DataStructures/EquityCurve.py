@@ -0,0 +1,69 @@
+import math
+import numpy
+
+from array import array
+
+from Common.DataStructures.PortfolioPerformance import PortfolioPerformance
+
+
+class EquityCurve(object):
+    '''
+    Basic class for the storage of the equity curves of the long, short and long-short books. The curves are
+    built in a single streaming pass: each call to Update compounds the returns for one date, and the running
+    high-water marks and drawdowns are updated alongside. The values are stored in flat float arrays, so no
+    intermediate frames are created.
+
+    Dates with a missing (NaN) return leave the equity of that book unchanged.
+    '''
+
+    Books = ("Long", "Short", "LongShort")
+
+    def __init__(self, initialEquity=1.0):
+        self.InitialEquity = initialEquity
+        self.Dates = []
+        self.__Equity = {x: array('d') for x in EquityCurve.Books}
+        self.__HighWaterMark = {x: array('d') for x in EquityCurve.Books}
+        self.__Drawdown = {x: array('d') for x in EquityCurve.Books}
+        self.__CurrentEquity = {x: initialEquity for x in EquityCurve.Books}
+        self.__CurrentHighWaterMark = {x: initialEquity for x in EquityCurve.Books}
+
+    def Update(self, date, portfolioPerformance: PortfolioPerformance):
+        '''
+        Compounds the returns for a single date into the equity curves.
+        '''
+
+        self.Dates.append(date)
+        returns = (portfolioPerformance.LongPortfolioReturn, portfolioPerformance.ShortPortfolioReturn,
+                   portfolioPerformance.LongShortPortfolioReturn)
+        for (book, periodReturn) in zip(EquityCurve.Books, returns):
+            if not math.isnan(periodReturn):
+                self.__CurrentEquity[book] *= 1.0 + periodReturn
+            equity = self.__CurrentEquity[book]
+            if equity > self.__CurrentHighWaterMark[book]:
+                self.__CurrentHighWaterMark[book] = equity
+            highWaterMark = self.__CurrentHighWaterMark[book]
+            self.__Equity[book].append(equity)
+            self.__HighWaterMark[book].append(highWaterMark)
+            self.__Drawdown[book].append(equity / highWaterMark - 1.0)
+
+    def Equity(self, book="LongShort") -> numpy.ndarray:
+        '''
+        Returns the equity curve of the book ("Long", "Short" or "LongShort").
+        '''
+        return numpy.array(self.__Equity[book], dtype=numpy.float64)
+
+    def HighWaterMark(self, book="LongShort") -> numpy.ndarray:
+        '''
+        Returns the running high-water mark of the book ("Long", "Short" or "LongShort").
+        '''
+        return numpy.array(self.__HighWaterMark[book], dtype=numpy.float64)
+
+    def Drawdown(self, book="LongShort") -> numpy.ndarray:
+        '''
+        Returns the drawdown of the book from its running high-water mark, as a non-positive fraction.
+        '''
+        return numpy.array(self.__Drawdown[book], dtype=numpy.float64)
+
+    def MaximumDrawdown(self, book="LongShort") -> float:
+        drawdown = self.Drawdown(book)
+        return drawdown.min() if len(drawdown) > 0 else 0.0
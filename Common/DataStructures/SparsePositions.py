@@ -0,0 +1,63 @@
+import numpy
+
+
+class SparsePositions(object):
+    '''
+    Basic class for the storage of a long/short book in sparse form. Only the securities with a position are
+    stored, as column indices into the security universe together with their weights. Trading signals are
+    stored in the same form, with weights of 1 for the long book and -1 for the short book.
+    '''
+
+    def __init__(self, longIndices: numpy.ndarray, longWeights: numpy.ndarray, shortIndices: numpy.ndarray,
+                 shortWeights: numpy.ndarray):
+        self.LongIndices = numpy.asarray(longIndices, dtype=numpy.int64)
+        self.LongWeights = numpy.asarray(longWeights, dtype=numpy.float64)
+        self.ShortIndices = numpy.asarray(shortIndices, dtype=numpy.int64)
+        self.ShortWeights = numpy.asarray(shortWeights, dtype=numpy.float64)
+
+    @staticmethod
+    def Empty():
+        '''
+        Returns a book with no positions, e.g. the holdings before the first rebalance.
+        '''
+        return SparsePositions(numpy.zeros(0), numpy.zeros(0), numpy.zeros(0), numpy.zeros(0))
+
+    @staticmethod
+    def FromDenseSignals(signals: numpy.ndarray):
+        '''
+        Converts a single row of dense signals (1, -1 or 0) to sparse signals.
+        '''
+        signals = numpy.asarray(signals).reshape(-1)
+        longIndices = numpy.flatnonzero(signals > 0)
+        shortIndices = numpy.flatnonzero(signals < 0)
+        return SparsePositions(
+            longIndices, numpy.ones(len(longIndices)), shortIndices, -numpy.ones(len(shortIndices)))
+
+    @staticmethod
+    def FromSignalsMatrix(signalsMatrix: numpy.ndarray) -> list:
+        '''
+        Converts a dates x securities matrix of dense signals to a list of sparse signals, one per date. The
+        non-zero entries are located for the whole matrix at once and then split by row.
+        '''
+        signalsMatrix = numpy.asarray(signalsMatrix)
+        numberOfRows = signalsMatrix.shape[0]
+        longRows, longColumns = numpy.nonzero(signalsMatrix > 0)
+        shortRows, shortColumns = numpy.nonzero(signalsMatrix < 0)
+        longSplits = numpy.searchsorted(longRows, numpy.arange(1, numberOfRows))
+        shortSplits = numpy.searchsorted(shortRows, numpy.arange(1, numberOfRows))
+        return [SparsePositions(longIndices, numpy.ones(len(longIndices)),
+                                shortIndices, -numpy.ones(len(shortIndices)))
+                for (longIndices, shortIndices) in zip(numpy.split(longColumns, longSplits),
+                                                       numpy.split(shortColumns, shortSplits))]
+
+    def AbsoluteTotalWeight(self) -> float:
+        return numpy.abs(self.LongWeights).sum() + numpy.abs(self.ShortWeights).sum()
+
+    def ToDense(self, numberOfSecurities: int) -> numpy.ndarray:
+        '''
+        Expands the positions to a dense array of weights over the security universe.
+        '''
+        weights = numpy.zeros(numberOfSecurities)
+        weights[self.LongIndices] = self.LongWeights
+        weights[self.ShortIndices] = self.ShortWeights
+        return weights
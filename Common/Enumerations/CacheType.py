@@ -7,3 +7,4 @@ class CacheType(Enum):
     Csv = auto()
     Sql = auto()
     Bloomberg = auto()
+    Panel = auto()
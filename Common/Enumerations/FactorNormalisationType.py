@@ -0,0 +1,9 @@
+from enum import Enum, auto
+
+# Enumeration for cross-sectional factor normalisation
+
+
+class FactorNormalisationType(Enum):
+    Raw = auto()
+    ZScore = auto()
+    Rank = auto()
@@ -0,0 +1,10 @@
+from enum import Enum, auto
+
+# Enumeration for portfolio rebalance schedules
+
+
+class RebalanceFrequency(Enum):
+    EveryNBars = auto()
+    Weekly = auto()
+    Monthly = auto()
+    Dates = auto()
@@ -0,0 +1,54 @@
+import numpy
+import pandas
+
+from Common.Enumerations.FactorNormalisationType import FactorNormalisationType
+from FactorPipeline.FactorNormalisation import FactorNormalisation
+from FactorPipeline.IDerivedFactor import IDerivedFactor
+
+
+class CompositeFactor(IDerivedFactor):
+    '''
+    A weighted combination of several factors, which may be FactorNames or other derived factors. Each factor
+    panel is optionally winsorised, then normalised cross-sectionally, and the normalised panels are combined
+    with the given weights. Where a security is missing some of the factors on a date, the available factors
+    are combined with their weights rescaled.
+
+    A composite factor can be passed to the backtesting engine wherever a FactorName is expected.
+    '''
+
+    def __init__(self, factorWeights: dict, normalisationType=FactorNormalisationType.ZScore,
+                 winsorisationQuantiles: tuple = None):
+        if len(factorWeights) == 0:
+            raise ValueError("A composite factor requires at least one factor.")
+        self.FactorWeights = dict(factorWeights)
+        self.NormalisationType = normalisationType
+        self.WinsorisationQuantiles = winsorisationQuantiles
+
+    def __repr__(self) -> str:
+        weightsStr = ",".join(f"{getattr(factorName, 'name', factorName)}={weight!r}"
+                              for (factorName, weight) in self.FactorWeights.items())
+        return f"CompositeFactor({weightsStr},{self.NormalisationType.name},{self.WinsorisationQuantiles})"
+
+    def CalculateFactorData(self, dataDict: dict) -> pandas.DataFrame:
+        '''
+        Calculates the composite factor panel from the dictionary of data panels loaded by the DataProvider.
+        '''
+
+        weightedTotal = None
+        weightTotal = None
+        for (factorName, weight) in self.FactorWeights.items():
+            factorDataDF = IDerivedFactor.GetFactorData(factorName, dataDict)
+            if self.WinsorisationQuantiles is not None:
+                factorDataDF = FactorNormalisation.Winsorise(factorDataDF, *self.WinsorisationQuantiles)
+            factorValues = FactorNormalisation.Normalise(factorDataDF, self.NormalisationType).values
+            isValid = ~numpy.isnan(factorValues)
+            if weightedTotal is None:
+                index, columns = factorDataDF.index, factorDataDF.columns
+                weightedTotal = numpy.zeros(factorValues.shape)
+                weightTotal = numpy.zeros(factorValues.shape)
+            weightedTotal += weight * numpy.where(isValid, factorValues, 0.0)
+            weightTotal += abs(weight) * isValid
+
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            compositeValues = numpy.where(weightTotal > 0.0, weightedTotal / weightTotal, numpy.nan)
+        return pandas.DataFrame(compositeValues, index=index, columns=columns)
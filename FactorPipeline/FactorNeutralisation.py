@@ -0,0 +1,78 @@
+import numpy
+import pandas
+
+
+class FactorNeutralisation(object):
+    '''
+    Neutralises a factor panel against a set of exposure panels (e.g. market beta or size) by regressing the
+    factor on the exposures cross-sectionally on every date and keeping the residuals.
+
+    The regressions for all the dates are solved together: the normal equations are built for every date
+    with a single tensor contraction, and solved with one batched pseudo-inverse. Securities with a missing
+    factor value or exposure on a date are masked out of that date's regression and have a missing residual.
+    '''
+
+    @staticmethod
+    def CalculateRegressionCoefficients(factorDataDF: pandas.DataFrame, exposureDFs: list,
+                                        addIntercept=True) -> pandas.DataFrame:
+        '''
+        Returns the dates x exposures data frame of the per-date least squares coefficients. The intercept,
+        if added, is the first column. Dates with no more valid securities than coefficients have missing
+        coefficients.
+        '''
+
+        coefficients, *_ = FactorNeutralisation.__SolveRegressions(factorDataDF, exposureDFs, addIntercept)
+
+        columns = (["Intercept"] if addIntercept else []) + list(range(len(exposureDFs)))
+        return pandas.DataFrame(coefficients, index=factorDataDF.index, columns=columns)
+
+    @staticmethod
+    def NeutraliseFactor(factorDataDF: pandas.DataFrame, exposureDFs: list, addIntercept=True) -> pandas.DataFrame:
+        '''
+        Returns the residual factor panel after removing the per-date linear exposure to each of the exposure
+        panels. The residuals are indexed like the factor panel and can be passed directly to
+        LongBestShortWorst.GenerateTradingSignals.
+        '''
+
+        coefficients, factorValues, exposureValues, isValid = FactorNeutralisation.__SolveRegressions(
+            factorDataDF, exposureDFs, addIntercept)
+
+        residuals = factorValues - numpy.einsum('tnk,tk->tn', exposureValues, coefficients)
+        residuals[~isValid] = numpy.nan
+        return pandas.DataFrame(residuals, index=factorDataDF.index, columns=factorDataDF.columns)
+
+    @staticmethod
+    def __SolveRegressions(factorDataDF: pandas.DataFrame, exposureDFs: list, addIntercept: bool) -> tuple:
+        factorValues, exposureValues, isValid = FactorNeutralisation.__PrepareRegressions(
+            factorDataDF, exposureDFs, addIntercept)
+
+        # Solve the normal equations for every date at once
+        maskedExposures = numpy.where(isValid[:, :, numpy.newaxis], exposureValues, 0.0)
+        maskedFactor = numpy.where(isValid, factorValues, 0.0)
+        exposureProducts = numpy.einsum('tnk,tnl->tkl', maskedExposures, maskedExposures)
+        exposureFactorProducts = numpy.einsum('tnk,tn->tk', maskedExposures, maskedFactor)
+        coefficients = numpy.einsum(
+            'tkl,tl->tk', numpy.linalg.pinv(exposureProducts, hermitian=True), exposureFactorProducts)
+
+        numberOfCoefficients = exposureValues.shape[2]
+        coefficients[isValid.sum(axis=1) <= numberOfCoefficients] = numpy.nan
+
+        return coefficients, factorValues, exposureValues, isValid
+
+    @staticmethod
+    def __PrepareRegressions(factorDataDF: pandas.DataFrame, exposureDFs: list, addIntercept: bool) -> tuple:
+        # Stacks the exposures into a dates x securities x exposures array, aligned with the factor panel,
+        # and marks the securities that can enter each date's regression.
+
+        if len(exposureDFs) == 0 and not addIntercept:
+            raise ValueError("At least one exposure or the intercept is required to neutralise a factor.")
+
+        factorValues = factorDataDF.values.astype(numpy.float64)
+        exposures = [exposureDF.reindex(index=factorDataDF.index, columns=factorDataDF.columns).values
+                     for exposureDF in exposureDFs]
+        if addIntercept:
+            exposures.insert(0, numpy.ones(factorValues.shape))
+        exposureValues = numpy.stack(exposures, axis=2).astype(numpy.float64)
+
+        isValid = ~numpy.isnan(factorValues) & ~numpy.isnan(exposureValues).any(axis=2)
+        return factorValues, exposureValues, isValid
@@ -0,0 +1,65 @@
+import numpy
+import pandas
+
+from Common.Enumerations.FactorNormalisationType import FactorNormalisationType
+
+
+class FactorNormalisation(object):
+    '''
+    Cross-sectional transformations of factor panels. Each panel is a dates x securities data frame, and
+    every transformation is applied to each date (row) independently, for the whole panel at once. Missing
+    (NaN) factor values are ignored and stay missing.
+    '''
+
+    @staticmethod
+    def ZScore(factorDataDF: pandas.DataFrame) -> pandas.DataFrame:
+        '''
+        Subtracts the cross-sectional mean and divides by the cross-sectional standard deviation on each date.
+        '''
+        factorValues = factorDataDF.values.astype(numpy.float64)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            zScores = (factorValues - numpy.nanmean(factorValues, axis=1, keepdims=True)) / \
+                numpy.nanstd(factorValues, axis=1, ddof=1, keepdims=True)
+        return pandas.DataFrame(zScores, index=factorDataDF.index, columns=factorDataDF.columns)
+
+    @staticmethod
+    def RankNormalise(factorDataDF: pandas.DataFrame) -> pandas.DataFrame:
+        '''
+        Replaces the factor values by their cross-sectional ranks, scaled to be uniformly spread between -0.5
+        and 0.5 on each date. Tied values share their average rank.
+        '''
+        ranks = factorDataDF.rank(axis=1, method='average').values
+        counts = factorDataDF.count(axis=1).values[:, numpy.newaxis]
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            normalisedRanks = (ranks - 0.5) / counts - 0.5
+        return pandas.DataFrame(normalisedRanks, index=factorDataDF.index, columns=factorDataDF.columns)
+
+    @staticmethod
+    def Winsorise(factorDataDF: pandas.DataFrame, lowerQuantile=0.01, upperQuantile=0.99) -> pandas.DataFrame:
+        '''
+        Clips the factor values on each date to the given cross-sectional quantiles.
+        '''
+
+        # Input validation
+        # ================
+
+        if not 0.0 <= lowerQuantile < upperQuantile <= 1.0:
+            raise ValueError(
+                f"The quantiles must satisfy 0.0 <= lower < upper <= 1.0. The values provided were " +
+                f"{lowerQuantile} and {upperQuantile}.")
+
+        factorValues = factorDataDF.values.astype(numpy.float64)
+        bounds = numpy.nanquantile(factorValues, [lowerQuantile, upperQuantile], axis=1, keepdims=True)
+        winsorisedValues = numpy.clip(factorValues, bounds[0], bounds[1])
+        return pandas.DataFrame(winsorisedValues, index=factorDataDF.index, columns=factorDataDF.columns)
+
+    @staticmethod
+    def Normalise(factorDataDF: pandas.DataFrame, normalisationType: FactorNormalisationType) -> pandas.DataFrame:
+        if normalisationType == FactorNormalisationType.Raw:
+            return factorDataDF
+        elif normalisationType == FactorNormalisationType.ZScore:
+            return FactorNormalisation.ZScore(factorDataDF)
+        elif normalisationType == FactorNormalisationType.Rank:
+            return FactorNormalisation.RankNormalise(factorDataDF)
+        else:
+            raise NotImplementedError("The requested factor normalisation has not been implemented.")
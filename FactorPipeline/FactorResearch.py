@@ -0,0 +1,116 @@
+import numpy
+import pandas
+
+from numpy.lib.stride_tricks import sliding_window_view
+
+from Common.Enumerations.ReturnType import ReturnType
+from FactorPipeline.IDerivedFactor import IDerivedFactor
+
+
+class FactorResearch(object):
+    '''
+    Factor research analytics computed over the whole panel, so that factors can be compared without running
+    full backtests. All the statistics are cross-sectional rank (Spearman) correlations, calculated for every
+    date at once.
+
+    The returns follow the conventions of the backtesting engine: the return on row t is earned by a
+    portfolio formed on the factor values of row t.
+    '''
+
+    @staticmethod
+    def CalculateForwardReturns(returnsDF: pandas.DataFrame, horizon: int) -> pandas.DataFrame:
+        '''
+        Compounds the returns over the horizon starting at each date. The last horizon - 1 dates, and any
+        window with a missing return, are missing.
+        '''
+
+        if horizon < 1:
+            raise ValueError(f"The horizon must be at least 1. The value provided was {horizon}.")
+
+        returnValues = returnsDF.values.astype(numpy.float64)
+        forwardReturns = numpy.full(returnValues.shape, numpy.nan)
+        if horizon <= returnValues.shape[0]:
+            windows = sliding_window_view(1.0 + returnValues, horizon, axis=0)
+            forwardReturns[:returnValues.shape[0] - horizon + 1] = windows.prod(axis=-1) - 1.0
+        return pandas.DataFrame(forwardReturns, index=returnsDF.index, columns=returnsDF.columns)
+
+    @staticmethod
+    def CalculateRankCorrelation(aDF: pandas.DataFrame, bDF: pandas.DataFrame) -> pandas.Series:
+        '''
+        Returns the cross-sectional rank correlation between two panels for every date. Only the securities
+        with a value in both panels on a date are ranked.
+        '''
+
+        aValues = aDF.values.astype(numpy.float64)
+        bValues = bDF.reindex(index=aDF.index, columns=aDF.columns).values.astype(numpy.float64)
+        isValid = ~numpy.isnan(aValues) & ~numpy.isnan(bValues)
+
+        aRanks = pandas.DataFrame(numpy.where(isValid, aValues, numpy.nan)).rank(axis=1).values
+        bRanks = pandas.DataFrame(numpy.where(isValid, bValues, numpy.nan)).rank(axis=1).values
+
+        counts = isValid.sum(axis=1, keepdims=True)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            aDeviations = aRanks - numpy.nansum(aRanks, axis=1, keepdims=True) / counts
+            bDeviations = bRanks - numpy.nansum(bRanks, axis=1, keepdims=True) / counts
+            correlations = numpy.nansum(aDeviations * bDeviations, axis=1) / numpy.sqrt(
+                numpy.nansum(aDeviations ** 2, axis=1) * numpy.nansum(bDeviations ** 2, axis=1))
+        correlations[counts[:, 0] < 2] = numpy.nan
+        return pandas.Series(correlations, index=aDF.index)
+
+    @staticmethod
+    def CalculateInformationCoefficients(dataDict: dict, factorNames: list, horizons: list,
+                                         returnType=ReturnType.Mixed) -> pandas.DataFrame:
+        '''
+        Returns the per-date rank information coefficient of each factor against the forward returns at each
+        horizon, as a dates x (factor, horizon) data frame. The forward returns for each horizon are computed
+        once and shared between the factors.
+        '''
+
+        returnsDF = dataDict[returnType]
+        forwardReturnsDFs = {x: FactorResearch.CalculateForwardReturns(returnsDF, x) for x in horizons}
+
+        informationCoefficients = {}
+        for factorName in factorNames:
+            factorDataDF = IDerivedFactor.GetFactorData(factorName, dataDict)
+            for horizon in horizons:
+                informationCoefficients[(factorName, horizon)] = FactorResearch.CalculateRankCorrelation(
+                    factorDataDF, forwardReturnsDFs[horizon])
+
+        informationCoefficientsDF = pandas.DataFrame(informationCoefficients, index=returnsDF.index)
+        informationCoefficientsDF.columns.names = ["Factor", "Horizon"]
+        return informationCoefficientsDF
+
+    @staticmethod
+    def CalculateRankAutocorrelation(dataDict: dict, factorNames: list, lags=(1,)) -> pandas.DataFrame:
+        '''
+        Returns the per-date rank correlation of each factor with its own values the given number of dates
+        earlier, as a dates x (factor, lag) data frame. A low autocorrelation means a high portfolio turnover.
+        '''
+
+        autocorrelations = {}
+        for factorName in factorNames:
+            factorDataDF = IDerivedFactor.GetFactorData(factorName, dataDict)
+            for lag in lags:
+                autocorrelations[(factorName, lag)] = FactorResearch.CalculateRankCorrelation(
+                    factorDataDF, factorDataDF.shift(lag))
+
+        autocorrelationsDF = pandas.DataFrame(autocorrelations)
+        autocorrelationsDF.columns.names = ["Factor", "Lag"]
+        return autocorrelationsDF
+
+    @staticmethod
+    def SummariseInformationCoefficients(informationCoefficientsDF: pandas.DataFrame) -> pandas.DataFrame:
+        '''
+        Returns the mean, standard deviation, information ratio, t-statistic and hit rate of each column of
+        information coefficients.
+        '''
+
+        meanInformationCoefficients = informationCoefficientsDF.mean(axis=0)
+        standardDeviations = informationCoefficientsDF.std(axis=0)
+        counts = informationCoefficientsDF.count(axis=0)
+        return pandas.DataFrame({
+            "MeanIC": meanInformationCoefficients,
+            "StandardDeviation": standardDeviations,
+            "InformationRatio": meanInformationCoefficients / standardDeviations,
+            "TStatistic": meanInformationCoefficients / standardDeviations * numpy.sqrt(counts),
+            "HitRate": (informationCoefficientsDF > 0.0).sum(axis=0) / counts})
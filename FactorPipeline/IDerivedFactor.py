@@ -0,0 +1,29 @@
+import pandas
+
+from abc import ABCMeta, abstractmethod
+
+
+class IDerivedFactor(object):
+    '''
+    An abstract base class representing a factor that is calculated from the data panels loaded by the 
+    DataProvider, rather than read from them directly. Derived factors can be passed to the backtesting 
+    engine wherever a FactorName is expected.
+    '''
+
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def CalculateFactorData(self, dataDict: dict) -> pandas.DataFrame:
+        '''
+        Calculates the dates x securities factor panel from the dictionary of data panels.
+        '''
+        raise NotImplementedError("Should implement CalculateFactorData()!")
+
+    @staticmethod
+    def GetFactorData(factorName, dataDict: dict) -> pandas.DataFrame:
+        '''
+        Returns the factor panel for a FactorName, or calculates it for a derived factor.
+        '''
+        if isinstance(factorName, IDerivedFactor):
+            return factorName.CalculateFactorData(dataDict)
+        return dataDict[factorName]
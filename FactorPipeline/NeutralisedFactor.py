@@ -0,0 +1,26 @@
+import pandas
+
+from FactorPipeline.FactorNeutralisation import FactorNeutralisation
+from FactorPipeline.IDerivedFactor import IDerivedFactor
+
+
+class NeutralisedFactor(IDerivedFactor):
+    '''
+    A factor neutralised against the exposure factors, for use in the backtesting engine wherever a FactorName
+    is expected. The factor and the exposures may be FactorNames or other derived factors.
+    '''
+
+    def __init__(self, factorName, exposureFactorNames: list, addIntercept=True):
+        self.FactorName = factorName
+        self.ExposureFactorNames = list(exposureFactorNames)
+        self.AddIntercept = addIntercept
+
+    def __repr__(self) -> str:
+        exposuresStr = ",".join(str(getattr(x, 'name', x)) for x in self.ExposureFactorNames)
+        return (f"NeutralisedFactor({getattr(self.FactorName, 'name', self.FactorName)}," +
+                f"[{exposuresStr}],{self.AddIntercept})")
+
+    def CalculateFactorData(self, dataDict: dict) -> pandas.DataFrame:
+        factorDataDF = IDerivedFactor.GetFactorData(self.FactorName, dataDict)
+        exposureDFs = [IDerivedFactor.GetFactorData(x, dataDict) for x in self.ExposureFactorNames]
+        return FactorNeutralisation.NeutraliseFactor(factorDataDF, exposureDFs, self.AddIntercept)
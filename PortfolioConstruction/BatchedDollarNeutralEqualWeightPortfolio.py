@@ -0,0 +1,131 @@
+import numpy
+
+from PortfolioConstruction.IPortfolio import IPortfolio
+from Common.DataStructures.PortfolioPerformance import PortfolioPerformance
+
+
+class BatchedDollarNeutralEqualWeightPortfolio(IPortfolio):
+    '''
+    This class implements DollarNeutralEqualWeightPortfolio for many strategy variants at once. The weights
+    are held as a variants x securities matrix, and the rebalance and the returns for every variant are
+    computed with one set of array operations per date. Each row behaves exactly like a single
+    DollarNeutralEqualWeightPortfolio.
+    '''
+
+    def __init__(self, previousPortfolioWeights: numpy.ndarray, currentPortfolioSignals: numpy.ndarray):
+        self.TurnoverRatios = numpy.zeros(0)
+        self.AbsoluteTotalWeights = numpy.zeros(0)
+        self.PortfolioWeights = numpy.zeros((0, 0))
+        self.AbsoluteChangeInPortfolioWeights = numpy.zeros(0)
+        self.PortfolioValues = numpy.zeros(0)
+        self.RebalancePortfolio(previousPortfolioWeights, currentPortfolioSignals)
+
+    def CalculatePortfolioReturns(self, returns: numpy.ndarray, executionCostRates=0.0) -> [PortfolioPerformance]:
+        '''
+        Given a row of security returns, calculate the portfolio returns for every variant. The execution
+        cost rates may be a scalar or one value per variant. Returns one PortfolioPerformance per variant.
+        '''
+
+        longPortfolioReturns, shortPortfolioReturns, portfolioReturns = self.CalculatePortfolioReturnArrays(
+            returns, executionCostRates)
+        return [PortfolioPerformance(
+            longShortPortfolioReturn=portfolioReturn,
+            longPortfolioReturn=longPortfolioReturn,
+            shortPortfolioReturn=shortPortfolioReturn,
+            longShortTurnoverRatio=turnoverRatio)
+            for (longPortfolioReturn, shortPortfolioReturn, portfolioReturn, turnoverRatio) in zip(
+                longPortfolioReturns, shortPortfolioReturns, portfolioReturns, self.TurnoverRatios)]
+
+    def CalculatePortfolioReturnArrays(self, returns: numpy.ndarray, executionCostRates=0.0) -> tuple:
+        '''
+        As CalculatePortfolioReturns, but returns the long, short and long-short returns as arrays with one
+        value per variant. See DollarNeutralEqualWeightPortfolio for the return definitions.
+        '''
+
+        # Input validation
+        # ================
+
+        executionCostRates = numpy.asarray(executionCostRates, dtype=numpy.float64)
+        if numpy.any(executionCostRates < 0.0):
+            raise ValueError(f"The execution cost rate must be greater than or equal to zero.")
+
+        returns = numpy.asarray(returns, dtype=numpy.float64).reshape(-1)
+        if returns.shape[0] != self.PortfolioWeights.shape[1]:
+            raise ValueError(f"The securities in the provided returns do not match those in the portfolio.")
+
+        # Returns calculation
+        # ===================
+
+        # The returns of an empty book are missing, as for DollarNeutralEqualWeightPortfolio.
+
+        growth = 1.0 + returns
+
+        longPortfolioWeights = numpy.where(self.PortfolioWeights > 0.0, self.PortfolioWeights, 0.0)
+        longPortfolioValue_T1 = longPortfolioWeights.sum(axis=1)
+        longPortfolioValue_T2 = numpy.nansum(longPortfolioWeights * growth, axis=1)
+        # due to dollar neutral assumption
+        longPortfolioExecutionCosts = 0.5 * self.AbsoluteChangeInPortfolioWeights * executionCostRates
+        longPortfolioProfit = (longPortfolioValue_T2 - longPortfolioValue_T1) - longPortfolioExecutionCosts
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            longPortfolioReturns = numpy.where(
+                longPortfolioValue_T1 != 0.0, longPortfolioProfit / longPortfolioValue_T1, numpy.nan)
+
+        shortPortfolioWeights = numpy.where(self.PortfolioWeights < 0.0, self.PortfolioWeights, 0.0)
+        shortPortfolioValue_T1 = shortPortfolioWeights.sum(axis=1)
+        shortPortfolioValue_T2 = numpy.nansum(shortPortfolioWeights * growth, axis=1)
+        shortPortfolioExecutionCosts = longPortfolioExecutionCosts  # due to dollar neutral assumption
+        shortPortfolioProfit = shortPortfolioValue_T2 - shortPortfolioValue_T1 - shortPortfolioExecutionCosts
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            shortPortfolioReturns = numpy.where(
+                shortPortfolioValue_T1 != 0.0, shortPortfolioProfit / (-1.0 * shortPortfolioValue_T1), numpy.nan)
+
+            portfolioReturns = numpy.where(
+                longPortfolioValue_T1 != 0.0,
+                (longPortfolioValue_T2 - longPortfolioExecutionCosts + shortPortfolioProfit) / longPortfolioValue_T1
+                - 1.0, numpy.nan)
+
+        return longPortfolioReturns, shortPortfolioReturns, portfolioReturns
+
+    def RebalancePortfolio(self, previousPortfolioWeights: numpy.ndarray, currentPortfolioSignals: numpy.ndarray):
+        '''
+        Given the previous variants x securities weights and the matching matrix of new signals, rebalance
+        the portfolio of every variant.
+        '''
+
+        previousPortfolioWeights = numpy.asarray(previousPortfolioWeights, dtype=numpy.float64)
+        currentPortfolioSignals = numpy.asarray(currentPortfolioSignals, dtype=numpy.float64)
+        if previousPortfolioWeights.shape != currentPortfolioSignals.shape:
+            raise ValueError(
+                "The previous portfolio weights and current porfolio signals do not have the same shape.")
+
+        # Rebalance the portfolios
+        # ========================
+
+        currentLongSignalsCount = numpy.count_nonzero(currentPortfolioSignals > 0.0, axis=1)
+        currentShortSignalsCount = numpy.count_nonzero(currentPortfolioSignals < 0.0, axis=1)
+
+        previousAbsoluteTotalWeights = numpy.nansum(numpy.abs(previousPortfolioWeights), axis=1)
+        # variants without holdings are on their first portfolio
+        previousAbsoluteTotalWeights[previousAbsoluteTotalWeights == 0.0] = 2.0
+
+        self.AbsoluteTotalWeights = previousAbsoluteTotalWeights
+
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            currentLongSignalsMultipliers = (
+                (self.AbsoluteTotalWeights / 2.0) / numpy.maximum(currentLongSignalsCount, 1))
+            currentShortSignalsMultipliers = (
+                (self.AbsoluteTotalWeights / 2.0) / numpy.maximum(currentShortSignalsCount, 1))
+
+            self.PortfolioWeights = numpy.where(
+                currentPortfolioSignals == 1.0,
+                currentPortfolioSignals * currentLongSignalsMultipliers[:, numpy.newaxis],
+                currentPortfolioSignals * currentShortSignalsMultipliers[:, numpy.newaxis])
+
+        self.PortfolioValues = numpy.nansum(self.PortfolioWeights, axis=1)
+
+        # Calculate the turnover
+        # ======================
+
+        self.AbsoluteChangeInPortfolioWeights = numpy.nansum(
+            numpy.abs(self.PortfolioWeights - previousPortfolioWeights), axis=1)
+        self.TurnoverRatios = self.AbsoluteChangeInPortfolioWeights / previousAbsoluteTotalWeights
@@ -9,17 +9,37 @@ class DollarNeutralEqualWeightPortfolio(IPortfolio):
     '''
     This class implements a dollar netural portfolio given a set of long/short signals from a trading 
     strategy. The securities are held in equal weighting.
+
+    The weights are held internally as NumPy arrays. The inputs may be single row data frames or one 
+    dimensional arrays, and the data frame attributes are only built when they are accessed.
     '''
 
     def __init__(self, previousPortfolioWeights: pandas.DataFrame, currentPortfolioSignals: pandas.DataFrame):
         self.TurnoverRatio = 0.0
         self.AbsoluteTotalWeight = 0.0
-        self.PortfolioWeightsDF = pandas.DataFrame()
-        self.ChangeInPortfolioWeightsDF = pandas.DataFrame()
+        self.PortfolioWeights = numpy.zeros(0)
+        self.ChangeInPortfolioWeights = numpy.zeros(0)
         self.AbsoluteChangeInPortfolioWeights = 0.0
         self.PortfolioValue = 0.0
+        self.__PortfolioIndex = None
+        self.__PortfolioColumns = None
         self.RebalancePortfolio(previousPortfolioWeights, currentPortfolioSignals)
 
+    @property
+    def PortfolioWeightsDF(self) -> pandas.DataFrame:
+        '''
+        The portfolio weights as a single row data frame, labelled like the signals.
+        '''
+        return pandas.DataFrame(
+            self.PortfolioWeights[numpy.newaxis, :], index=self.__PortfolioIndex, columns=self.__PortfolioColumns)
+
+    @property
+    def ChangeInPortfolioWeightsDF(self) -> pandas.DataFrame:
+        '''
+        The change in the portfolio weights from the rebalance as a single row data frame.
+        '''
+        return pandas.DataFrame(self.ChangeInPortfolioWeights[numpy.newaxis, :])
+
     def CalculatePortfolioReturns(
             self, returnsDF: pandas.DataFrame, executionCostRate=0.0) -> PortfolioPerformance:
         '''
@@ -29,7 +49,8 @@ class DollarNeutralEqualWeightPortfolio(IPortfolio):
         strategy is assigned captial at the start of the backtest, with no further capital in flows or 
         outflows. The execution costs are seperate from these.
 
-        executionCostRate is expected as a number between 0.0 and 1.0.
+        executionCostRate is expected as a number between 0.0 and 1.0. The returns may be a single row data 
+        frame or a one dimensional array ordered like the portfolio weights.
         '''
 
         # Input validation
@@ -38,24 +59,20 @@ class DollarNeutralEqualWeightPortfolio(IPortfolio):
         if executionCostRate < 0.0:
             raise ValueError(f"The execution cost rate must be greater than or equal to zero.")
 
-        if numpy.array_equal(self.PortfolioWeightsDF.columns, returnsDF.columns) == False:
-            raise ValueError(f"The securities in the provided returns do not match those in the portfolio.")
-
         # Returns calculation
         # ===================
 
+        longPortfolioValue_T1, longPortfolioValue_T2, shortPortfolioValue_T1, shortPortfolioValue_T2 = \
+            self.CalculatePortfolioValues(returnsDF)
+
         # Long portfolio return : traditional return calculation of profit / initial portfolio value
         # ------------------------------------------------------------------------------------------
 
-        longPortfolioWeightsDF = self.PortfolioWeightsDF.apply(
-            lambda y: y.item() if y.item() > 0.0 else 0.0, axis=0, result_type='expand')
-        longPortfolioValue_T1 = longPortfolioWeightsDF.dropna().values.sum()
-        longPortfolioReturnsDF = longPortfolioWeightsDF * (1.0 + returnsDF)
-        longPortfolioValue_T2 = numpy.nansum(longPortfolioReturnsDF.values)
         # due to dollar neutral assumption
         longPortfolioExecutionCosts = 0.5 * self.AbsoluteChangeInPortfolioWeights * executionCostRate
         longPortfolioProfit = (longPortfolioValue_T2 - longPortfolioValue_T1) - longPortfolioExecutionCosts
-        longPortfolioReturn = longPortfolioProfit / longPortfolioValue_T1
+        longPortfolioReturn = (longPortfolioProfit / longPortfolioValue_T1
+                               if longPortfolioValue_T1 != 0.0 else numpy.nan)
 
         # Short portfolio : traditional return calculation of profit / initial (ignoring borrowing costs)
         # -----------------------------------------------------------------------------------------------
@@ -63,15 +80,11 @@ class DollarNeutralEqualWeightPortfolio(IPortfolio):
         # For this return the short portfolio is treated like a long portfolio, with a -1 for the return.
         # This is appropriate because a short portfolio can be reversed to generate a long portfolio.
 
-        shortPortfolioWeightsDF = self.PortfolioWeightsDF.apply(
-            lambda y: y.item() if y.item() < 0.0 else 0.0, axis=0, result_type='expand')
-        shortPortfolioValue_T1 = shortPortfolioWeightsDF.dropna().values.sum()
-        shortPortfolioReturnsDF = shortPortfolioWeightsDF * (1.0 + returnsDF)
-        shortPortfolioValue_T2 = numpy.nansum(shortPortfolioReturnsDF.values)
         shortPortfolioExecutionCosts = longPortfolioExecutionCosts  # due to dollar neutral assumption
         # the short position values will be negative!
         shortPortfolioProfit = shortPortfolioValue_T2 - shortPortfolioValue_T1 - shortPortfolioExecutionCosts
-        shortPortfolioReturn = shortPortfolioProfit / (-1.0 * shortPortfolioValue_T1)
+        shortPortfolioReturn = (shortPortfolioProfit / (-1.0 * shortPortfolioValue_T1)
+                                if shortPortfolioValue_T1 != 0.0 else numpy.nan)
 
         # Combined portfolio
         # ------------------
@@ -90,8 +103,9 @@ class DollarNeutralEqualWeightPortfolio(IPortfolio):
         # at that time, less transaction costs. Whereas, the account value of the short portfolio is the
         # portfolio value, less the inital short position loan, less transaction costs.
 
-        portfolioReturn = (
+        portfolioReturn = ((
             longPortfolioValue_T2 - longPortfolioExecutionCosts + shortPortfolioProfit) / longPortfolioValue_T1 - 1.0
+            if longPortfolioValue_T1 != 0.0 else numpy.nan)
 
         # Construct output
         # ----------------
@@ -103,13 +117,51 @@ class DollarNeutralEqualWeightPortfolio(IPortfolio):
             longShortTurnoverRatio=self.TurnoverRatio)
         return output
 
+    def CalculatePortfolioValues(self, returnsDF: pandas.DataFrame) -> tuple:
+        '''
+        Given a set of security returns, calculate the values of the long and short books at the start and 
+        the end of the period, as (long T1, long T2, short T1, short T2). These values do not depend on the 
+        execution cost rate, which only enters the returns through the absolute change in weights.
+        '''
+
+        # Input validation
+        # ================
+
+        if isinstance(returnsDF, pandas.DataFrame):
+            if (self.__PortfolioColumns is not None and
+                    numpy.array_equal(self.__PortfolioColumns, returnsDF.columns) == False):
+                raise ValueError(f"The securities in the provided returns do not match those in the portfolio.")
+        returns = numpy.asarray(returnsDF, dtype=numpy.float64).reshape(-1)
+        if returns.shape != self.PortfolioWeights.shape:
+            raise ValueError(f"The securities in the provided returns do not match those in the portfolio.")
+
+        # Values calculation
+        # ==================
+
+        longPortfolioWeights = numpy.where(self.PortfolioWeights > 0.0, self.PortfolioWeights, 0.0)
+        longPortfolioValue_T1 = longPortfolioWeights.sum()
+        longPortfolioValue_T2 = numpy.nansum(longPortfolioWeights * (1.0 + returns))
+
+        # the short position values will be negative!
+        shortPortfolioWeights = numpy.where(self.PortfolioWeights < 0.0, self.PortfolioWeights, 0.0)
+        shortPortfolioValue_T1 = shortPortfolioWeights.sum()
+        shortPortfolioValue_T2 = numpy.nansum(shortPortfolioWeights * (1.0 + returns))
+
+        return longPortfolioValue_T1, longPortfolioValue_T2, shortPortfolioValue_T1, shortPortfolioValue_T2
+
     def RebalancePortfolio(self, previousPortfolioWeightsDF: pandas.DataFrame,
                            currentPortfolioSignalsDF: pandas.DataFrame):
         '''
         Given the previous portfolio weights and the set of new signals, rebalance the portfolio. Both of these 
-        inputs are assumed to be a single row.
+        inputs are assumed to be a single row, given either as data frames or as one dimensional arrays.
         '''
 
+        if isinstance(currentPortfolioSignalsDF, pandas.DataFrame):
+            self.__PortfolioIndex = currentPortfolioSignalsDF.index
+            self.__PortfolioColumns = currentPortfolioSignalsDF.columns
+        previousPortfolioWeights = numpy.asarray(previousPortfolioWeightsDF, dtype=numpy.float64).reshape(-1)
+        currentPortfolioSignals = numpy.asarray(currentPortfolioSignalsDF, dtype=numpy.float64).reshape(-1)
+
         # Input validation
         # ================
 
@@ -128,12 +180,10 @@ class DollarNeutralEqualWeightPortfolio(IPortfolio):
         # strategy. Moreover, since this portfolio is dollar neutral, the absolute total weight for the long 
         # positions will be the same as the absolute total weight for the short positions.
 
-        currentLongSignalsCount = currentPortfolioSignalsDF.apply(
-            lambda y: 1.0 if y.item() > 0.0 else 0.0, axis=0).dropna().values.sum()
-        currentShortSignalsCount = currentPortfolioSignalsDF.apply(
-            lambda y: 1.0 if y.item() < 0.0 else 0.0, axis=0).dropna().values.sum()
+        currentLongSignalsCount = numpy.count_nonzero(currentPortfolioSignals > 0.0)
+        currentShortSignalsCount = numpy.count_nonzero(currentPortfolioSignals < 0.0)
 
-        previousAbsoluteTotalWeight = previousPortfolioWeightsDF.apply(lambda y: abs(y)).dropna().values.sum()
+        previousAbsoluteTotalWeight = numpy.nansum(numpy.abs(previousPortfolioWeights))
         if previousAbsoluteTotalWeight == 0.0:  # this is the first portfolio holding
             previousAbsoluteTotalWeight = 2.0
 
@@ -142,25 +192,29 @@ class DollarNeutralEqualWeightPortfolio(IPortfolio):
         currentLongAbsoluteTotalWeight = self.AbsoluteTotalWeight / 2.0
         currentShortAbsoluteTotalWeight = self.AbsoluteTotalWeight / 2.0
 
-        currentLongSignalsMultiplier = currentLongAbsoluteTotalWeight / currentLongSignalsCount
-        currentShortSignalsMultiplier = currentShortAbsoluteTotalWeight / currentShortSignalsCount
+        # An empty book holds nothing, so its weights are zero rather than undefined, and the securities sold
+        # out of it count towards the turnover. Its returns are missing, as it has no initial value.
+
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            currentLongSignalsMultiplier = (
+                numpy.float64(currentLongAbsoluteTotalWeight) / max(currentLongSignalsCount, 1))
+            currentShortSignalsMultiplier = (
+                numpy.float64(currentShortAbsoluteTotalWeight) / max(currentShortSignalsCount, 1))
 
-        # Compute the new weights for the securities
-        # Note that the weights are not rounded to account for the investment in whole securities. This is 
-        # because no price data has been provided. One could potentially assume that each security has a price
-        # of 1 cent, and round the weights accordingly.
+            # Compute the new weights for the securities
+            # Note that the weights are not rounded to account for the investment in whole securities. This is 
+            # because no price data has been provided. One could potentially assume that each security has a 
+            # price of 1 cent, and round the weights accordingly.
 
-        self.PortfolioWeightsDF = currentPortfolioSignalsDF.apply(
-            lambda y: y * currentLongSignalsMultiplier
-            if y.item() == 1.0 else y * currentShortSignalsMultiplier, result_type='expand')
+            self.PortfolioWeights = numpy.where(
+                currentPortfolioSignals == 1.0, currentPortfolioSignals * currentLongSignalsMultiplier,
+                currentPortfolioSignals * currentShortSignalsMultiplier)
 
-        self.PortfolioValue = self.PortfolioWeightsDF.apply(lambda y: y.item(), axis=0).dropna().values.sum()
+        self.PortfolioValue = numpy.nansum(self.PortfolioWeights)
 
         # Calculate the turnover
         # ======================
 
-        self.ChangeInPortfolioWeightsDF = pandas.DataFrame(
-            [x1 - x2 for(x1, x2) in zip(self.PortfolioWeightsDF.values, previousPortfolioWeightsDF.values)])
-        self.AbsoluteChangeInPortfolioWeights = self.ChangeInPortfolioWeightsDF.apply(
-            lambda y: abs(y.item())).dropna().values.sum()
+        self.ChangeInPortfolioWeights = self.PortfolioWeights - previousPortfolioWeights
+        self.AbsoluteChangeInPortfolioWeights = numpy.nansum(numpy.abs(self.ChangeInPortfolioWeights))
         self.TurnoverRatio = self.AbsoluteChangeInPortfolioWeights / previousAbsoluteTotalWeight
@@ -1,6 +1,7 @@
 import pandas
 
 from abc import ABCMeta, abstractmethod
+from Common.DataStructures.EquityCurve import EquityCurve
 from Common.DataStructures.PortfolioPerformance import PortfolioPerformance
 
 
@@ -30,11 +31,22 @@ class IPortfolio(object):
         '''
         raise NotImplementedError("Should implement RebalancePortfolio()!")
 
-    @abstractmethod
-    def BacktestPortfolio(self):
+    @staticmethod
+    def BacktestPortfolio(portfolioPerformance, initialEquity=1.0) -> EquityCurve:
         '''
-        Provides the logic to generate the trading orders and subsequent equity curve (i.e. growth of total 
-        equity), as a sum of holdings and cash, and the bar-period returns associated with this curve based on 
-        the 'positions' DataFrame. Produces a portfolio object that can be examined by other classes/functions.
+        Provides the logic to generate the equity curve (i.e. growth of total equity) of the long, short and 
+        long-short books from the bar-period returns of the portfolio, together with the running high-water 
+        marks and drawdowns. 
+
+        portfolioPerformance is either the dictionary of PortfolioPerformance by date returned by the 
+        backtesting engine, or an iterable of (date, PortfolioPerformance) pairs such as 
+        BacktestingEngine.IterateTradingStrategy. The results are consumed in a single streaming pass, in 
+        the order they are provided.
         '''
-        raise NotImplementedError("Should implement BacktestPortfolio()!")
+        if isinstance(portfolioPerformance, dict):
+            portfolioPerformance = portfolioPerformance.items()
+
+        equityCurve = EquityCurve(initialEquity)
+        for (date, performance) in portfolioPerformance:
+            equityCurve.Update(date, performance)
+        return equityCurve
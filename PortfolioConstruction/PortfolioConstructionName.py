@@ -3,4 +3,5 @@ from enum import Enum
 
 class PortfolioConstructionName(Enum):
     DollarNeutralEqualWeightPortfolio = 0
+    SparseDollarNeutralEqualWeightPortfolio = 1
     # add other portfolio rebalancing methods as they arise
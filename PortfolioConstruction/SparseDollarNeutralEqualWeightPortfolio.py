@@ -0,0 +1,124 @@
+import numpy
+
+from PortfolioConstruction.IPortfolio import IPortfolio
+from Common.DataStructures.PortfolioPerformance import PortfolioPerformance
+from Common.DataStructures.SparsePositions import SparsePositions
+
+
+class SparseDollarNeutralEqualWeightPortfolio(IPortfolio):
+    '''
+    This class implements the same dollar neutral, equal weight portfolio as
+    DollarNeutralEqualWeightPortfolio, but holds the long and short books as sparse positions. Rebalancing,
+    turnover and returns only touch the securities that are held, so the cost per date scales with the
+    number of positions rather than with the size of the security universe.
+    '''
+
+    def __init__(self, previousPortfolioPositions: SparsePositions, currentPortfolioSignals: SparsePositions):
+        self.TurnoverRatio = 0.0
+        self.AbsoluteTotalWeight = 0.0
+        self.PortfolioPositions = SparsePositions.Empty()
+        self.ChangeInPortfolioWeightsIndices = numpy.zeros(0, dtype=numpy.int64)
+        self.ChangeInPortfolioWeights = numpy.zeros(0)
+        self.AbsoluteChangeInPortfolioWeights = 0.0
+        self.PortfolioValue = 0.0
+        self.RebalancePortfolio(previousPortfolioPositions, currentPortfolioSignals)
+
+    def CalculatePortfolioReturns(self, returns: numpy.ndarray, executionCostRate=0.0) -> PortfolioPerformance:
+        '''
+        Given a dense row of security returns, calculate the portfolio returns. Only the returns of the held
+        securities are read. The return definitions match DollarNeutralEqualWeightPortfolio.
+
+        executionCostRate is expected as a number between 0.0 and 1.0.
+        '''
+
+        # Input validation
+        # ================
+
+        if executionCostRate < 0.0:
+            raise ValueError(f"The execution cost rate must be greater than or equal to zero.")
+
+        # Returns calculation
+        # ===================
+
+        returns = numpy.asarray(returns, dtype=numpy.float64).reshape(-1)
+        positions = self.PortfolioPositions
+
+        longPortfolioValue_T1 = positions.LongWeights.sum()
+        longPortfolioValue_T2 = numpy.nansum(positions.LongWeights * (1.0 + returns[positions.LongIndices]))
+        # due to dollar neutral assumption
+        longPortfolioExecutionCosts = 0.5 * self.AbsoluteChangeInPortfolioWeights * executionCostRate
+        longPortfolioProfit = (longPortfolioValue_T2 - longPortfolioValue_T1) - longPortfolioExecutionCosts
+        longPortfolioReturn = (longPortfolioProfit / longPortfolioValue_T1
+                               if longPortfolioValue_T1 != 0.0 else numpy.nan)
+
+        shortPortfolioValue_T1 = positions.ShortWeights.sum()
+        shortPortfolioValue_T2 = numpy.nansum(positions.ShortWeights * (1.0 + returns[positions.ShortIndices]))
+        shortPortfolioExecutionCosts = longPortfolioExecutionCosts  # due to dollar neutral assumption
+        # the short position values will be negative!
+        shortPortfolioProfit = shortPortfolioValue_T2 - shortPortfolioValue_T1 - shortPortfolioExecutionCosts
+        shortPortfolioReturn = (shortPortfolioProfit / (-1.0 * shortPortfolioValue_T1)
+                                if shortPortfolioValue_T1 != 0.0 else numpy.nan)
+
+        # See DollarNeutralEqualWeightPortfolio for the accounting style return of the combined portfolio.
+        portfolioReturn = ((
+            longPortfolioValue_T2 - longPortfolioExecutionCosts + shortPortfolioProfit) / longPortfolioValue_T1 - 1.0
+            if longPortfolioValue_T1 != 0.0 else numpy.nan)
+
+        # Construct output
+        # ----------------
+
+        output = PortfolioPerformance(
+            longShortPortfolioReturn=portfolioReturn,
+            longPortfolioReturn=longPortfolioReturn,
+            shortPortfolioReturn=shortPortfolioReturn,
+            longShortTurnoverRatio=self.TurnoverRatio)
+        return output
+
+    def RebalancePortfolio(self, previousPortfolioPositions: SparsePositions,
+                           currentPortfolioSignals: SparsePositions):
+        '''
+        Given the previous portfolio positions and the set of new signals, rebalance the portfolio.
+        '''
+
+        # Rebalance the portfolio
+        # =======================
+
+        # As for the dense portfolio, the absolute total weight is carried over from the previous portfolio
+        # and split equally between the long and the short books. An empty book holds nothing, and its
+        # returns are missing.
+
+        previousAbsoluteTotalWeight = previousPortfolioPositions.AbsoluteTotalWeight()
+        if previousAbsoluteTotalWeight == 0.0:  # this is the first portfolio holding
+            previousAbsoluteTotalWeight = 2.0
+
+        self.AbsoluteTotalWeight = previousAbsoluteTotalWeight
+
+        longIndices = currentPortfolioSignals.LongIndices
+        shortIndices = currentPortfolioSignals.ShortIndices
+        currentLongSignalsMultiplier = (self.AbsoluteTotalWeight / 2.0) / max(len(longIndices), 1)
+        currentShortSignalsMultiplier = (self.AbsoluteTotalWeight / 2.0) / max(len(shortIndices), 1)
+
+        self.PortfolioPositions = SparsePositions(
+            longIndices, numpy.full(len(longIndices), currentLongSignalsMultiplier),
+            shortIndices, numpy.full(len(shortIndices), -currentShortSignalsMultiplier))
+
+        positions = self.PortfolioPositions
+        self.PortfolioValue = positions.LongWeights.sum() + positions.ShortWeights.sum()
+
+        # Calculate the turnover
+        # ======================
+
+        # The change in weights is the difference of the two position sets. Positions are matched on their
+        # security index, and securities that are held in neither book do not appear.
+
+        changeIndices = numpy.concatenate((
+            positions.LongIndices, positions.ShortIndices,
+            previousPortfolioPositions.LongIndices, previousPortfolioPositions.ShortIndices))
+        changeWeights = numpy.concatenate((
+            positions.LongWeights, positions.ShortWeights,
+            -previousPortfolioPositions.LongWeights, -previousPortfolioPositions.ShortWeights))
+        self.ChangeInPortfolioWeightsIndices, inverse = numpy.unique(changeIndices, return_inverse=True)
+        self.ChangeInPortfolioWeights = numpy.bincount(
+            inverse, weights=changeWeights, minlength=len(self.ChangeInPortfolioWeightsIndices))
+        self.AbsoluteChangeInPortfolioWeights = numpy.abs(self.ChangeInPortfolioWeights).sum()
+        self.TurnoverRatio = self.AbsoluteChangeInPortfolioWeights / previousAbsoluteTotalWeight
@@ -2,7 +2,6 @@ import numpy
 import pandas
 
 from TradingStrategies.ITradingStrategy import ITradingStrategy
-from Common.Enumerations.FactorName import FactorName
 
 
 class LongBestShortWorst(ITradingStrategy):
@@ -35,49 +34,38 @@ class LongBestShortWorst(ITradingStrategy):
         # Generate the signals
         # ====================
 
-        signals = factorDataDF.apply(
-            lambda x: LongBestShortWorst.__GenerateSingleRowTradingSignal(x, percentile),
-            axis=1, result_type='expand')
-        return signals
+        # The signals for every row are produced at once. Note that for each row the number of the largest 
+        # and smallest securities invested will vary depending upon the number of securities with non null 
+        # factor values.
 
-    @staticmethod
-    def __GenerateSingleRowTradingSignal(row: pandas.DataFrame, percentile: float) -> list:
-        '''
-        For a single row of data, identify the largest x% and smallest y%.
-        Note that for each row the number of the largest and smallest securities invested will vary depending 
-        upon the number of securities with non null factor values.
-        '''
-
-        # Input validation
-        # ================
-
-        #numberOfRows = len(row.index)
-        # if numberOfRows != 1:
-        #    raise ValueError(f"This function requires a single row of data, rather than {numberOfRows} to be " + 
-        #                       f"passed as an input.")
+        factorValues = factorDataDF.values.astype(numpy.float64)
+        numberOfRows = factorValues.shape[0]
 
-        # Apply trading rule
-        # ==================
+        # Sort the factor values to determine the nth largest and smallest values. NaNs are sorted to the end 
+        # of each row.
 
-        # Sort the factor values to determine the nth largest and smallest values
-
-        sortedFactorValues = sorted(row.dropna().values)  # remove the NaNs from the sorted list
+        sortedFactorValues = numpy.sort(factorValues, axis=1)
 
         # Determine the number of securities which will be long.
 
-        nonNullSecutitiesCount = len(sortedFactorValues)
-        numberOfLongSecurities = int(nonNullSecutitiesCount * percentile)  # round down
-        if numberOfLongSecurities == 0:
+        nonNullSecutitiesCount = numpy.count_nonzero(~numpy.isnan(factorValues), axis=1)
+        numberOfLongSecurities = (nonNullSecutitiesCount * percentile).astype(numpy.int64)  # round down
+        if numpy.any(numberOfLongSecurities == 0):
             raise ValueError(
                 "The selected percentile is too low for the provided data. No trading signal will be generated.")
 
-        shortSecuritiesBound = sortedFactorValues[numberOfLongSecurities - 1]
-        longSecuritiesBound = sortedFactorValues[nonNullSecutitiesCount - numberOfLongSecurities]
+        rowIndices = numpy.arange(numberOfRows)
+        shortSecuritiesBound = sortedFactorValues[rowIndices, numberOfLongSecurities - 1][:, numpy.newaxis]
+        longSecuritiesBound = sortedFactorValues[
+            rowIndices, nonNullSecutitiesCount - numberOfLongSecurities][:, numpy.newaxis]
+
+        # Apply trading rule
+        # ==================
+
+        # NaN factor values fail both comparisons, so those securities are assigned 0.
 
         tolerance = 1e-15
-        signalBySecurity = row.apply(lambda y:
-                                     -1.0 if y < shortSecuritiesBound + tolerance else
-                                     1.0 if y > longSecuritiesBound - tolerance else
-                                     0.0)
+        signals = numpy.where(factorValues < shortSecuritiesBound + tolerance, -1.0,
+                              numpy.where(factorValues > longSecuritiesBound - tolerance, 1.0, 0.0))
 
-        return signalBySecurity
+        return pandas.DataFrame(signals, index=factorDataDF.index, columns=factorDataDF.columns)
@@ -0,0 +1,92 @@
+import os
+import threading
+import time
+
+
+def is_download_complete(file_path: str) -> bool:
+    """
+    Determines whether a browser download has finished. Chrome writes the data to a partial '.crdownload'
+    file and renames it once the download is complete, so the download is complete when the file exists and
+    its partial file does not.
+
+    Args:
+        file_path (str): The path of the downloaded file.
+
+    Returns:
+        bool: Returns True if the download is complete.
+    """
+    return os.path.isfile(file_path) and not os.path.exists(file_path + '.crdownload')
+
+
+def wait_for_download(file_path: str, timeout: float, poll_interval=0.1, use_notifications=True) -> str:
+    """
+    Waits for a browser download to finish. The download directory is watched for file system events with
+    watchdog if it is installed, so that the wait ends as soon as the file is finalised. Otherwise, or if
+    use_notifications is False, the directory is polled.
+
+    Args:
+        file_path (str): The path of the downloaded file.
+        timeout (float): The number of seconds after which to give up waiting.
+        poll_interval (float, optional): The number of seconds between checks when polling.
+        use_notifications (bool, optional): Whether to use file system notifications when available.
+
+    Raises:
+        TimeoutError: If the download has not completed within the timeout.
+
+    Returns:
+        str: The path of the downloaded file.
+    """
+    deadline = time.monotonic() + timeout
+    observer, file_system_changed = (None, None)
+    if use_notifications:
+        observer, file_system_changed = _start_observer(os.path.dirname(os.path.abspath(file_path)))
+
+    try:
+        while True:
+            if file_system_changed is not None:
+                file_system_changed.clear()
+            if is_download_complete(file_path):
+                return file_path
+
+            remaining_time = deadline - time.monotonic()
+            if remaining_time <= 0:
+                raise TimeoutError('The download of ' + os.path.basename(file_path) + ' did not complete within ' +
+                                   str(timeout) + ' seconds.')
+            if file_system_changed is None:
+                time.sleep(min(poll_interval, remaining_time))
+            else:
+                # the state is checked again at least once a second, in case an event is missed
+                file_system_changed.wait(min(1.0, remaining_time))
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+
+def _start_observer(directory: str):
+    """
+    Starts watching a directory for file system events.
+
+    Args:
+        directory (str): The directory to watch.
+
+    Returns:
+        tuple: The watchdog observer and an event that is set on every change in the directory, or
+            (None, None) if watchdog is not installed.
+    """
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None, None
+
+    file_system_changed = threading.Event()
+
+    class DownloadEventHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            file_system_changed.set()
+
+    observer = Observer()
+    observer.schedule(DownloadEventHandler(), directory, recursive=False)
+    observer.start()
+    return observer, file_system_changed
@@ -1,3 +1,5 @@
+from typing import Iterable, Iterator
+
 import pandas as pd
 import numpy as np
 
@@ -35,89 +37,143 @@ def equalise_columns(df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: the dataframe with equalised columns
     """
 
-    # Identify the rows with duplicates
-    # ---------------------------------
-
-    # Get the column names we want to shift. All but the DateTime key column.
+    # Get the column names we want to compare. All but the DateTime key column.
     colnames = df.columns.tolist()
     colnames.remove('DateTime')
 
-    # Shift the columns one row forward and one back.
-    kwargs_prev = {
-        colname + '_prev': df[colname].shift(1) for colname in colnames}
-    kwargs_next = {
-        colname + '_next': df[colname].shift(-1) for colname in colnames}
-    df = df.assign(**kwargs_prev, **kwargs_next)
-
-    # Check whether there is a duplicate in the forward or backward rows across the individual columns
-    kwargs_prev = {colname + '_prev_dup': df[colname]
-                   == df[colname + '_prev'] for colname in colnames}
-    kwargs_next = {colname + '_next_dup': df[colname]
-                   == df[colname + '_next'] for colname in colnames}
-    df = df.assign(**kwargs_prev, **kwargs_next)
-
-    # Check whether there is a duplicate in the forward or backward rows across any column.
-    kwargs_prev = {'has_prev_dup': df[kwargs_prev.keys()].any(axis='columns')}
-    kwargs_next = {'has_next_dup': df[kwargs_next.keys()].any(axis='columns')}
-    df = df.assign(**kwargs_prev, **kwargs_next)
+    # Identify the rows to remove, and remove the rows with duplicates or NAs
+    remove = _get_removal_mask(df, colnames)
+    colnames.insert(0, 'DateTime')
+    df = df.loc[~remove, colnames].reset_index(drop=True)
+    return df
+
+
+def equalise_columns_chunked(chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """
+    A streaming variant of equalise_columns, for data that is too large to clean in one dataframe, e.g. the
+    chunks of pd.read_csv(..., chunksize=...). The removal of a row depends on at most the two rows before
+    and the two rows after it, so each chunk is evaluated together with the last rows of the previous chunk,
+    and the last two rows of the chunk are only yielded once the next chunk has been read. At most four rows
+    are carried between chunks.
+
+    The concatenation of the yielded dataframes is identical to equalise_columns applied to the concatenation
+    of the chunks, including its index.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): the successive chunks of the dataframe whose columns we wish to
+            equalise, sorted by date.
+
+    Yields:
+        pd.DataFrame: the successive chunks of the dataframe with equalised columns. Chunks in which every
+            row is removed are not yielded.
+    """
+    colnames = None
+    buffer = None  # the rows carried over from the previous chunk
+    n_context = 0  # the number of rows at the start of the buffer that were already yielded or removed
+    n_yielded = 0  # the number of rows yielded so far, used to continue the index
+
+    def evaluate(window: pd.DataFrame, start: int, stop: int) -> pd.DataFrame:
+        remove = _get_removal_mask(window, colnames[1:])[start:stop]
+        df = window.iloc[start:stop].loc[~remove, colnames]
+        df.index = pd.RangeIndex(n_yielded, n_yielded + len(df))
+        return df
+
+    for chunk in chunks:
+        if colnames is None:
+            colnames = chunk.columns.tolist()
+            colnames.remove('DateTime')
+            colnames.insert(0, 'DateTime')
+            window = chunk.reset_index(drop=True)
+        else:
+            window = pd.concat([buffer, chunk], ignore_index=True)
+
+        # The rows followed by at least two rows in the window are final
+        stop = max(len(window) - 2, n_context)
+        if stop > n_context:
+            df = evaluate(window, n_context, stop)
+            if len(df) > 0:
+                n_yielded += len(df)
+                yield df
+
+        # Carry the undecided rows, and the two rows before them as context
+        start = max(stop - 2, 0)
+        buffer = window.iloc[start:]
+        n_context = stop - start
+
+    # The rows after the end of the data have no NAs or duplicates
+    if buffer is not None and len(buffer) > n_context:
+        df = evaluate(buffer, n_context, len(buffer))
+        if len(df) > 0:
+            yield df
+
+
+def _get_removal_mask(df: pd.DataFrame, colnames: [str]) -> np.ndarray:
+    """
+    Evaluates the removal rules of equalise_columns for every row, as boolean masks over the columns.
+
+    Args:
+        df (pd.DataFrame): the dataframe whose columns we wish to equalise.
+        colnames ([str]): the names of the columns to compare.
+
+    Returns:
+        np.ndarray: a boolean array which is True for the rows to remove.
+    """
+    n = len(df)
+
+    # Identify the rows with duplicates and NAs
+    # -----------------------------------------
+
+    # Each column is compared on its own, so that columns of different types are not upcast to a common
+    # type. has_prev_dup[i] is True if row i has a value equal to the one of row i - 1 in any column.
+    has_na = np.zeros(n, dtype=bool)
+    has_prev_dup = np.zeros(n, dtype=bool)
+    for colname in colnames:
+        values = df[colname].to_numpy()
+        is_na = pd.isna(values)
+        if values.dtype == object and is_na.any():
+            # Missing values, e.g. pd.NA, are never equal to their neighbours, and cannot be compared
+            values = values.copy()
+            values[is_na] = None
+        has_na |= is_na
+        has_prev_dup[1:] |= (values[1:] == values[:-1]) & ~is_na[1:] & ~is_na[:-1]
 
     # Check whether there is a duplicate in both the forward and backward rows across any column.
     # These rows will usually be removed, conditional upon NAs in surrounding rows.
-    df = df.assign(
-        has_double_dup=df[['has_prev_dup', 'has_next_dup']].all(axis='columns'))
-    df = df.assign(
-        prev_has_double_dup=df['has_double_dup'].shift(1),
-        next_has_double_dup=df['has_double_dup'].shift(-1),
-    )
-
-    # Identify rows with NAs
-    # ----------------------
-
-    df = df.assign(has_na=df[colnames].isnull().values.any(axis=1))
-    df = df.assign(prev_has_na=df['has_na'].shift(1))
+    has_next_dup = np.zeros(n, dtype=bool)
+    has_next_dup[:-1] = has_prev_dup[1:]
+    has_double_dup = has_prev_dup & has_next_dup
+
+    # Shift the flags one row forward and one back. The rows outside the dataframe have no NAs or duplicates.
+    def shift(flags: np.ndarray, periods: int) -> np.ndarray:
+        shifted = np.zeros(n, dtype=bool)
+        if periods > 0:
+            shifted[periods:] = flags[:-periods]
+        else:
+            shifted[:periods] = flags[-periods:]
+        return shifted
+
+    prev_has_double_dup = shift(has_double_dup, 1)
+    next_has_double_dup = shift(has_double_dup, -1)
+    prev_has_na = shift(has_na, 1)
     # needed for a corner case.
-    df = df.assign(prev_2_has_na=df['has_na'].shift(2))
+    prev_2_has_na = shift(has_na, 2)
 
     # Identify the rows to remove
     # ---------------------------
 
-    def removal_conditions(dst: pd.DataFrame) -> pd.DataFrame:
-        """The set of rules for the removing conditions"""
-        # Rows with an NA are removed always.
-        if dst['has_na']:
-            return True
-        # Rows with a duplicate with the previous and the next row ('double' duplicate) are removed.
-        elif (dst['has_double_dup']):
-            # If the previous row has an NA, then do not remove.
-            if (dst['prev_has_na'] == True):
-                return False
-            else:
-                return True
-        # If the prev row has "double" duplicate, then the current row is not removed, conditional on NA.
-        elif (dst['prev_has_double_dup'] == True):
-            # Corner Case: If the row prior to the previous is an NA, then the current row is removed.
-            if (dst['prev_2_has_na'] == True):
-                return True
-            else:
-                return False
-        # If the next row has a "double" duplicate, then the current row is not removed.
-        elif (dst['next_has_double_dup'] == True):
-            return False
-        # We remove the current row if it is a duplicate of the previous, unless the previous was an NA.
-        elif (dst['has_prev_dup']):
-            if (dst['prev_has_na'] == True):
-                return False
-            else:
-                return True
-        else:
-            return False
-
-    df['remove'] = df.apply(removal_conditions, axis=1)
-
-    # Remove the rows with duplicates or NAs
-    # --------------------------------------
-
-    df = df[df['remove'] == False]
-    colnames.insert(0, 'DateTime')
-    df = df[colnames].reset_index(drop=True)
-    return df
+    # Rows with an NA are removed always.
+    remove = has_na.copy()
+    undecided = ~has_na
+    # Rows with a duplicate with the previous and the next row ('double' duplicate) are removed, unless the
+    # previous row has an NA.
+    remove |= undecided & has_double_dup & ~prev_has_na
+    undecided &= ~has_double_dup
+    # If the prev row has "double" duplicate, then the current row is not removed, conditional on NA.
+    # Corner Case: If the row prior to the previous is an NA, then the current row is removed.
+    remove |= undecided & prev_has_double_dup & prev_2_has_na
+    undecided &= ~prev_has_double_dup
+    # If the next row has a "double" duplicate, then the current row is not removed.
+    undecided &= ~next_has_double_dup
+    # We remove the current row if it is a duplicate of the previous, unless the previous was an NA.
+    remove |= undecided & has_prev_dup & ~prev_has_na
+    return remove
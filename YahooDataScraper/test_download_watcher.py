@@ -0,0 +1,56 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from YahooDataScraper.download_watcher import is_download_complete, wait_for_download
+
+
+class TestDownloadWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.download_path = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.download_path.name, 'BHP.AX.csv')
+
+    def tearDown(self):
+        self.download_path.cleanup()
+
+    def simulate_chrome_download(self, delay: float):
+        """Writes a partial .crdownload file, then renames it to the final file name, like Chrome."""
+        time.sleep(delay)
+        with open(self.file_path + '.crdownload', 'w') as partial_file:
+            partial_file.write('Date,Close\n')
+        time.sleep(delay)
+        with open(self.file_path + '.crdownload', 'a') as partial_file:
+            partial_file.write('2020-01-06,1\n')
+        os.replace(self.file_path + '.crdownload', self.file_path)
+
+    def test_waits_for_partial_file(self):
+        for use_notifications in [True, False]:
+            with self.subTest(use_notifications=use_notifications):
+                downloader = threading.Thread(target=self.simulate_chrome_download, args=(0.1,))
+                downloader.start()
+                self.assertEqual(wait_for_download(self.file_path, 10, poll_interval=0.01,
+                                                   use_notifications=use_notifications), self.file_path)
+                with open(self.file_path) as downloaded_file:
+                    self.assertEqual(downloaded_file.read(), 'Date,Close\n2020-01-06,1\n')
+                downloader.join()
+                os.remove(self.file_path)
+
+    def test_file_with_partial_file_is_not_complete(self):
+        open(self.file_path, 'w').close()
+        open(self.file_path + '.crdownload', 'w').close()
+        self.assertFalse(is_download_complete(self.file_path))
+        os.remove(self.file_path + '.crdownload')
+        self.assertTrue(is_download_complete(self.file_path))
+
+    def test_timeout(self):
+        start_time = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            wait_for_download(self.file_path, 0.2, poll_interval=0.01)
+        self.assertLess(time.monotonic() - start_time, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,10 @@
+import io
 import pandas as pd
 import numpy as np
 import unittest
 import pandas.testing as pd_testing
 
-from YahooDataScraper.equalise_columns import equalise_columns
+from YahooDataScraper.equalise_columns import equalise_columns, equalise_columns_chunked
 
 
 class TestEqualiseColumns(unittest.TestCase):
@@ -255,6 +256,69 @@ class TestEqualiseColumns(unittest.TestCase):
         test_df = equalise_columns(in_df)
         self.assertEqual(out_df, test_df)
 
+    def test_6(self):
+        """Tests whether columns of different types are compared without changing their types.
+        """
+        in_df = pd.DataFrame([
+            ['20200101', 1, 'x', 2.0],
+            ['20200102', 2, None, 3.0],
+            ['20200103', 3, 'y', 4.0],
+            ['20200104', 3, 'y', 4.0],
+            ['20200105', 3, 'y', 4.0],
+            ['20200106', 5, 'z', np.NaN],
+            ['20200107', 6, 'z', 7.0]
+        ],
+            columns=['DateTime', 'a', 'b', 'c'])
+        in_df['DateTime'] = pd.to_datetime(in_df['DateTime'])
+
+        out_df = pd.DataFrame([
+            ['20200101', 1, 'x', 2.0],
+            ['20200103', 3, 'y', 4.0],
+            ['20200105', 3, 'y', 4.0],
+            ['20200107', 6, 'z', 7.0]
+        ],
+            columns=['DateTime', 'a', 'b', 'c'])
+        out_df['DateTime'] = pd.to_datetime(out_df['DateTime'])
+
+        test_df = equalise_columns(in_df)
+        self.assertEqual(out_df, test_df)
+
+
+class TestEqualiseColumnsChunked(unittest.TestCase):
+
+    def get_random_df(self, rng, n):
+        """Returns a dataframe with many consecutive duplicates and NAs."""
+        df = pd.DataFrame({'DateTime': pd.date_range('20200101', periods=n)})
+        for colname in ['a', 'b']:
+            values = rng.integers(0, 3, n).astype(float)
+            values[rng.random(n) < 0.1] = np.NaN
+            df[colname] = values
+        return df
+
+    def test_chunks_match_in_memory(self):
+        """Tests whether the cleaned chunks are identical to the cleaned dataframe, for any chunk boundaries.
+        """
+        rng = np.random.default_rng(0)
+        for n in [0, 1, 2, 5, 40]:
+            for _ in range(10):
+                in_df = self.get_random_df(rng, n)
+                out_df = equalise_columns(in_df)
+                for chunk_size in [1, 2, 3, 7]:
+                    with self.subTest(n=n, chunk_size=chunk_size):
+                        chunks = [in_df.iloc[i:i + chunk_size] for i in range(0, n, chunk_size)]
+                        test_dfs = list(equalise_columns_chunked(chunks))
+                        test_df = pd.concat(test_dfs) if test_dfs else out_df.iloc[:0]
+                        pd_testing.assert_frame_equal(out_df, test_df)
+
+    def test_read_csv_chunks(self):
+        """Tests cleaning a csv file read in chunks, with at most a few rows held between chunks.
+        """
+        in_df = self.get_random_df(np.random.default_rng(1), 1000)
+        csv_file = io.StringIO(in_df.to_csv(index=False))
+        test_dfs = list(equalise_columns_chunked(pd.read_csv(csv_file, chunksize=64, parse_dates=['DateTime'])))
+        self.assertLessEqual(max(len(x) for x in test_dfs), 64 + 2)
+        pd_testing.assert_frame_equal(equalise_columns(in_df), pd.concat(test_dfs))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from YahooDataScraper.yahoo_http_client import YahooHttpDataConnection
+from YahooDataScraper.yahoo_scrapper import DataFrequency, DataType, YahooTicker
+
+
+class StandInYahooHandler(BaseHTTPRequestHandler):
+    """A stand-in for the Yahoo csv download service, which fails the first request for BTC-USD."""
+    protocol_version = 'HTTP/1.1'  # keep the connections alive between requests
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.client_ports.add(self.client_address[1])
+            fail = self.path.startswith('/download/BTC-USD') and not server.failed_once
+            if fail:
+                server.failed_once = True
+        if fail:
+            body = b'Service unavailable'
+            self.send_response(503)
+        else:
+            price = str(len(self.path.split('?')[0]))
+            body = ('Date,Open,High,Low,Close,Adj Close,Volume\n' +
+                    '2020-01-06,1,1,1,' + price + ',' + price + ',10\n' +
+                    '2020-01-13,2,2,2,' + price + '.5,' + price + '.5,20\n').encode('utf-8')
+            self.send_response(200)
+        self.send_header('Content-Type', 'text/csv')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestYahooHttpDataConnection(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInYahooHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.client_ports = set()
+        self.server.failed_once = False
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.download_path = tempfile.TemporaryDirectory()
+        self.yahoo_conn = YahooHttpDataConnection(
+            download_url='http://127.0.0.1:' + str(self.server.server_address[1]) + '/download/',
+            download_path=self.download_path.name, max_workers=2, download_retries=1, download_timeout=10)
+
+    def tearDown(self):
+        self.yahoo_conn.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.download_path.cleanup()
+
+    def test_get_historical_data(self):
+        tickers = [YahooTicker.BHP, YahooTicker.CBA, YahooTicker.BTC, YahooTicker.TNX, YahooTicker.ETH]
+        df = self.yahoo_conn.get_historical_data(
+            tickers=tickers, data_types=[DataType.Close], data_frequency=DataFrequency.Weekly,
+            start_date='20200101', end_date='20200201')
+
+        self.assertEqual(list(df.columns), ['Date', 'BHP_Close', 'CBA_Close', 'BTC_Close', 'TNX_Close', 'ETH_Close'])
+        self.assertEqual(list(df['Date']), list(pd.to_datetime(['2020-01-06', '2020-01-13'])))
+        self.assertEqual(df['TNX_Close'].tolist(), [len('/download/%5ETNX'), len('/download/%5ETNX') + 0.5])
+        self.assertIn('interval=1wk', self.server.requests[0])
+
+        # five tickers and one retry, over at most one connection per worker plus the one reopened after the error
+        self.assertEqual(len(self.server.requests), 6)
+        self.assertLessEqual(len(self.server.client_ports), 3)
+
+        # the cached tickers are not fetched again
+        self.yahoo_conn.get_historical_data(
+            tickers=tickers, data_types=[DataType.Close], data_frequency=DataFrequency.Weekly,
+            start_date='20200101', end_date='20200201')
+        self.assertEqual(len(self.server.requests), 6)
+        self.assertFalse(any(x.endswith('.part') for x in os.listdir(self.download_path.name)))
+
+
+if __name__ == '__main__':
+    unittest.main()
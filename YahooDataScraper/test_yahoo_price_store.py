@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from YahooDataScraper.yahoo_price_store import YahooPriceStore
+from YahooDataScraper.yahoo_scrapper import DataFrequency, DataType, YahooDataConnection, YahooTicker
+
+
+class StandInYahooDataConnection(YahooDataConnection):
+    """
+    A stand-in for the Yahoo data connection, which writes daily csv files of a price equal to the day. As for
+    Yahoo, the end date is exclusive and there are no prices after today.
+    """
+
+    def __init__(self, download_path):
+        super().__init__(download_path=download_path)
+        self.requests = []
+
+    def download_historical_data(self, tickers, data_frequency, start_date, end_date):
+        for ticker in tickers:
+            self.requests.append((ticker, start_date, end_date))
+            dates = pd.date_range(start_date, end_date, freq='D', inclusive='left')
+            dates = dates[dates <= pd.Timestamp.today().normalize()]
+            price = dates.day.astype('float64') + (100.0 if ticker == YahooTicker.BTC else 0.0)
+            df = pd.DataFrame({'Date': dates.strftime('%Y-%m-%d'), 'Open': price, 'High': price, 'Low': price,
+                               'Close': price, 'Adj Close': price, 'Volume': 10.0})
+            df.to_csv(self._get_cache_filename(ticker=ticker, data_frequency=data_frequency, start_date=start_date,
+                                               end_date=end_date), index=False)
+
+
+class TestYahooPriceStore(unittest.TestCase):
+
+    def setUp(self):
+        self.download_path = tempfile.TemporaryDirectory()
+        self.yahoo_conn = StandInYahooDataConnection(self.download_path.name)
+        self.store = YahooPriceStore(self.yahoo_conn)
+
+    def tearDown(self):
+        self.download_path.cleanup()
+
+    def get_close(self, start_date, end_date):
+        return self.store.get_historical_data(
+            tickers=[YahooTicker.BHP, YahooTicker.BTC], data_types=[DataType.Close],
+            data_frequency=DataFrequency.Daily, start_date=start_date, end_date=end_date)
+
+    def test_only_gaps_are_downloaded(self):
+        df = self.get_close('20200110', '20200120')
+        self.assertEqual(list(df.columns), ['Date', 'BHP_Close', 'BTC_Close'])
+        self.assertEqual(list(df['Date']), list(pd.date_range('2020-01-10', '2020-01-20')))
+        np.testing.assert_array_equal(df['BTC_Close'].values, np.arange(110.0, 121.0))
+        self.assertEqual(len(self.yahoo_conn.requests), 2)
+
+        # a sub-range is served from the store
+        df = self.get_close('20200112', '20200114')
+        np.testing.assert_array_equal(df['BHP_Close'].values, [12.0, 13.0, 14.0])
+        self.assertEqual(len(self.yahoo_conn.requests), 2)
+
+        # an extended range only downloads the missing dates on either side
+        self.yahoo_conn.requests.clear()
+        df = self.get_close('20200105', '20200125')
+        np.testing.assert_array_equal(df['BHP_Close'].values, np.arange(5.0, 26.0))
+        self.assertEqual(self.yahoo_conn.requests, [
+            (YahooTicker.BHP, '20200105', '20200110'), (YahooTicker.BTC, '20200105', '20200110'),
+            (YahooTicker.BHP, '20200121', '20200126'), (YahooTicker.BTC, '20200121', '20200126')])
+        self.assertEqual(self.store.get_covered_ranges(YahooTicker.BHP, DataFrequency.Daily),
+                         [('20200105', '20200125')])
+
+        # the downloaded csv files are merged into one store file per ticker
+        self.assertEqual([x for x in os.listdir(self.download_path.name) if x.endswith('.csv')], [])
+        self.assertEqual(sorted(os.listdir(self.store.store_path)), ['BHP.AX_1d.npz', 'BTC-USD_1d.npz'])
+
+    def test_missing_ranges(self):
+        self.get_close('20200110', '20200112')
+        self.get_close('20200120', '20200122')
+        self.assertEqual(self.store.get_covered_ranges(YahooTicker.BTC, DataFrequency.Daily),
+                         [('20200110', '20200112'), ('20200120', '20200122')])
+        self.assertEqual(self.store.get_missing_ranges(YahooTicker.BTC, DataFrequency.Daily, '20200101', '20200131'),
+                         [('20200101', '20200109'), ('20200113', '20200119'), ('20200123', '20200131')])
+        self.assertEqual(self.store.get_missing_ranges(YahooTicker.BTC, DataFrequency.Daily, '20200111', '20200121'),
+                         [('20200113', '20200119')])
+        self.assertEqual(self.store.get_missing_ranges(YahooTicker.ETH, DataFrequency.Daily, '20200111', '20200121'),
+                         [('20200111', '20200121')])
+
+        # filling the gap joins the covered ranges
+        self.get_close('20200113', '20200119')
+        self.assertEqual(self.store.get_covered_ranges(YahooTicker.BTC, DataFrequency.Daily),
+                         [('20200110', '20200122')])
+
+
+    def test_recent_dates_are_not_covered(self):
+        today = pd.Timestamp.today().normalize()
+        start_date = (today - pd.Timedelta(days=5)).strftime('%Y%m%d')
+        end_date = (today + pd.Timedelta(days=5)).strftime('%Y%m%d')
+        df = self.get_close(start_date, end_date)
+        self.assertEqual(list(df['Date']), list(pd.date_range(today - pd.Timedelta(days=5), today)))
+
+        # today's price may still change, and later prices are not yet published, so they are downloaded again
+        yesterday = (today - pd.Timedelta(days=1)).strftime('%Y%m%d')
+        self.assertEqual(self.store.get_covered_ranges(YahooTicker.BHP, DataFrequency.Daily),
+                         [(start_date, yesterday)])
+        self.assertEqual(self.store.get_missing_ranges(YahooTicker.BHP, DataFrequency.Daily, start_date, end_date),
+                         [(today.strftime('%Y%m%d'), end_date)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from YahooDataScraper.yahoo_scrapper import DataFrequency, DataType, YahooDataConnection, YahooTicker
+
+
+class TestYahooDataConnection(unittest.TestCase):
+
+    def setUp(self):
+        self.download_path = tempfile.TemporaryDirectory()
+        self.yahoo_conn = YahooDataConnection(download_path=self.download_path.name)
+
+    def tearDown(self):
+        self.yahoo_conn.close()
+        self.download_path.cleanup()
+
+    def write_cache_file(self, ticker: YahooTicker, rows: [str]):
+        filename = self.yahoo_conn._get_cache_filename(
+            ticker=ticker, data_frequency=DataFrequency.Weekly, start_date='20200101', end_date='20200201')
+        with open(filename, 'w') as cache_file:
+            cache_file.write('Date,Open,High,Low,Close,Adj Close,Volume\n' + '\n'.join(rows) + '\n')
+
+    def test_get_historical_data_aligns_cached_tickers(self):
+        self.write_cache_file(YahooTicker.BHP, ['2020-01-13,1,1,1,2.5,2.4,20', '2020-01-06,1,1,1,2,1.9,10'])
+        self.write_cache_file(YahooTicker.BTC, ['2020-01-06,1,1,1,7000,7000,10', '2020-01-20,null,null,null,null,'
+                                                'null,null', '2020-01-27,1,1,1,8000,8000,10'])
+
+        # the Chrome sessions are only started for tickers that are not in the cache
+        df = self.yahoo_conn.get_historical_data(
+            tickers=[YahooTicker.BHP, YahooTicker.BTC, YahooTicker.BHP],
+            data_types=[DataType.Close, DataType.AdjustedClose], data_frequency=DataFrequency.Weekly,
+            start_date='20200101', end_date='20200201')
+
+        expected_df = pd.DataFrame({
+            'Date': pd.to_datetime(['2020-01-06', '2020-01-13', '2020-01-20', '2020-01-27']),
+            'BHP_Close': [2.0, 2.5, np.nan, np.nan], 'BHP_AdjustedClose': [1.9, 2.4, np.nan, np.nan],
+            'BTC_Close': [7000.0, np.nan, np.nan, 8000.0], 'BTC_AdjustedClose': [7000.0, np.nan, np.nan, 8000.0]})
+        pd.testing.assert_frame_equal(df, expected_df)
+        self.assertEqual(os.listdir(self.download_path.name).count('BHP.AX_1wk_20200101_20200201.csv'), 1)
+
+    def test_get_historical_data_without_tickers(self):
+        df = self.yahoo_conn.get_historical_data(
+            tickers=[], data_types=[DataType.Close], data_frequency=DataFrequency.Weekly,
+            start_date='20200101', end_date='20200201')
+        self.assertEqual(list(df.columns), ['Date'])
+        self.assertEqual(len(df), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
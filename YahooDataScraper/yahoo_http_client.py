@@ -0,0 +1,164 @@
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection, HTTPSConnection
+import datetime
+import os
+import queue
+import time
+import urllib.parse
+
+from YahooDataScraper.yahoo_scrapper import (DataFrequency, DataFrequencyExtensions, YahooDataConnection,
+                                             YahooTicker, YahooTickerExtensions)
+
+
+class YahooHttpDataConnection(YahooDataConnection):
+    """
+    A Yahoo data connection that fetches the history csv files directly over HTTP, instead of opening the
+    history page in a browser and clicking its download button. It has the same get_historical_data API and
+    the same cache as YahooDataConnection.
+
+    The HTTP connections are kept open and reused between requests, in a pool of one connection per worker,
+    and up to max_workers tickers are fetched concurrently.
+    """
+
+    def __init__(self, download_url=None, download_path=None, max_workers=None, download_retries=None,
+                 download_timeout=None):
+        """
+        Default constructor for the Yahoo HTTP data connection.
+
+        Args:
+            download_url (str, optional): The url of the Yahoo csv download service, to which the ticker is
+                appended.
+            download_path (str, optional): String for the os path where the data is cached.
+            max_workers (int, optional): The number of tickers fetched concurrently. Defaults to 4.
+            download_retries (int, optional): The number of times a failed ticker download is retried.
+            download_timeout (int, optional): The socket timeout in seconds for a single request.
+        """
+        if download_url is None:
+            download_url = 'https://query1.finance.yahoo.com/v7/finance/download/'
+        if max_workers is None:
+            max_workers = 4
+        super().__init__(download_path=download_path, max_workers=max_workers, download_retries=download_retries,
+                         download_timeout=download_timeout)
+        if not os.path.exists(self.download_path):
+            os.makedirs(self.download_path)
+
+        self.download_url = download_url
+        split_url = urllib.parse.urlsplit(download_url)
+        self.__connection_class = HTTPSConnection if split_url.scheme == 'https' else HTTPConnection
+        self.__host = split_url.netloc
+        self.__base_path = split_url.path if split_url.path.endswith('/') else split_url.path + '/'
+
+        # The connections are opened on first use, and reopened after an error.
+        self.__connections = queue.Queue()
+        for _ in range(self.max_workers):
+            self.__connections.put(None)
+
+    def __get_request_path(self, ticker: YahooTicker, data_frequency: DataFrequency, start_date: str,
+                           end_date: str) -> str:
+        """
+        Converts a ticker, data frequency, and start and end dates, to the path of the csv download request.
+
+        Args:
+            ticker (YahooTicker): The name of the Yahoo Ticker we wish to map to a website ticker.
+            data_frequency (DataFrequency): The frequency of the data to retrieve.
+            start_date (str): The start date for the data, in yyyymmdd format.
+            end_date (str): The end date for the data, in yyyymmdd format.
+
+        Returns:
+            str: The request path, including the query string.
+        """
+        ticker_str = YahooTickerExtensions.to_string(ticker, 2)
+        freq_str = DataFrequencyExtensions.to_string(data_frequency, 1)
+        start_date_unix = time.mktime(datetime.datetime.strptime(start_date, r'%Y%m%d').timetuple())
+        end_date_unix = time.mktime(datetime.datetime.strptime(end_date, r'%Y%m%d').timetuple())
+        return (self.__base_path + ticker_str + '?period1=' + str(int(start_date_unix)) + '&period2=' +
+                str(int(end_date_unix)) + '&interval=' + freq_str + '&events=history')
+
+    def __download_data(self, ticker: YahooTicker, data_frequency: DataFrequency, start_date: str,
+                        end_date: str, connection):
+        """
+        Fetches the ticker's csv file over the connection and writes it to the cache.
+
+        Args:
+            ticker (YahooTicker): The name of the financial security of interest.
+            data_frequency (DataFrequency): The frequency of the data to retrieve.
+            start_date (str): The start date for the data, in %yyyy%mm%dd format.
+            end_date (str): The end date for the data, in %yyyy%mm%dd format.
+            connection (HTTPConnection): An open connection to the download server.
+
+        Raises:
+            ConnectionError: If the server does not return the csv file.
+        """
+        connection.request('GET', self.__get_request_path(ticker, data_frequency, start_date, end_date),
+                           headers={'User-Agent': 'Mozilla/5.0', 'Accept': 'text/csv'})
+        response = connection.getresponse()
+        body = response.read()  # the whole response is read so the connection can be reused
+        if response.status != 200:
+            raise ConnectionError('The download of ' + YahooTickerExtensions.to_string(ticker, 1) +
+                                  ' failed with HTTP status ' + str(response.status) + '.')
+
+        # Write to a temporary file first, so that an interrupted write never leaves a partial cache file
+        cache_filename = self._get_cache_filename(
+            ticker=ticker, data_frequency=data_frequency, start_date=start_date, end_date=end_date)
+        with open(cache_filename + '.part', 'wb') as cache_file:
+            cache_file.write(body)
+        os.replace(cache_filename + '.part', cache_filename)
+
+    def __download_data_with_retries(self, ticker: YahooTicker, data_frequency: DataFrequency,
+                                     start_date: str, end_date: str):
+        """
+        Fetches the ticker's data on an idle connection from the pool, retrying failed attempts on a new
+        connection.
+
+        Args:
+            ticker (YahooTicker): The name of the financial security of interest.
+            data_frequency (DataFrequency): The frequency of the data to retrieve.
+            start_date (str): The start date for the data, in %yyyy%mm%dd format.
+            end_date (str): The end date for the data, in %yyyy%mm%dd format.
+        """
+        connection = self.__connections.get()
+        try:
+            for attempt in range(self.download_retries + 1):
+                if connection is None:
+                    connection = self.__connection_class(self.__host, timeout=self.download_timeout)
+                try:
+                    self.__download_data(ticker, data_frequency, start_date, end_date, connection)
+                    return
+                except Exception:
+                    connection.close()
+                    connection = None
+                    if attempt == self.download_retries:
+                        raise
+        finally:
+            self.__connections.put(connection)
+
+    def download_historical_data(self, tickers: [YahooTicker], data_frequency: DataFrequency, start_date: str,
+                                 end_date: str):
+        """
+        Fetches the data for the tickers into the cache, running up to max_workers requests concurrently.
+        Tickers that are already in the cache are not fetched again.
+
+        Args:
+            tickers ([YahooTicker]): The list of the tickers for which to download data.
+            data_frequency (DataFrequency): The frequency of the data to retrieve.
+            start_date (str): The start date for the data, in %yyyy%mm%dd format.
+            end_date (str): The end date for the data, in %yyyy%mm%dd format.
+        """
+        missing_tickers = [ticker for ticker in dict.fromkeys(tickers) if not os.path.isfile(
+            self._get_cache_filename(
+                ticker=ticker, data_frequency=data_frequency, start_date=start_date, end_date=end_date))]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.__download_data_with_retries, ticker, data_frequency, start_date,
+                                       end_date) for ticker in missing_tickers]
+            for future in futures:
+                future.result()
+
+    def close(self):
+        """
+        Closes the pooled HTTP connections.
+        """
+        for _ in range(self.max_workers):
+            connection = self.__connections.get()
+            if connection is not None:
+                connection.close()
+            self.__connections.put(None)
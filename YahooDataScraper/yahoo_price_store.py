@@ -0,0 +1,253 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from YahooDataScraper.yahoo_scrapper import (DataFrequency, DataFrequencyExtensions, DataType, DataTypeExtensions,
+                                             YahooDataConnection, YahooTicker, YahooTickerExtensions)
+
+
+class YahooPriceStore:
+    """
+    A consolidated local store of Yahoo prices, with one binary columnar .npz file per ticker and data
+    frequency. Each file holds the dates, a float64 array per data type, and the date ranges that have been
+    downloaded, so that a request for any date range only downloads the gaps that are not yet covered, and
+    is otherwise served from the local data.
+
+    The data connection, e.g. YahooDataConnection or YahooHttpDataConnection, downloads the gaps into its csv
+    cache, from which they are merged into the store and removed. The connections treat the end date of a
+    download as exclusive, as Yahoo does, and a range is only recorded as covered up to the day before today,
+    since later prices are either not yet final or not yet published.
+    """
+
+    def __init__(self, yahoo_conn: YahooDataConnection, store_path=None):
+        """
+        Default constructor for the Yahoo price store.
+
+        Args:
+            yahoo_conn (YahooDataConnection): The data connection with which the missing data is downloaded.
+            store_path (str, optional): String for the os path of the store. Defaults to the 'store' directory
+                in the download path of the connection.
+        """
+        if store_path is None:
+            store_path = os.path.join(yahoo_conn.download_path, 'store')
+        if not os.path.exists(store_path):
+            os.makedirs(store_path)
+        self.yahoo_conn = yahoo_conn
+        self.store_path = store_path
+
+    def __get_store_filename(self, ticker: YahooTicker, data_frequency: DataFrequency) -> str:
+        """
+        Returns the path of the store file for a ticker and data frequency.
+
+        Args:
+            ticker (YahooTicker): The name of the financial security of interest.
+            data_frequency (DataFrequency): The frequency of the data.
+
+        Returns:
+            str: The path of the .npz store file.
+        """
+        ticker_str = YahooTickerExtensions.to_string(ticker, 1)
+        freq_str = DataFrequencyExtensions.to_string(data_frequency, 1)
+        return os.path.join(self.store_path, ticker_str + '_' + freq_str + '.npz')
+
+    def __load(self, ticker: YahooTicker, data_frequency: DataFrequency) -> (pd.DataFrame, np.ndarray):
+        """
+        Loads the stored prices and covered date ranges of a ticker.
+
+        Args:
+            ticker (YahooTicker): The name of the financial security of interest.
+            data_frequency (DataFrequency): The frequency of the data.
+
+        Returns:
+            (pd.DataFrame, np.ndarray): The prices of every data type, indexed by date, and the covered date
+                ranges as an (n, 2) array of inclusive datetime64[D] start and end dates.
+        """
+        filename = self.__get_store_filename(ticker, data_frequency)
+        data_type_cols = [DataTypeExtensions.to_string(data_type, 0) for data_type in DataType]
+        if not os.path.isfile(filename):
+            return (pd.DataFrame(columns=data_type_cols, index=pd.DatetimeIndex([], name='Date'), dtype='float64'),
+                    np.empty((0, 2), dtype='datetime64[D]'))
+
+        with np.load(filename) as store_file:
+            df = pd.DataFrame({DataTypeExtensions.to_string(data_type, 0): store_file[
+                DataTypeExtensions.to_string(data_type, 1)] for data_type in DataType},
+                index=pd.DatetimeIndex(store_file['Date'].astype('datetime64[ns]'), name='Date'))
+            covered_ranges = store_file['CoveredRanges'].astype('datetime64[D]')
+        return df, covered_ranges
+
+    def __save(self, ticker: YahooTicker, data_frequency: DataFrequency, df: pd.DataFrame,
+               covered_ranges: np.ndarray):
+        """
+        Saves the prices and covered date ranges of a ticker, replacing its store file in one step so that an
+        interrupted write never leaves a partial file.
+
+        Args:
+            ticker (YahooTicker): The name of the financial security of interest.
+            data_frequency (DataFrequency): The frequency of the data.
+            df (pd.DataFrame): The prices of every data type, indexed by date.
+            covered_ranges (np.ndarray): The covered date ranges.
+        """
+        arrays = {DataTypeExtensions.to_string(data_type, 1): df[DataTypeExtensions.to_string(
+            data_type, 0)].to_numpy(dtype='float64') for data_type in DataType}
+        arrays['Date'] = df.index.values.astype('datetime64[ns]').view('int64')
+        arrays['CoveredRanges'] = covered_ranges.astype('datetime64[D]').view('int64')
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+
+        filename = self.__get_store_filename(ticker, data_frequency)
+        with open(filename + '.part', 'wb') as store_file:
+            store_file.write(buffer.getvalue())
+        os.replace(filename + '.part', filename)
+
+    @staticmethod
+    def __to_date(date: str) -> np.datetime64:
+        """
+        Converts a date in %yyyy%mm%dd format to a numpy date.
+        """
+        return np.datetime64(date[:4] + '-' + date[4:6] + '-' + date[6:8], 'D')
+
+    @staticmethod
+    def __to_string(date: np.datetime64) -> str:
+        """
+        Converts a numpy date to a date in %yyyy%mm%dd format.
+        """
+        return str(date).replace('-', '')
+
+    @staticmethod
+    def __merge_ranges(covered_ranges: np.ndarray) -> np.ndarray:
+        """
+        Merges overlapping and adjacent date ranges.
+
+        Args:
+            covered_ranges (np.ndarray): An (n, 2) array of inclusive start and end dates.
+
+        Returns:
+            np.ndarray: The merged date ranges, sorted by start date.
+        """
+        merged_ranges = []
+        for start, end in covered_ranges[np.argsort(covered_ranges[:, 0], kind='stable')]:
+            if merged_ranges and start <= merged_ranges[-1][1] + np.timedelta64(1, 'D'):
+                merged_ranges[-1][1] = max(merged_ranges[-1][1], end)
+            else:
+                merged_ranges.append([start, end])
+        return np.array(merged_ranges, dtype='datetime64[D]').reshape(-1, 2)
+
+    def get_covered_ranges(self, ticker: YahooTicker, data_frequency: DataFrequency) -> [(str, str)]:
+        """
+        Returns the date ranges of a ticker that are in the store.
+
+        Args:
+            ticker (YahooTicker): The name of the financial security of interest.
+            data_frequency (DataFrequency): The frequency of the data.
+
+        Returns:
+            [(str, str)]: The inclusive start and end dates of the covered ranges, in %yyyy%mm%dd format.
+        """
+        _, covered_ranges = self.__load(ticker, data_frequency)
+        return [(self.__to_string(start), self.__to_string(end)) for start, end in covered_ranges]
+
+    def get_missing_ranges(self, ticker: YahooTicker, data_frequency: DataFrequency, start_date: str,
+                           end_date: str) -> [(str, str)]:
+        """
+        Returns the gaps in the store for a ticker's date range, i.e. the date ranges that must be downloaded.
+
+        Args:
+            ticker (YahooTicker): The name of the financial security of interest.
+            data_frequency (DataFrequency): The frequency of the data.
+            start_date (str): The start date for the data, in %yyyy%mm%dd format.
+            end_date (str): The end date for the data, in %yyyy%mm%dd format.
+
+        Returns:
+            [(str, str)]: The inclusive start and end dates of the gaps, in %yyyy%mm%dd format.
+        """
+        _, covered_ranges = self.__load(ticker, data_frequency)
+        gap_start, end = self.__to_date(start_date), self.__to_date(end_date)
+        missing_ranges = []
+        for covered_start, covered_end in covered_ranges:
+            if covered_end < gap_start:
+                continue
+            if covered_start > end:
+                break
+            if covered_start > gap_start:
+                missing_ranges.append((gap_start, covered_start - np.timedelta64(1, 'D')))
+            gap_start = covered_end + np.timedelta64(1, 'D')
+        if gap_start <= end:
+            missing_ranges.append((gap_start, end))
+        return [(self.__to_string(start), self.__to_string(end)) for start, end in missing_ranges]
+
+    def update(self, tickers: [YahooTicker], data_frequency: DataFrequency, start_date: str, end_date: str):
+        """
+        Downloads the gaps in the tickers' date range, and merges them into the store. The tickers that share a
+        gap are downloaded together, so the connection can download them concurrently.
+
+        Args:
+            tickers ([YahooTicker]): The list of the tickers for which to download data.
+            data_frequency (DataFrequency): The frequency of the data to retrieve.
+            start_date (str): The start date for the data, in %yyyy%mm%dd format.
+            end_date (str): The end date for the data, in %yyyy%mm%dd format.
+        """
+        gap_tickers = {}
+        for ticker in dict.fromkeys(tickers):
+            for gap in self.get_missing_ranges(ticker, data_frequency, start_date, end_date):
+                gap_tickers.setdefault(gap, []).append(ticker)
+
+        last_final_date = np.datetime64('today', 'D') - np.timedelta64(1, 'D')
+        for (gap_start_date, gap_end_date), tickers_with_gap in gap_tickers.items():
+            # The download end date is exclusive, so the day after the gap is requested to fetch its last day
+            download_end_date = self.__to_string(self.__to_date(gap_end_date) + np.timedelta64(1, 'D'))
+            self.yahoo_conn.download_historical_data(tickers=tickers_with_gap, data_frequency=data_frequency,
+                                                     start_date=gap_start_date, end_date=download_end_date)
+            covered_end = min(self.__to_date(gap_end_date), last_final_date)
+            for ticker in tickers_with_gap:
+                cache_filename = self.yahoo_conn._get_cache_filename(
+                    ticker=ticker, data_frequency=data_frequency, start_date=gap_start_date,
+                    end_date=download_end_date)
+                gap_df = self.yahoo_conn._read_cache_file(cache_filename, list(DataType))
+
+                # The newly downloaded prices replace any stored prices of the same dates, and only the dates
+                # up to the day before today are covered, so that later dates are downloaded again
+                df, covered_ranges = self.__load(ticker, data_frequency)
+                df = pd.concat([df[~df.index.isin(gap_df.index)], gap_df]).sort_index()
+                if self.__to_date(gap_start_date) <= covered_end:
+                    covered_ranges = self.__merge_ranges(np.concatenate([covered_ranges, np.array(
+                        [[self.__to_date(gap_start_date), covered_end]], dtype='datetime64[D]')]))
+                self.__save(ticker, data_frequency, df, covered_ranges)
+                os.remove(cache_filename)
+
+    def get_historical_data(self, tickers: [YahooTicker], data_types: [DataType],
+                            data_frequency: DataFrequency, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        Gets the data for the desired tickers, downloading only the gaps that are not in the store.
+
+        Args:
+            tickers ([YahooTicker]): The list of the tickers for which to retrieve data.
+            data_types ([DataType]): The list of the data types to retrieve.
+            data_frequency (DataFrequency): The frequency of the data to retrieve.
+            start_date (str): The start date for the data, in %yyyy%mm%dd format.
+            end_date (str): The end date for the data, in %yyyy%mm%dd format.
+
+        Returns:
+            pd.DataFrame: The merged dataframe of the requested price data, in the same format as
+                YahooDataConnection.get_historical_data.
+        """
+        self.update(tickers=tickers, data_frequency=data_frequency, start_date=start_date, end_date=end_date)
+
+        # Serve the sub-range of each ticker from the store, and prefix the price columns with the ticker
+        price_cols = [DataTypeExtensions.to_string(data_type, 0) for data_type in data_types]
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date) + pd.Timedelta(days=1)
+        ticker_dfs = []
+        for ticker in dict.fromkeys(tickers):
+            df, _ = self.__load(ticker, data_frequency)
+            ticker_df = df.loc[(df.index >= start) & (df.index < end), price_cols]
+            ticker_df.columns = [YahooTickerExtensions.to_string(ticker) + '_' + DataTypeExtensions.to_string(
+                data_type, 1) for data_type in data_types]
+            ticker_dfs.append(ticker_df)
+        if len(ticker_dfs) == 0:
+            return pd.DataFrame(columns=['Date'])
+
+        # Align all the tickers in a single outer join on the dates
+        df = pd.concat(ticker_dfs, axis=1, join='outer', sort=True)
+        df = df.rename_axis('Date').reset_index()
+        return df
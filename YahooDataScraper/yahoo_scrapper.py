@@ -1,13 +1,15 @@
-from selenium import webdriver
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, auto
 import pandas as pd
 import time
 import datetime
 import ntpath
 import os
+import queue
 import re
 
+from YahooDataScraper.download_watcher import wait_for_download
+
 """
 Create a DataFrame in Python using the following instructions: 1) Visit yahoo finance 2) choose 3 of your 
 favourite stocks, 3 interest rate products and 3 Crypto-currencies. 3) Download CSV files of closing or 
@@ -153,7 +155,7 @@ class YahooTickerExtensions:
 class YahooDataConnection:
 
     def __init__(self, yahoo_url=None, download_path=None, is_chrome_headless=None,
-                 selenium_sleep_time=None):
+                 selenium_sleep_time=None, max_workers=None, download_retries=None, download_timeout=None):
         """
         Default constructor for the Yahoo data connection.
 
@@ -161,8 +163,13 @@ class YahooDataConnection:
             yahoo_url ([type], optional): String value with the yahoo finance url. 
             download_path ([type], optional): String for the os path where the data is downloaded.
             is_chrome_headless ([type], optional): Boolean for whether to open Chrome GUI. 
-            selenium_sleep_time ([type], optional): Int specifying the number of seconds given for 
+            selenium_sleep_time ([type], optional): Int specifying the maximum number of seconds given for 
                 pages to load.
+            max_workers (int, optional): The number of tickers downloaded concurrently, each through its
+                own Chrome session. Defaults to 1, i.e. one ticker at a time.
+            download_retries (int, optional): The number of times a failed ticker download is retried.
+            download_timeout (int, optional): The number of seconds after which a single download attempt
+                for a ticker is abandoned.
 
         """
         if yahoo_url is None:
@@ -173,36 +180,83 @@ class YahooDataConnection:
             is_chrome_headless = True
         if selenium_sleep_time is None:
             selenium_sleep_time = 10
+        if max_workers is None:
+            max_workers = 1
+        if download_retries is None:
+            download_retries = 2
+        if download_timeout is None:
+            download_timeout = 120
         self.yahoo_url = yahoo_url
         self.download_path = download_path
         self.is_chrome_headless = is_chrome_headless
         self.selenium_sleep_time = selenium_sleep_time
+        self.max_workers = max_workers
+        self.download_retries = download_retries
+        self.download_timeout = download_timeout
 
-        # Instantiate the Chrome browser
-        self.__initialise_chrome_browser()
+        # The Chrome sessions are only started when the first ticker is downloaded, so that data already in
+        # the cache can be read without a browser.
+        self.__sessions = None
 
-    def __initialise_chrome_browser(self):
+    def __initialise_chrome_browser(self, download_path: str):
         """"
         Creates a new Chrome session for the Selenium driver to use. 
+
+        Args:
+            download_path (str): The os path where the session's downloads are saved.
+
+        Returns:
+            webdriver.Chrome: The Chrome session.
         """
+        # Selenium is only imported when the first Chrome session is started, so that the cached data can be
+        # read without it
+        from selenium import webdriver
+
         options = webdriver.ChromeOptions()
         if self.is_chrome_headless:
             options.add_argument('headless')
-        if self.download_path is not None:
+        if download_path is not None:
             # Create the download path if it does not exist
-            if not os.path.exists(self.download_path):
-                os.makedirs(self.download_path)
+            if not os.path.exists(download_path):
+                os.makedirs(download_path)
             # If the OS is windows, then we need to convert to a Windows path.
-            download_path = self.download_path
             if os.name == 'nt':
-                download_path = self.download_path.replace('/', ntpath.sep)
+                download_path = download_path.replace('/', ntpath.sep)
             # Specify the download path for the Chrome browser
             prefs = {}
             prefs['profile.default_content_settings.popups'] = 0
             prefs['download.default_directory'] = download_path
             options.add_experimental_option('prefs', prefs)
 
-        self.__browser = webdriver.Chrome(chrome_options=options)
+        return webdriver.Chrome(chrome_options=options)
+
+    def __get_sessions(self) -> queue.Queue:
+        """
+        Returns the pool of Chrome sessions used for concurrent downloads, creating it on first use. Each 
+        session downloads into its own directory, so that concurrent downloads of the same file name do not
+        collide. The first session downloads into the download path itself.
+
+        Returns:
+            queue.Queue: The (browser, download path) pairs of the idle sessions.
+        """
+        if self.__sessions is None:
+            self.__sessions = queue.Queue()
+            self.__sessions.put((self.__initialise_chrome_browser(self.download_path), self.download_path))
+            for i in range(1, self.max_workers):
+                session_download_path = os.path.join(self.download_path, 'session_' + str(i))
+                self.__sessions.put((self.__initialise_chrome_browser(session_download_path),
+                                     session_download_path))
+        return self.__sessions
+
+    def close(self):
+        """
+        Closes all the Chrome sessions of the connection.
+        """
+        if self.__sessions is not None:
+            while not self.__sessions.empty():
+                browser, _ = self.__sessions.get()
+                browser.quit()
+            self.__sessions = None
 
     def __get_url(self, ticker: YahooTicker, data_frequency: DataFrequency, start_date: str,
                   end_date: str) -> str:
@@ -230,21 +284,22 @@ class YahooDataConnection:
                       'interval=' + freq_str + '&filter=history&frequency=' + freq_str)
         return ticker_url
 
-    def __get_download_filename(self, ticker: YahooTicker) -> str:
+    def __get_download_filename(self, ticker: YahooTicker, download_path: str) -> str:
         """
         Returns the name of the data file that is downloaded from Yahoo for a given ticker. 
 
         Args:
             ticker (YahooTicker): The name of the Yahoo Ticker we wish to map to a website ticker.
+            download_path (str): The download directory of the Chrome session.
 
         Returns:
             str: The path of the file that is downloaded for the ticker.
         """
         ticker_string = YahooTickerExtensions.to_string(ticker, 1)
-        filename = os.path.join(self.download_path, ticker_string + '.csv')
+        filename = os.path.join(download_path, ticker_string + '.csv')
         return filename
 
-    def __get_cache_filename(self, ticker: YahooTicker, data_frequency: DataFrequency, start_date: str,
+    def _get_cache_filename(self, ticker: YahooTicker, data_frequency: DataFrequency, start_date: str,
                              end_date: str) -> str:
         """
         Converts a human understandable ticker, data frequency, and start and end dates, into a
@@ -266,7 +321,7 @@ class YahooDataConnection:
         return filename_path
 
     def __download_data(self, ticker: YahooTicker, data_frequency: DataFrequency, start_date: str,
-                        end_date: str):
+                        end_date: str, browser, download_path: str):
         """
         Downloads the specified ticker's historical price data from the Yahoo website.  
 
@@ -277,39 +332,104 @@ class YahooDataConnection:
             data_frequency (DataFrequency): The frequency of the data to retrieve.
             start_date (str): The start date for the data, in %yyyy%mm%dd format.
             end_date (str): The end date for the data, in %yyyy%mm%dd format.
+            browser (webdriver.Chrome): The Chrome session to use.
+            download_path (str): The download directory of the Chrome session.
+
+        Raises:
+            TimeoutError: If the file has not been downloaded within the download timeout.
         """
 
         # Check if data exists in the cache
-        download_filename = self.__get_download_filename(ticker=ticker)
-        cache_filename = self.__get_cache_filename(ticker=ticker, data_frequency=data_frequency,
-                                                   start_date=start_date, end_date=end_date)
+        download_filename = self.__get_download_filename(ticker=ticker, download_path=download_path)
+        cache_filename = self._get_cache_filename(ticker=ticker, data_frequency=data_frequency,
+                                                  start_date=start_date, end_date=end_date)
         if not os.path.isfile(cache_filename):
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.support import expected_conditions
+            from selenium.webdriver.support.ui import WebDriverWait
+
             # Construct the URL specific for the ticker
             ticker_url = self.__get_url(
                 ticker=ticker, data_frequency=data_frequency, start_date=start_date,
                 end_date=end_date)
 
             # Load the URL for the ticker in the browser
-            self.__browser.get(ticker_url)
-
-            # Sleep a specified period of time to allow the page to load.
-            time.sleep(self.selenium_sleep_time)
+            browser.get(ticker_url)
 
-            # Click the 'Download' button
+            # Wait, for at most the selenium sleep time, until the 'Download' button can be clicked, and click it
             download_css = r'#Col1-1-HistoricalDataTable-Proxy > section > div.Pt\(15px\) > div.C\(\$tertiaryColor\).Mt\(20px\).Mb\(15px\) > span.Fl\(end\).Pos\(r\).T\(-6px\) > a > span'
-            download_button = self.__browser.find_element_by_css_selector(
-                download_css)
+            download_button = WebDriverWait(browser, self.selenium_sleep_time).until(
+                expected_conditions.element_to_be_clickable((By.CSS_SELECTOR, download_css)))
             download_button.click()
 
             # Wait for the file to finish downloading before proceeding to the next step
-            file_not_downloaded = True
-            while file_not_downloaded:
-                # If file does not exist, wait some time
-                if os.path.isfile(download_filename):
-                    file_not_downloaded = False
-                    os.rename(download_filename, cache_filename)
-                else:
-                    time.sleep(self.selenium_sleep_time)
+            wait_for_download(download_filename, self.download_timeout)
+            os.replace(download_filename, cache_filename)
+
+    def __download_data_with_retries(self, ticker: YahooTicker, data_frequency: DataFrequency,
+                                     start_date: str, end_date: str):
+        """
+        Downloads the ticker's data on an idle session from the pool, retrying failed attempts.
+
+        Args:
+            ticker (YahooTicker): The name of the financial security of interest.
+            data_frequency (DataFrequency): The frequency of the data to retrieve.
+            start_date (str): The start date for the data, in %yyyy%mm%dd format.
+            end_date (str): The end date for the data, in %yyyy%mm%dd format.
+        """
+        sessions = self.__get_sessions()
+        browser, download_path = sessions.get()
+        try:
+            for attempt in range(self.download_retries + 1):
+                try:
+                    self.__download_data(ticker=ticker, data_frequency=data_frequency, start_date=start_date,
+                                         end_date=end_date, browser=browser, download_path=download_path)
+                    return
+                except Exception:
+                    if attempt == self.download_retries:
+                        raise
+        finally:
+            sessions.put((browser, download_path))
+
+    def download_historical_data(self, tickers: [YahooTicker], data_frequency: DataFrequency, start_date: str,
+                                 end_date: str):
+        """
+        Downloads the data for the tickers into the cache, running up to max_workers downloads concurrently.
+        Tickers that are already in the cache are not downloaded again.
+
+        Args:
+            tickers ([YahooTicker]): The list of the tickers for which to download data.
+            data_frequency (DataFrequency): The frequency of the data to retrieve.
+            start_date (str): The start date for the data, in %yyyy%mm%dd format.
+            end_date (str): The end date for the data, in %yyyy%mm%dd format.
+        """
+        # The cached tickers are skipped here, so that no Chrome session is started if all the data is cached
+        missing_tickers = [ticker for ticker in dict.fromkeys(tickers) if not os.path.isfile(
+            self._get_cache_filename(
+                ticker=ticker, data_frequency=data_frequency, start_date=start_date, end_date=end_date))]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.__download_data_with_retries, ticker, data_frequency, start_date,
+                                       end_date) for ticker in missing_tickers]
+            for future in futures:
+                future.result()
+
+    @staticmethod
+    def _read_cache_file(filename: str, data_types: [DataType]) -> pd.DataFrame:
+        """
+        Reads the requested price columns of a cached csv file, indexed by the parsed date. Missing prices,
+        which Yahoo writes as 'null', are read as NaN, and only the last row of a repeated date is kept.
+
+        Args:
+            filename (str): The path of the cached csv file.
+            data_types ([DataType]): The list of the data types to read.
+
+        Returns:
+            pd.DataFrame: The float64 price columns, named as in the csv file, in the order of data_types.
+        """
+        price_cols = [DataTypeExtensions.to_string(data_type, 0) for data_type in data_types]
+        df = pd.read_csv(filename, usecols=['Date'] + price_cols, index_col='Date', parse_dates=['Date'],
+                         dtype={price_col: 'float64' for price_col in price_cols}, na_values=['null'])
+        return df.loc[~df.index.duplicated(keep='last'), price_cols]
 
     def get_historical_data(self, tickers: [YahooTicker], data_types: [DataType],
                             data_frequency: DataFrequency, start_date: str, end_date: str) -> pd.DataFrame:
@@ -324,30 +444,31 @@ class YahooDataConnection:
             end_date (str): The end date for the data, in %yyyy%mm%dd format.
 
         Returns:
-            pd.DataFrame: The merge dataframe of the requested price data.
+            pd.DataFrame: The merged dataframe of the requested price data, with a 'Date' column of the parsed
+                dates in ascending order.
         """
 
-        df = pd.DataFrame(columns=['Date'])
-        for ticker in tickers:
-            # Download the data for the ticker
-            self.__download_data(
-                ticker=ticker, data_frequency=data_frequency, start_date=start_date, end_date=end_date)
+        # Download the data for the tickers, concurrently if there are several workers
+        self.download_historical_data(
+            tickers=tickers, data_frequency=data_frequency, start_date=start_date, end_date=end_date)
 
-            # Read in the csv data
-            filename = self.__get_cache_filename(
+        # Read only the needed columns of each ticker's csv data, indexed by the parsed date, and prefix the
+        # price columns with the ticker
+        ticker_dfs = []
+        for ticker in dict.fromkeys(tickers):
+            filename = self._get_cache_filename(
                 ticker=ticker, data_frequency=data_frequency, start_date=start_date, end_date=end_date)
-            ticker_df = pd.read_csv(filename)
-
-            # Prefix the desired price column with the ticker, and merge data
-            rename_cols = {DataTypeExtensions.to_string(data_type, 0): YahooTickerExtensions.to_string(
-                ticker) + '_' + DataTypeExtensions.to_string(data_type, 1) for data_type in data_types}
-            ticker_df = ticker_df.rename(columns=rename_cols)
-            ticker_df = ticker_df[['Date'] + list(rename_cols.values())]
-            df = df.merge(ticker_df, on='Date', how='outer')
-
-        # Sort the columns by date. Data may be available for different dates for each ticker.
-        df = df.sort_values(by=['Date'])
-        df = df.reset_index(drop=True)
+            ticker_df = self._read_cache_file(filename, data_types)
+            ticker_df.columns = [YahooTickerExtensions.to_string(ticker) + '_' + DataTypeExtensions.to_string(
+                data_type, 1) for data_type in data_types]
+            ticker_dfs.append(ticker_df)
+        if len(ticker_dfs) == 0:
+            return pd.DataFrame(columns=['Date'])
+
+        # Align all the tickers in a single outer join on the dates. Data may be available for different dates
+        # for each ticker.
+        df = pd.concat(ticker_dfs, axis=1, join='outer', sort=True)
+        df = df.rename_axis('Date').reset_index()
         return df
 
 